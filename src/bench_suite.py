@@ -0,0 +1,177 @@
+from digital_sign.ecc import get_named_curve
+from digital_sign.sm2 import SM2Key, sm2_enc, sm2_dec
+from digital_sign.rsa_pss import RSAPrivateKey, generate_key as rsa_generate_key
+from digital_sign.schnorr import SchnorrKey, generate_key as schnorr_generate_key
+from digital_sign.elgamal import ElGamalKey
+from digital_sign.store_lib import cache_path, load_or_generate_params
+from digital_sign.async_lib import percentile
+from cryptography.hazmat.primitives.asymmetric import rsa
+from digital_sign import arith_lib
+from digital_sign import sm3_lib
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+# 基准文件格式版本
+SUITE_VERSION = 1
+# 相对基准的平均耗时增幅超过该比例时视为性能回退
+DEFAULT_TOLERANCE = 0.2
+RSA_SIZES = (2048, 3072, 4096)
+SCHNORR_SIZES = ((1024, 160), (2048, 224))
+SM2_MESSAGE_SIZES = (32, 1024, 65536)
+
+
+def measure(func, rounds, warmup=1):
+    """
+    重复执行被测函数并统计吞吐与延迟分位数
+    :param func: 无参被测函数
+    :param rounds: 计时次数,int
+    :param warmup: 不计时的预热次数,int
+    :return: 统计结果,dict
+    """
+    for i in range(warmup):
+        func()
+    samples = []
+    for i in range(rounds):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    total = sum(samples)
+    return {
+        'rounds': rounds,
+        'ops_per_sec': rounds / total,
+        'mean_ms': total / rounds * 1000,
+        'p50_ms': percentile(samples, 50) * 1000,
+        'p90_ms': percentile(samples, 90) * 1000,
+        'p99_ms': percentile(samples, 99) * 1000,
+    }
+
+
+def _schnorr_params(p_bits, q_bits):
+    """
+    读取或生成并缓存Schnorr域参数
+    :param p_bits: p的位数,int
+    :param q_bits: q的位数,int
+    :return: [p,q,g]
+    """
+    path = cache_path('schnorr_%d_%d.bin' % (p_bits, q_bits))
+    return load_or_generate_params(path, lambda: schnorr_generate_key(q_bits, p_bits))
+
+
+def _sign_verify(results, name, key, rounds):
+    """
+    测量密钥对象的签名与验签
+    :param results: 结果字典,原地修改,dict
+    :param name: 用例名前缀,str
+    :param key: 密钥对象
+    :param rounds: 计时次数,int
+    :return: void
+    """
+    key.precompute()
+    sign = key.sign('benchmark message')
+    if not key.verify('benchmark message', sign):
+        raise ValueError(name + " verification failed!")
+    results[name + '/sign'] = measure(lambda: key.sign('benchmark message'), rounds)
+    results[name + '/verify'] = measure(lambda: key.verify('benchmark message', sign), rounds)
+
+
+def run_suite(quick=False):
+    """
+    运行全部基准用例
+    :param quick: 为True时减少重复次数并只测较小的参数,bool
+    :return: 包含运行环境与各用例统计的结果,dict
+    """
+    rounds = 10 if quick else 50
+    rsa_sizes = RSA_SIZES[:1] if quick else RSA_SIZES
+    schnorr_sizes = SCHNORR_SIZES[:1] if quick else SCHNORR_SIZES
+    sm2_sizes = SM2_MESSAGE_SIZES[:2] if quick else SM2_MESSAGE_SIZES
+    results = {}
+    for bits in rsa_sizes:
+        results['rsa-%d/keygen' % bits] = measure(lambda: rsa_generate_key(bits), 2 if quick else 5, 0)
+        numbers = rsa.generate_private_key(public_exponent=65537, key_size=bits).private_numbers()
+        _sign_verify(results, 'rsa-pss-%d' % bits, RSAPrivateKey(numbers.p, numbers.q, 65537, numbers.d), rounds)
+    for p_bits, q_bits in schnorr_sizes:
+        p, q, alpha = _schnorr_params(p_bits, q_bits)
+        name = '%d-%d' % (p_bits, q_bits)
+        results['schnorr-%s/keygen' % name] = measure(lambda: SchnorrKey(p, q, alpha), rounds)
+        _sign_verify(results, 'schnorr-' + name, SchnorrKey(p, q, alpha), rounds)
+        results['elgamal-%s/keygen' % name] = measure(lambda: ElGamalKey(alpha, p), rounds)
+        _sign_verify(results, 'elgamal-' + name, ElGamalKey(alpha, p), rounds)
+    curve = get_named_curve('sm2p256v1')
+    results['sm2/keygen'] = measure(lambda: SM2Key(curve.g, curve.n), rounds)
+    key = SM2Key(curve.g, curve.n)
+    _sign_verify(results, 'sm2', key, rounds)
+    for size in sm2_sizes:
+        mes = os.urandom(size)
+        cipher = sm2_enc(mes, curve.g, curve.n, key.pub)
+        if sm2_dec(cipher, curve.g, key.pri) != mes:
+            raise ValueError("SM2 decryption failed!")
+        size_rounds = max(2, rounds * 1024 // max(size, 1024))
+        results['sm2-%d/enc' % size] = measure(lambda: sm2_enc(mes, curve.g, curve.n, key.pub), size_rounds)
+        results['sm2-%d/dec' % size] = measure(lambda: sm2_dec(cipher, curve.g, key.pri), size_rounds)
+    return {
+        'version': SUITE_VERSION,
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'backend': arith_lib.BACKEND,
+            'sm3': sm3_lib.SM3_ENGINE,
+            'cpus': os.cpu_count(),
+            'quick': quick,
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': results,
+    }
+
+
+def compare(current, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    与基准结果比较平均耗时
+    :param current: 本次结果,dict
+    :param baseline: 基准结果,dict
+    :param tolerance: 允许的平均耗时增幅,float
+    :return: 两者共有的用例的(用例名,基准耗时,本次耗时,比值,是否回退)列表,list
+    """
+    if baseline.get('version') != SUITE_VERSION:
+        raise ValueError("Baseline was written by another suite version.")
+    rows = []
+    for name, stats in sorted(current['results'].items()):
+        base = baseline['results'].get(name)
+        if base is None:
+            continue
+        ratio = stats['mean_ms'] / base['mean_ms']
+        rows.append((name, base['mean_ms'], stats['mean_ms'], ratio, ratio > 1 + tolerance))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='digital_sign benchmark suite')
+    parser.add_argument('--json', help='write results to this file')
+    parser.add_argument('--baseline', help='compare with a previously written result file')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument('--quick', action='store_true', help='fewer rounds and smaller parameters')
+    args = parser.parse_args(argv)
+    report = run_suite(args.quick)
+    for name, stats in sorted(report['results'].items()):
+        print("%-26s %10.1f ops/s  mean: %8.3f ms  p50: %8.3f ms  p99: %8.3f ms" % (
+            name, stats['ops_per_sec'], stats['mean_ms'], stats['p50_ms'], stats['p99_ms']))
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+    if args.baseline:
+        with open(args.baseline) as f:
+            rows = compare(report, json.load(f), args.tolerance)
+        regressions = [row for row in rows if row[4]]
+        for name, base, cur, ratio, regressed in rows:
+            print("%-26s %8.3f -> %8.3f ms  %.2fx%s" % (name, base, cur, ratio, '  REGRESSION' if regressed else ''))
+        if regressions:
+            print("%d regression(s) over %.0f%%" % (len(regressions), args.tolerance * 100))
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
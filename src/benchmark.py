@@ -0,0 +1,680 @@
+from digital_sign.ecc import *
+from digital_sign.sm2 import SM2Key, kdf, sm2_sign, sm2_sign_batch, sm2_verify, sm2_verify_batch
+from digital_sign.rsa_pss import RSAPrivateKey, pss_encode, rsa_pss, rsa_pss_verify, generate_key as rsa_generate_key
+from digital_sign.schnorr import SchnorrKey, generate_key as schnorr_generate_key, schnorr, schnorr_batch, schnorr_verify, schnorr_verify_batch
+from digital_sign.elgamal import ElGamalKey, elgamal
+from digital_sign.bulk_lib import bulk_sign
+from cryptography.hazmat.primitives.asymmetric import rsa
+from random import randint, getrandbits
+from digital_sign.lazy_lib import lazy_import
+from digital_sign import arith_lib
+from digital_sign import sign_lib
+from digital_sign import sm3_lib
+import io
+import os
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+
+# 吞吐对比中的参照实现
+gmssl_sm3 = lazy_import('gmssl.sm3')
+gmssl_func = lazy_import('gmssl.func')
+# sm2.main中使用的192位测试曲线
+CURVE_192 = get_named_curve('sm2test192')
+
+
+def affine_mul(point, times):
+    """
+    仿射坐标下的左到右倍加，即Jacobian改造前的Point.__mul__，作为对照基准
+    :param point: 基点,Point
+    :param times: 倍乘数,int
+    :return: 乘法结果,Point
+    """
+    result = Point(0, 0, point.curve)
+    for bit in bin(times)[2:]:
+        result += result
+        if bit == '1':
+            result += point
+    return result
+
+
+def legacy_pow(x, n, m):
+    """
+    改造前的平方乘快速幂，作为对照基准
+    :param x: 底数x,int
+    :param n: 指数n,int
+    :param m: 模数m,int
+    :return: x^n%m,int
+    """
+    result = 1
+    while n > 0:
+        if n % 2 == 1:
+            result = result * x % m
+        x = x * x % m
+        n = n // 2
+    return result % m
+
+
+def legacy_inv(num, mod):
+    """
+    改造前的递归扩展欧几里得求逆，作为对照基准
+    :param num: 求逆参数,int
+    :param mod: 模数,int
+    :return: 逆元,int
+    """
+    def extended_gcd(a, b):
+        if a[2] == 0:
+            return b[1]
+        q = b[2] // a[2]
+        return extended_gcd([b[0] - q * a[0], b[1] - q * a[1], b[2] - q * a[2]], a)
+    return extended_gcd([0, 1, num], [1, 0, mod])
+
+
+def legacy_mgf(x, mask_len):
+    """
+    改造前的MGF1: 每个计数器重新杂凑整个种子并用bytes拼接，作为对照基准
+    :param x: 种子,bytes
+    :param mask_len: 掩码长,int
+    :return: 掩码,bytes
+    """
+    t = b''
+    k = mask_len // 20 if mask_len % 20 != 0 else mask_len // 20 - 1
+    for i in range(k + 1):
+        num = bytes.fromhex('{:08x}'.format(i))
+        t += sign_lib.sha1_hash(x + num)
+    return t[:mask_len]
+
+
+def legacy_sqrt(g, p):
+    """
+    改造前p≡1 mod 8时的开方: 随机选取Lucas序列参数直到成功，作为对照基准
+    :param g: 需要开方的参数g,int
+    :param p: 素数p,int
+    :return: 开方结果,int
+    """
+    u = p // 8
+    while True:
+        u_1, v = lucas(randint(1, p - 1), g, 4 * u + 1, p)
+        if v ** 2 % p == 4 * g % p:
+            return (v * get_inv(2, p)) % p
+        elif u_1 % p != 1 and u_1 % p != p - 1:
+            raise ValueError("Can't find the root!")
+
+
+def legacy_kdf(bitz, k_len):
+    """
+    改造前的KDF: 经gmssl对每个计数器重新杂凑整个Z并解析十六进制结果，作为对照基准
+    :param bitz: 需要派生的字节串,bytes
+    :param k_len: 字节长度,int
+    :return: 密钥数据,bytes
+    """
+    ha = []
+    for ct in range(1, -(-k_len // 32) + 1):
+        ha.append(bytes.fromhex(gmssl_sm3.sm3_hash(gmssl_func.bytes_to_list(bitz + ct.to_bytes(4, 'big')))))
+    return b''.join(ha)[:k_len]
+
+
+def timeit(func, rounds):
+    """
+    计时函数
+    :param func: 无参被测函数
+    :param rounds: 重复次数,int
+    :return: 单次平均耗时,以秒计,float
+    """
+    start = time.perf_counter()
+    for i in range(rounds):
+        func()
+    return (time.perf_counter() - start) / rounds
+
+
+def bench_scalar_mul(rounds=20):
+    """
+    192位曲线上仿射倍加与Jacobian倍加的标量乘对比
+    :param rounds: 重复次数,int
+    :return: void
+    """
+    g = CURVE_192.g
+    k = randint(1, CURVE_192.n - 1)
+    if affine_mul(g, k) != g * k:
+        raise ValueError("Jacobian result mismatch!")
+    t_affine = timeit(lambda: affine_mul(g, k), rounds)
+    t_jacobian = timeit(lambda: g * k, rounds)
+    print("affine   : %.3f ms" % (t_affine * 1000))
+    print("jacobian : %.3f ms" % (t_jacobian * 1000))
+    print("speedup  : %.2fx" % (t_affine / t_jacobian))
+
+
+def bench_mul_methods(rounds=20, widths=(2, 3, 4, 5, 6)):
+    """
+    192位曲线上各标量乘策略与wNAF窗口宽度的对比
+    :param rounds: 重复次数,int
+    :param widths: 需要测试的wNAF窗口宽度,tuple
+    :return: void
+    """
+    g = CURVE_192.g
+    k = randint(1, CURVE_192.n - 1)
+    expected = g.mul(k, 'binary')
+    cases = [('binary', None), ('ladder', None)] + [('wnaf', w) for w in widths]
+    for method, w in cases:
+        if g.mul(k, method, w) != expected:
+            raise ValueError(method + " result mismatch!")
+        t = timeit(lambda: g.mul(k, method, w), rounds)
+        name = method if w is None else "%s(w=%d)" % (method, w)
+        print("%-12s: %.3f ms" % (name, t * 1000))
+
+
+def bench_fixed_base(rounds=50):
+    """
+    192位曲线上生成元固定基点乘法与一般标量乘的对比
+    :param rounds: 重复次数,int
+    :return: void
+    """
+    g = CURVE_192.g
+    k = randint(1, CURVE_192.n - 1)
+    start = time.perf_counter()
+    if fixed_base_mul(g, k) != g * k:
+        raise ValueError("Fixed-base result mismatch!")
+    print("table build : %.3f ms" % ((time.perf_counter() - start) * 1000))
+    t_generic = timeit(lambda: g * k, rounds)
+    t_fixed = timeit(lambda: fixed_base_mul(g, k), rounds)
+    print("generic     : %.3f ms" % (t_generic * 1000))
+    print("fixed base  : %.3f ms" % (t_fixed * 1000))
+    print("speedup     : %.2fx" % (t_generic / t_fixed))
+
+
+def bench_multi_mul(rounds=10, sizes=(2, 16, 64, 256)):
+    """
+    192位曲线上多标量乘(Straus/Pippenger)与逐个标量乘再相加的对比
+    :param rounds: 重复次数,int
+    :param sizes: 需要测试的(倍乘数,点)对数量,tuple
+    :return: void
+    """
+    curve = CURVE_192
+    for size in sizes:
+        pairs = [(randint(1, curve.n - 1), curve.g * randint(1, curve.n - 1)) for i in range(size)]
+
+        def naive():
+            result = Point(0, 0, curve)
+            for times, point in pairs:
+                result += point * times
+            return result
+
+        if multi_mul(pairs) != naive():
+            raise ValueError("multi_mul result mismatch!")
+        t_naive = timeit(naive, rounds)
+        t_straus = timeit(lambda: multi_mul(pairs, 'straus'), rounds)
+        t_pippenger = timeit(lambda: multi_mul(pairs, 'pippenger'), rounds)
+        print("n=%-4d naive: %.3f ms  straus: %.3f ms (%.2fx)  pippenger: %.3f ms (%.2fx)" % (
+            size, t_naive * 1000, t_straus * 1000, t_naive / t_straus,
+            t_pippenger * 1000, t_naive / t_pippenger))
+
+
+def bench_sm2_verify(count=1000, keys=4):
+    """
+    SM2推荐曲线上逐个验签与批量验签的对比
+    :param count: 签名数量,int
+    :param keys: 签名使用的不同公钥数量,int
+    :return: void
+    """
+    curve = get_named_curve('sm2p256v1')
+    g, n = curve.g, curve.n
+    pairs = [(d, fixed_base_mul(g, d)) for d in (randint(1, n - 2) for i in range(keys))]
+    items = []
+    for i in range(count):
+        d, pub = pairs[i % keys]
+        mes = 'record %d' % i
+        items.append((mes, sm2_sign(mes, g, n, d, pub), pub))
+    start = time.perf_counter()
+    single = [sm2_verify(mes, sign, g, n, pub) for mes, sign, pub in items]
+    t_single = time.perf_counter() - start
+    start = time.perf_counter()
+    batch = sm2_verify_batch(items, g, n)
+    t_batch = time.perf_counter() - start
+    if not all(single) or batch != single:
+        raise ValueError("SM2 verification mismatch!")
+    print("single : %.3f ms/sig" % (t_single / count * 1000))
+    print("batch  : %.3f ms/sig" % (t_batch / count * 1000))
+    print("speedup: %.2fx" % (t_single / t_batch))
+
+
+def bench_schnorr_verify(count=400, keys=4):
+    """
+    Schnorr(1024,160)逐个验签、分组查表批量验签与随机线性组合批量验签的对比
+    :param count: 签名数量,int
+    :param keys: 签名使用的不同公钥数量,int
+    :return: void
+    """
+    p, q, alpha = schnorr_generate_key()
+    items = []
+    for k in range(keys):
+        mes_list = ['record %d-%d' % (k, i) for i in range(count // keys)]
+        pub, signs = schnorr_batch(p, q, alpha, mes_list, commit=True)
+        items.extend(zip(mes_list, [pub] * len(signs), signs))
+    start = time.perf_counter()
+    single = [schnorr_verify(mes, pub, sign) for mes, pub, sign in items]
+    t_single = time.perf_counter() - start
+    start = time.perf_counter()
+    batch = schnorr_verify_batch(items)
+    t_batch = time.perf_counter() - start
+    start = time.perf_counter()
+    rlc = schnorr_verify_batch(items, rlc=True)
+    t_rlc = time.perf_counter() - start
+    if not all(single) or batch != single or rlc != single:
+        raise ValueError("Schnorr verification mismatch!")
+    print("single : %.3f ms/sig" % (t_single / len(items) * 1000))
+    print("batch  : %.3f ms/sig (%.2fx)" % (t_batch / len(items) * 1000, t_single / t_batch))
+    print("rlc    : %.3f ms/sig (%.2fx)" % (t_rlc / len(items) * 1000, t_single / t_rlc))
+
+
+def bench_fixed_pow(rounds=100, widths=(4, 6, 8)):
+    """
+    Schnorr(1024,160)生成元上普通模幂与各固定底数表的对比，列出建表耗时与表项数
+    :param rounds: 重复次数,int
+    :param widths: 对比的窗口宽度,tuple
+    :return: void
+    """
+    p, q, alpha = schnorr_generate_key()
+    for bits in (q.bit_length(), p.bit_length()):
+        exps = [getrandbits(bits) for i in range(rounds)]
+        start = time.perf_counter()
+        expect = [arith_lib.fast_pow(alpha, e, p) for e in exps]
+        t_pow = (time.perf_counter() - start) / rounds
+        print("%4d-bit exponent pow: %.3f ms" % (bits, t_pow * 1000))
+        for method in sign_lib.FIXED_POW_METHODS:
+            for w in widths:
+                start = time.perf_counter()
+                sign_lib.fixed_base_pow(alpha, 1, p, bits, method, w)
+                t_build = time.perf_counter() - start
+                start = time.perf_counter()
+                result = [sign_lib.fixed_base_pow(alpha, e, p, bits, method, w) for e in exps]
+                t_fixed = (time.perf_counter() - start) / rounds
+                if result != expect:
+                    raise ValueError("Fixed-base exponentiation mismatch!")
+                entries = (1 << w) * (1 if method == 'comb' else (bits + w - 1) // w)
+                print("%4d-bit exponent %-6s w=%d: %.3f ms (%.2fx)  build: %.1f ms  entries: %d" % (
+                    bits, method, w, t_fixed * 1000, t_pow / t_fixed, t_build * 1000, entries))
+
+
+def bench_key_reuse(count=200):
+    """
+    每次签名都生成新密钥的旧接口与复用密钥对象的签名、验签吞吐对比
+    :param count: 签名数量,int
+    :return: void
+    """
+    p, q, alpha = schnorr_generate_key()
+    curve = get_named_curve('sm2p256v1')
+    mes_list = ['record %d' % i for i in range(count)]
+    schnorr_key = SchnorrKey(p, q, alpha)
+    elgamal_key = ElGamalKey(alpha, p)
+    sm2_key = SM2Key(curve.g, curve.n)
+    cases = (
+        ('schnorr', lambda mes: schnorr(p, q, alpha, mes), schnorr_key),
+        ('elgamal', lambda mes: elgamal(alpha, p, mes), elgamal_key),
+        ('sm2', lambda mes: sm2_sign(mes, curve.g, curve.n, sm2_key.pri), sm2_key),
+    )
+    for name, func, key in cases:
+        start = time.perf_counter()
+        for mes in mes_list:
+            func(mes)
+        t_func = time.perf_counter() - start
+        start = time.perf_counter()
+        signs = [key.sign(mes) for mes in mes_list]
+        t_key = time.perf_counter() - start
+        start = time.perf_counter()
+        if not all(key.verify(mes, sign) for mes, sign in zip(mes_list, signs)):
+            raise ValueError("Key verification failed!")
+        t_verify = time.perf_counter() - start
+        print("%-8s function: %.3f ms/sig  key: %.3f ms/sig (%.2fx)  key verify: %.3f ms/sig" % (
+            name, t_func / count * 1000, t_key / count * 1000, t_func / t_key, t_verify / count * 1000))
+
+
+def bench_bulk(count=400):
+    """
+    批量签名引擎在单进程与全部CPU下的吞吐对比
+    :param count: 签名数量,int
+    :return: void
+    """
+    curve = get_named_curve('sm2p256v1')
+    mes_list = ['record %d' % i for i in range(count)]
+    keys = (('rsa-2048', rsa_generate_key(2048)), ('sm2', SM2Key(curve.g, curve.n)))
+    for name, key in keys:
+        for workers in sorted({1, os.cpu_count() or 1}):
+            start = time.perf_counter()
+            signs = list(bulk_sign(key, mes_list, workers))
+            t = time.perf_counter() - start
+            if len(signs) != count:
+                raise ValueError("Bulk signing lost messages!")
+            print("%-8s workers=%d: %.1f sig/s" % (name, workers, count / t))
+
+
+def bench_sm2_sign(count=200):
+    """
+    SM2推荐曲线上逐个签名与批量签名(批量求逆)的对比
+    :param count: 签名数量,int
+    :return: void
+    """
+    curve = get_named_curve('sm2p256v1')
+    g, n = curve.g, curve.n
+    d = randint(1, n - 2)
+    pub = fixed_base_mul(g, d)
+    messages = ['record %d' % i for i in range(count)]
+    start = time.perf_counter()
+    for mes in messages:
+        sm2_sign(mes, g, n, d, pub)
+    t_single = time.perf_counter() - start
+    start = time.perf_counter()
+    signs = sm2_sign_batch(messages, g, n, d, pub)
+    t_batch = time.perf_counter() - start
+    if not all(sm2_verify_batch(zip(messages, signs, [pub] * count), g, n)):
+        raise ValueError("SM2 batch signature mismatch!")
+    print("single : %.3f ms/sig" % (t_single / count * 1000))
+    print("batch  : %.3f ms/sig" % (t_batch / count * 1000))
+    print("speedup: %.2fx" % (t_single / t_batch))
+
+
+def bench_rsa_crt(rounds=10, sizes=(2048, 4096)):
+    """
+    RSA-PSS签名中(d,n)直接模幂与RSAPrivateKey的CRT签名对比
+    :param rounds: 重复次数,int
+    :param sizes: 模数位数,tuple
+    :return: void
+    """
+    for bits in sizes:
+        numbers = rsa.generate_private_key(public_exponent=65537, key_size=bits).private_numbers()
+        key = RSAPrivateKey(numbers.p, numbers.q, 65537, numbers.d)
+        pri = (key.d, key.n)
+        if not rsa_pss_verify(key.public_key(), rsa_pss(key, 'hey', 512), 'hey', 512):
+            raise ValueError("CRT signature mismatch!")
+        t_plain = timeit(lambda: rsa_pss(pri, 'hey', 512), rounds)
+        t_crt = timeit(lambda: rsa_pss(key, 'hey', 512), rounds)
+        print("%d bits plain: %.3f ms  crt: %.3f ms  speedup: %.2fx" % (
+            bits, t_plain * 1000, t_crt * 1000, t_plain / t_crt))
+
+
+def bench_pss(rounds=20, sizes=(2048, 3072, 4096)):
+    """
+    各模数长度下MGF1改造前后的对比，以及各杂凑算法的RSA-PSS编码、签名与验签耗时
+    :param rounds: 重复次数,int
+    :param sizes: 模数位数,tuple
+    :return: void
+    """
+    for bits in sizes:
+        numbers = rsa.generate_private_key(public_exponent=65537, key_size=bits).private_numbers()
+        key = RSAPrivateKey(numbers.p, numbers.q, 65537, numbers.d)
+        mask_len = (bits + 7) // 8 - 21
+        seed = os.urandom(20)
+        if legacy_mgf(seed, mask_len) != sign_lib.mgf1(seed, mask_len):
+            raise ValueError("MGF1 mismatch!")
+        t_legacy = timeit(lambda: legacy_mgf(seed, mask_len), rounds * 10)
+        t_mgf = timeit(lambda: sign_lib.mgf1(seed, mask_len), rounds * 10)
+        print("%d bits mgf legacy: %.1f us  mgf1: %.1f us  speedup: %.2fx" % (
+            bits, t_legacy * 1e6, t_mgf * 1e6, t_legacy / t_mgf))
+        for hash_name in sign_lib.HASH_ALGORITHMS:
+            sign = key.sign('hey', hash_name=hash_name)
+            if not key.verify('hey', sign, hash_name=hash_name):
+                raise ValueError("PSS verification failed!")
+            t_encode = timeit(lambda: pss_encode('hey', bits - 1, hash_name), rounds * 10)
+            t_sign = timeit(lambda: key.sign('hey', hash_name=hash_name), rounds)
+            t_verify = timeit(lambda: key.verify('hey', sign, hash_name=hash_name), rounds)
+            print("%d bits %-8s encode: %.1f us  sign: %.3f ms  verify: %.3f ms" % (
+                bits, hash_name, t_encode * 1e6, t_sign * 1000, t_verify * 1000))
+
+
+def bench_keygen(rounds=3):
+    """
+    RSA与Schnorr参数生成耗时，对比单进程与多进程并行查找
+    :param rounds: 重复次数,int
+    :return: void
+    """
+    for workers in sorted({1, os.cpu_count() or 1}):
+        t_rsa = timeit(lambda: rsa_generate_key(2048, workers=workers), rounds)
+        t_schnorr = timeit(lambda: schnorr_generate_key(workers=workers), rounds)
+        print("workers=%d rsa-2048: %.1f ms  schnorr(1024,160): %.1f ms" % (workers, t_rsa * 1000, t_schnorr * 1000))
+
+
+def bench_arith(rounds=20, sizes=(160, 256, 512, 1024, 2048, 4096)):
+    """
+    各大数运算后端在不同位数下的模幂与求逆对比
+    :param rounds: 重复次数,int
+    :param sizes: 操作数位数,tuple
+    :return: void
+    """
+    backends = [('legacy', legacy_pow, legacy_inv),
+                ('python', arith_lib._python_powmod, arith_lib._python_invert)]
+    if arith_lib._gmpy2_available():
+        backends.append(('gmpy2', arith_lib._gmpy2_powmod, arith_lib._gmpy2_invert))
+    print("active backend: " + arith_lib.BACKEND)
+    for bits in sizes:
+        m = getrandbits(bits) | (1 << (bits - 1)) | 1
+        x = getrandbits(bits) % m
+        n = getrandbits(bits)
+        while arith_lib.gcd(x, m) != 1:
+            x += 1
+        for name, powmod, invert in backends:
+            t_pow = timeit(lambda: powmod(x, n, m), max(1, rounds * 160 // bits))
+            try:
+                t_inv = "%.4f ms" % (timeit(lambda: invert(x, m), rounds) * 1000)
+            except RecursionError:
+                t_inv = "RecursionError"
+            print("%4d bits %-6s pow: %.4f ms  inv: %s" % (bits, name, t_pow * 1000, t_inv))
+
+
+def bench_decode(rounds=200):
+    """
+    开方与公钥解码对比: p≡1 mod 8的素数上Lucas序列与Tonelli-Shanks，sm2p256v1上压缩/非压缩解码与缓存
+    :param rounds: 重复次数,int
+    :return: void
+    """
+    p = 2 ** 224 - 2 ** 96 + 1
+    g = pow(randint(2, p - 1), 2, p)
+    if pow(legacy_sqrt(g, p), 2, p) != g or pow(sqrt(g, p), 2, p) != g:
+        raise ValueError("Square root mismatch!")
+    t_lucas = timeit(lambda: legacy_sqrt(g, p), rounds // 10)
+    t_ts = timeit(lambda: sqrt(g, p), rounds)
+    print("p=2^224-2^96+1 lucas: %.3f ms  tonelli-shanks: %.3f ms  speedup: %.2fx" % (
+        t_lucas * 1000, t_ts * 1000, t_lucas / t_ts))
+    curve = get_named_curve('sm2p256v1')
+    pub = fixed_base_mul(curve.g, randint(1, curve.n - 1))
+    compressed, uncompressed = pub.encode(), pub.encode(compressed=False)
+    if from_bytes(compressed, curve) != pub or decode_public_key(uncompressed, curve) != pub:
+        raise ValueError("Decoding mismatch!")
+    t_compressed = timeit(lambda: from_bytes(compressed, curve), rounds)
+    t_uncompressed = timeit(lambda: from_bytes(uncompressed, curve), rounds)
+    t_cached = timeit(lambda: decode_public_key(compressed, curve), rounds)
+    print("sm2p256v1 02/03: %.3f ms  04: %.3f ms  cached key: %.4f ms" % (
+        t_compressed * 1000, t_uncompressed * 1000, t_cached * 1000))
+
+
+# 导入耗时对比中检查是否被实际加载(而非仅延迟登记)的重量级依赖
+HEAVY_MODULES = ('gmpy2', 'cryptography.hazmat.primitives.hashes', 'gmssl.sm3', 'sympy',
+                 'concurrent.futures.process', 'digital_sign.ecc')
+
+
+def bench_sm3(sizes=(64, 1024, 16384)):
+    """
+    SM3吞吐对比(MB/s): gmssl、纯Python SM3与当前实现(sm3_lib.SM3_ENGINE)，以及改造前后KDF
+    :param sizes: 消息字节数,tuple
+    :return: void
+    """
+    if gmssl_sm3 is None:
+        print("gmssl is not installed")
+        return
+    print("engine: %s" % sm3_lib.SM3_ENGINE)
+    for size in sizes:
+        data = os.urandom(size)
+        expect = sm3_lib.sm3_digest(data)
+        if bytes.fromhex(gmssl_sm3.sm3_hash(gmssl_func.bytes_to_list(data))) != expect or \
+                sm3_lib.SM3(data).digest() != expect:
+            raise ValueError("SM3 mismatch!")
+        rounds = max(2, 65536 // size)
+        t_gmssl = timeit(lambda: gmssl_sm3.sm3_hash(gmssl_func.bytes_to_list(data)), max(1, rounds // 8))
+        t_python = timeit(lambda: sm3_lib.SM3(data).digest(), max(1, rounds // 4))
+        t_engine = timeit(lambda: sm3_lib.sm3_digest(data), rounds * 16)
+        print("%6d bytes gmssl: %8.3f MB/s  python: %8.3f MB/s  engine: %9.2f MB/s" % (
+            size, size / t_gmssl / 1e6, size / t_python / 1e6, size / t_engine / 1e6))
+    z = os.urandom(64)
+    for k_len in (32, 4096):
+        if legacy_kdf(z, k_len) != kdf(z, k_len):
+            raise ValueError("KDF mismatch!")
+        rounds = max(2, 65536 // k_len)
+        t_legacy = timeit(lambda: legacy_kdf(z, k_len), max(1, rounds // 8))
+        t_kdf = timeit(lambda: kdf(z, k_len), rounds)
+        print("kdf %5d bytes legacy: %8.3f MB/s  cloned Z: %9.2f MB/s" % (
+            k_len, k_len / t_legacy / 1e6, k_len / t_kdf / 1e6))
+
+
+def _import_baseline(here):
+    """
+    把延迟导入改造之前(首次加入lazy_lib.py的提交的父提交)的src目录导出到临时目录
+    :param here: 当前源码目录,str
+    :return: (版本号, 临时目录)，不在git仓库中时为None,tuple
+    """
+    def git(*args, **kwargs):
+        return subprocess.run(('git',) + args, cwd=top, capture_output=True, check=True, **kwargs).stdout
+
+    try:
+        top = here
+        top = git('rev-parse', '--show-toplevel', text=True).strip()
+        added = git('log', '--diff-filter=A', '--format=%H', '--', 'src/lazy_lib.py', text=True).split()
+        rev = git('rev-parse', '--short', added[-1] + '^', text=True).strip()
+        archive = git('archive', rev, 'src')
+    except (OSError, IndexError, subprocess.CalledProcessError):
+        return None
+    tmp = tempfile.TemporaryDirectory()
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(tmp.name)
+    return rev, tmp
+
+
+def _import_probe(code, cwd, rounds, local):
+    """
+    在新的解释器中执行code并计时
+    :param code: 导入及首次使用的语句,str
+    :param cwd: 源码目录,str
+    :param rounds: 重复次数,取中位数,int
+    :param local: 本项目的顶层模块名,须从cwd加载而不是已安装的版本,set[str]
+    :return: (耗时,以秒计, 被加载的重量级依赖列表)，code在该版本中无法执行时为None,tuple
+    """
+    probe = 'import sys, time; t = time.perf_counter(); %s; t = time.perf_counter() - t; import os; ' \
+            'print(t, any(not os.path.abspath(getattr(sys.modules[m], "__file__", None) or os.sep)' \
+            '.startswith(os.getcwd() + os.sep) for m in %r if m in sys.modules), ' \
+            '*[m for m in %r if type(sys.modules.get(m)).__name__ == "module"])'
+    samples = []
+    for i in range(rounds):
+        proc = subprocess.run([sys.executable, '-c', probe % (code, sorted(local), HEAVY_MODULES)], cwd=cwd,
+                              capture_output=True, text=True)
+        out = proc.stdout.split()
+        if proc.returncode or out[1] == 'True':
+            return None
+        samples.append(float(out[0]))
+    return sorted(samples)[rounds // 2], out[2:]
+
+
+def _local_modules(path):
+    """
+    目录下的顶层模块名
+    :param path: 源码目录,str
+    :return: 模块名,set[str]
+    """
+    return {os.path.splitext(name)[0] for name in os.listdir(path)
+            if name.endswith('.py') or os.path.isfile(os.path.join(path, name, '__init__.py'))}
+
+
+def bench_import(rounds=5):
+    """
+    冷启动导入与首次使用耗时: 每次在新的解释器中执行一项，与延迟导入改造前的版本(从git导出)对比
+    记录当前版本中被实际加载的重量级依赖；某版本中不存在的入口记为-
+    :param rounds: 每项重复次数,取中位数,int
+    :return: void
+    """
+    # (名称, 导入的子模块, 导入后执行的语句)，基线版本中子模块为顶层模块，当前版本中位于digital_sign包内
+    cases = (
+        ('python', (), 'pass'),
+        ('rsa_pss', ('rsa_pss',), 'pass'),
+        ('rsa_pss first use', ('rsa_pss',), 'rsa_pss.pss_encode(b"m", 1023, "sha256")'),
+        ('sm2', ('sm2',), 'pass'),
+        ('sm2 first sign', ('ecc', 'sm2'), 'c = ecc.get_named_curve("sm2p256v1"); sm2.sm2_sign(b"m", c.g, c.n, 5)'),
+        ('schnorr', ('schnorr',), 'pass'),
+        ('digital_sign', (), 'import digital_sign'),
+        ('rsa-pss verifier', (), 'import digital_sign; digital_sign.rsa_pss_verify'),
+        ('first digest', (), 'import digital_sign; digital_sign.message_digest(b"m", "sha256")'),
+    )
+    here = os.path.dirname(os.path.abspath(__file__))
+    baseline = _import_baseline(here)
+    if baseline is None:
+        print("not in a git checkout, baseline skipped")
+    else:
+        print("baseline: %s" % baseline[0])
+    print("%-18s %10s %10s" % ('', 'baseline', 'current'))
+    old = os.path.join(baseline[1].name, 'src') if baseline else None
+    local = _local_modules(here) | (_local_modules(old) if old else set())
+    for name, modules, code in cases:
+        flat = ''.join('import %s; ' % module for module in modules) + code
+        packaged = ('from digital_sign import %s; ' % ', '.join(modules) if modules else '') + code
+        before = _import_probe(flat, old, rounds, local) if old else None
+        after = _import_probe(packaged, here, rounds, local)
+        print("%-18s %10s %10s  loaded: %s" % (
+            name, '-' if before is None else '%.2f ms' % (before[0] * 1000),
+            '-' if after is None else '%.2f ms' % (after[0] * 1000), ' '.join(after[1]) if after and after[1] else '-'))
+    if baseline is not None:
+        baseline[1].cleanup()
+
+
+def main():
+    print("------------标量乘性能对比开始------------")
+    bench_scalar_mul()
+    print("------------标量乘性能对比结束------------")
+    print("------------标量乘策略对比开始------------")
+    bench_mul_methods()
+    print("------------标量乘策略对比结束------------")
+    print("------------固定基点乘法对比开始------------")
+    bench_fixed_base()
+    print("------------固定基点乘法对比结束------------")
+    print("------------多标量乘对比开始------------")
+    bench_multi_mul()
+    print("------------多标量乘对比结束------------")
+    print("------------SM2验签对比开始------------")
+    bench_sm2_verify()
+    print("------------SM2验签对比结束------------")
+    print("------------Schnorr验签对比开始------------")
+    bench_schnorr_verify()
+    print("------------Schnorr验签对比结束------------")
+    print("------------固定底数模幂对比开始------------")
+    bench_fixed_pow()
+    print("------------固定底数模幂对比结束------------")
+    print("------------密钥复用对比开始------------")
+    bench_key_reuse()
+    print("------------密钥复用对比结束------------")
+    print("------------多进程批量签名开始------------")
+    bench_bulk()
+    print("------------多进程批量签名结束------------")
+    print("------------SM2签名对比开始------------")
+    bench_sm2_sign()
+    print("------------SM2签名对比结束------------")
+    print("------------RSA CRT签名对比开始------------")
+    bench_rsa_crt()
+    print("------------RSA CRT签名对比结束------------")
+    print("------------RSA-PSS杂凑算法对比开始------------")
+    bench_pss()
+    print("------------RSA-PSS杂凑算法对比结束------------")
+    print("------------密钥生成开始------------")
+    bench_keygen()
+    print("------------密钥生成结束------------")
+    print("------------开方与公钥解码对比开始------------")
+    bench_decode()
+    print("------------开方与公钥解码对比结束------------")
+    print("------------SM3吞吐对比开始------------")
+    bench_sm3()
+    print("------------SM3吞吐对比结束------------")
+    print("------------导入耗时对比开始------------")
+    bench_import()
+    print("------------导入耗时对比结束------------")
+    print("------------大数运算后端对比开始------------")
+    bench_arith()
+    print("------------大数运算后端对比结束------------")
+
+
+if __name__ == '__main__':
+    main()
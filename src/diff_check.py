@@ -0,0 +1,309 @@
+from digital_sign.ecc import *
+from digital_sign.sm2 import SM2Key, sm3_hash, sm2_enc, sm2_dec, sm2_enc_stream, sm2_dec_stream, sm2_sign, sm2_verify, sm2_verify_batch, \
+    _sm2_enc_k
+from digital_sign.sm3_lib import SM3, new_sm3
+from digital_sign.lazy_lib import lazy_import
+from digital_sign.rsa_pss import RSAPrivateKey
+from digital_sign.schnorr import SchnorrKey, schnorr_verify, schnorr_verify_batch, _schnorr_e
+from digital_sign.elgamal import ElGamalKey, elgamal_verify
+from digital_sign.prime_lib import schnorr_params
+from digital_sign.sign_lib import HASH_ALGORITHMS, new_hash, fixed_base_pow, multi_pow
+from digital_sign.arith_lib import get_inv, batch_inv
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import rsa, padding
+from cryptography.exceptions import InvalidSignature
+from random import randint, getrandbits
+import os
+import io
+import sys
+
+# GB/T 32918.3 / GM/T 0003.3 附录A中SM3的两个示例
+SM3_VECTORS = (
+    (b'abc', '66c7f0f462eeedd9d1f2d46bdc10e4e24167c4875cf2f7a2297da02b8f4ba8e0'),
+    (b'abcd' * 16, 'debe9ff92275b8a138604889c18e5a4d6fdb70e5387e5765293dcba39c0c5732'),
+)
+# GM/T 0003.5 推荐曲线sm2p256v1上的签名示例，ID为默认的1234567812345678
+SM2_SIGN_VECTOR = {
+    'mes': b'message digest',
+    'd': 0x3945208F7B2144B13F36E38AC6D39F95889393692860B51A42FB81EF4DF7C5B8,
+    'x': 0x09F9DF311E5421A150DD7D161E4BC5C672179FAD1833FC076BB08FF356F35020,
+    'y': 0xCCEA490CE26775A52DC6EA718CC1AA600AED05FBF35E084A6632F6072DA9AD13,
+    'k': 0x59276E27D506861A16680F3AD9C02DCCEF3CC1FA3CDBE4CE6D54B80DEAC1BC21,
+    'r': 0xF5A03B0648D2C4630EEAC513E1BB81A15944DA3827D5B74143AC7EACEEE720B3,
+    's': 0xB1B6AA29DF212FD8763182BC0D421CA1BB9038FD1F7F42D4840B69C485BBC1AA,
+}
+# GM/T 0003.5 推荐曲线sm2p256v1上的加密示例，C1的编码方式不影响C2与C3
+SM2_ENC_VECTOR = {
+    'mes': b'encryption standard',
+    'd': 0x3945208F7B2144B13F36E38AC6D39F95889393692860B51A42FB81EF4DF7C5B8,
+    'k': 0x59276E27D506861A16680F3AD9C02DCCEF3CC1FA3CDBE4CE6D54B80DEAC1BC21,
+    'x1': 0x04EBFC718E8D1798620432268E77FEB6415E2EDE0E073C0F4F640ECD2E149A73,
+    'y1': 0xE858F9D81E5430A57B36DAAB8F950A3C64E6EE6A63094D99283AFF767E124DF0,
+    'c2': bytes.fromhex('21886CA989CA9C7D58087307CA93092D651EFA'),
+    'c3': bytes.fromhex('59983C18F809E262923C53AEC295D30383B54E39D609D160AFCB1908D0BD8766'),
+}
+# 各杂凑算法名对应的cryptography算法，所装版本没有的算法(如35.0之前的SM3)不参与互验
+_CRYPTOGRAPHY_HASHES = {name: getattr(hashes, cls) for name, cls in HASH_ALGORITHMS.items() if hasattr(hashes, cls)}
+
+
+def check_sm3(rounds=50):
+    """
+    当前SM3实现、纯Python SM3与new_hash('sm3')均与标准示例一致，
+    随机长度、分段吸收的数据上与gmssl(已安装时)结果一致
+    :param rounds: 随机测试次数,int
+    :return: 是否通过,bool
+    """
+    for data, expect in SM3_VECTORS:
+        ctx = new_hash('sm3')
+        ctx.update(data)
+        if sm3_hash(data) != expect or SM3(data).hexdigest() != expect or ctx.finalize().hex() != expect:
+            return False
+    gmssl_sm3, gmssl_func = lazy_import('gmssl.sm3'), lazy_import('gmssl.func')
+    for i in range(rounds):
+        data = os.urandom(randint(0, 300))
+        expect = new_sm3(data).digest()
+        if gmssl_sm3 is not None and gmssl_sm3.sm3_hash(gmssl_func.bytes_to_list(data)) != expect.hex():
+            return False
+        cut = randint(0, len(data))
+        for ctx in (new_sm3(), SM3()):
+            ctx.update(memoryview(data)[:cut])
+            copy = ctx.copy()
+            ctx.update(bytearray(data[cut:]))
+            copy.update(data[cut:])
+            if ctx.digest() != expect or copy.digest() != expect:
+                return False
+    return True
+
+
+def check_sm2_vector():
+    """
+    标准示例: 私钥导出的公钥、固定k时的签名值(r,s)以及各验签路径
+    :return: 是否通过,bool
+    """
+    v = SM2_SIGN_VECTOR
+    curve = get_named_curve('sm2p256v1')
+    g, n = curve.g, curve.n
+    key = SM2Key(g, n, v['d'])
+    if (key.pub.x, key.pub.y) != (v['x'], v['y']):
+        return False
+    e = key._e(v['mes'])
+    r = (e + fixed_base_mul(g, v['k']).x) % n
+    s = key.d_inv * (v['k'] - r * v['d']) % n
+    if (r, s) != (v['r'], v['s']):
+        return False
+    sign, bad = (v['r'], v['s']), (v['r'], v['s'] ^ 1)
+    return (sm2_verify(v['mes'], sign, g, n, key.pub) and key.verify(v['mes'], sign)
+            and sm2_verify_batch([(v['mes'], sign, key.pub), (v['mes'], bad, key.pub)], g, n) == [True, False]
+            and not sm2_verify(v['mes'], bad, g, n, key.pub) and not key.verify(b'message digesT', sign))
+
+
+def check_sm2_enc_vector():
+    """
+    标准示例: 固定k时的C1坐标、C2、C3以及解密结果；
+    x2或y2有前导零字节时，C3仍按域元素长度编码的x2、y2计算
+    :return: 是否通过,bool
+    """
+    v = SM2_ENC_VECTOR
+    curve = get_named_curve('sm2p256v1')
+    key = SM2Key(curve.g, curve.n, v['d'])
+    cipher = _sm2_enc_k(v['mes'], curve.g, key.pub, v['k'])
+    length = curve.byte_len + 1
+    c_1 = from_bytes(cipher[:length], curve)
+    if (c_1.x, c_1.y) != (v['x1'], v['y1']) or cipher[length:length + 32] != v['c3'] or cipher[length + 32:] != v['c2']:
+        return False
+    standard = bytes(c_1.encode(compressed=False)) + v['c3'] + v['c2']
+    if sm2_dec(standard, curve.g, key.pri) != v['mes']:
+        return False
+    while True:
+        k = randint(1, curve.n - 1)
+        s = key.pub * k
+        if min(s.x, s.y).bit_length() <= 8 * curve.byte_len - 8:
+            break
+    cipher = _sm2_enc_k(v['mes'], curve.g, key.pub, k)
+    expect = sm3_hash(s.x.to_bytes(curve.byte_len, 'big') + v['mes'] + s.y.to_bytes(curve.byte_len, 'big'))
+    return cipher[length:length + 32].hex() == expect and sm2_dec(cipher, curve.g, key.pri) == v['mes']
+
+
+def check_sm2_sign(count=20):
+    """
+    随机私钥下签名、单个验签、密钥对象验签与批量验签结果一致
+    :param count: 签名数,int
+    :return: 是否通过,bool
+    """
+    curve = get_named_curve('sm2p256v1')
+    key = SM2Key(curve.g, curve.n)
+    items = []
+    for i in range(count):
+        mes = 'message %d' % i
+        sign = sm2_sign(mes, curve.g, curve.n, key.pri) if i % 2 else key.sign(mes)
+        items.append((mes if i % 3 else mes + '!', sign, key.pub))
+    single = [sm2_verify(mes, sign, curve.g, curve.n, pub) for mes, sign, pub in items]
+    expect = [i % 3 != 0 for i in range(count)]
+    return single == expect and sm2_verify_batch(items, curve.g, curve.n) == expect and \
+        [key.verify(mes, sign) for mes, sign, pub in items] == expect
+
+
+def check_sm2_enc():
+    """
+    一次性与流式加解密互通
+    :return: 是否通过,bool
+    """
+    curve = get_named_curve('sm2p256v1')
+    key = SM2Key(curve.g, curve.n)
+    for mes in (b'x', '国密SM2'.encode(), bytes(range(256)) * 40):
+        if sm2_dec(sm2_enc(mes, curve.g, curve.n, key.pub), curve.g, key.pri) != mes:
+            return False
+        cipher = io.BytesIO()
+        sm2_enc_stream(io.BytesIO(mes), cipher, curve.g, curve.n, key.pub)
+        if sm2_dec(cipher.getvalue(), curve.g, key.pri) != mes:
+            return False
+        plain = io.BytesIO()
+        sm2_dec_stream(io.BytesIO(sm2_enc(mes, curve.g, curve.n, key.pub)), plain, curve.g, key.pri)
+        if plain.getvalue() != mes:
+            return False
+    return True
+
+
+def check_rsa_pss(bits=2048):
+    """
+    与cryptography的RSA-PSS双向互验，覆盖各杂凑算法与盐长
+    :param bits: 模数位数,int
+    :return: 是否通过,bool
+    """
+    private = rsa.generate_private_key(public_exponent=65537, key_size=bits)
+    numbers = private.private_numbers()
+    key = RSAPrivateKey(numbers.p, numbers.q, 65537, numbers.d)
+    public = private.public_key()
+    for hash_name, algorithm in _CRYPTOGRAPHY_HASHES.items():
+        for s_len in (None, 0, 17):
+            salt = algorithm.digest_size if s_len is None else s_len
+            pss = padding.PSS(padding.MGF1(algorithm()), salt)
+            sign = key.sign(b'differential', hash_name=hash_name, s_len=s_len)
+            try:
+                public.verify(bytes.fromhex(sign), b'differential', pss, algorithm())
+            except InvalidSignature:
+                return False
+            theirs = private.sign(b'differential', pss, algorithm()).hex()
+            if not key.verify(b'differential', theirs, hash_name=hash_name, s_len=s_len):
+                return False
+            if key.verify(b'differentiaL', theirs, hash_name=hash_name, s_len=s_len):
+                return False
+    return True
+
+
+def check_scalar_mul(rounds=10):
+    """
+    各标量乘策略、固定基点乘与多标量乘结果一致
+    :param rounds: 随机测试次数,int
+    :return: 是否通过,bool
+    """
+    curve = get_named_curve('sm2p256v1')
+    g, n = curve.g, curve.n
+    for i in range(rounds):
+        k, j = randint(1, n - 1), randint(1, n - 1)
+        point = fixed_base_mul(g, j)
+        results = [g.mul(k, method=method) for method in MUL_METHODS] + [fixed_base_mul(g, k)]
+        if any((r.x, r.y) != (results[0].x, results[0].y) for r in results):
+            return False
+        expect = g.mul(k) + point.mul(j)
+        for method in ('straus', 'pippenger'):
+            r = multi_mul([(k, g), (j, point)], method=method)
+            if (r.x, r.y) != (expect.x, expect.y):
+                return False
+    return True
+
+
+def check_group_sign(rounds=20):
+    """
+    Schnorr单个、密钥对象、分组与随机线性组合批量验签一致；ElGamal密钥对象与函数验签一致
+    :param rounds: 签名数,int
+    :return: 是否通过,bool
+    """
+    p, q, alpha = schnorr_params(160, 512)
+    key = SchnorrKey(p, q, alpha)
+    items = []
+    for i in range(rounds):
+        e, y, x = key.sign('message %d' % i, commit=True)
+        if i % 4 == 1:
+            y += 1
+        items.append(('message %d' % i, key.public_key(), (e, y, x)))
+    single = [schnorr_verify(*item) for item in items]
+    if single != [i % 4 != 1 for i in range(rounds)] or [key.verify(mes, sign) for mes, pub, sign in items] != single:
+        return False
+    if schnorr_verify_batch(items) != single or schnorr_verify_batch(items, rlc=True) != single:
+        return False
+    # 承诺值取负(x'=p-alpha^r)的一对签名在随机线性组合中相互抵消，逐个检查与批量检查都必须拒绝
+    forged = []
+    for i in range(2):
+        r = randint(1, q - 1)
+        x = p - pow(alpha, r, p)
+        e = _schnorr_e('forged %d' % i, x)
+        forged.append(('forged %d' % i, key.public_key(), (e, (r + key.s * e) % q, x)))
+    if [schnorr_verify(*item) for item in forged] != [False, False] or \
+            schnorr_verify_batch(forged, rlc=True) != [False, False]:
+        return False
+    elgamal_key = ElGamalKey(alpha, p)
+    for i in range(rounds):
+        sign = elgamal_key.sign('message %d' % i)
+        if not (elgamal_key.verify('message %d' % i, sign) and elgamal_verify('message %d' % i, elgamal_key.public_key(), sign)):
+            return False
+    return True
+
+
+def check_arith(rounds=20):
+    """
+    固定底数模幂、多底数模幂与批量求逆与内置pow一致
+    :param rounds: 随机测试次数,int
+    :return: 是否通过,bool
+    """
+    mod = (1 << 521) - 1
+    base = getrandbits(520)
+    for i in range(rounds):
+        n = getrandbits(521)
+        for method in ('window', 'comb'):
+            if fixed_base_pow(base, n, mod, method=method) != pow(base, n, mod):
+                return False
+    pairs = [(getrandbits(520), getrandbits(64)) for i in range(rounds)]
+    expect = 1
+    for b, e in pairs:
+        expect = expect * pow(b, e, mod) % mod
+    nums = [getrandbits(520) + 1 for i in range(rounds)]
+    return multi_pow(pairs, mod) == expect and batch_inv(nums, mod) == [get_inv(x, mod) for x in nums]
+
+
+CHECKS = (
+    ('sm3 vectors', check_sm3),
+    ('sm2 signature vector', check_sm2_vector),
+    ('sm2 encryption vector', check_sm2_enc_vector),
+    ('sm2 sign/verify paths', check_sm2_sign),
+    ('sm2 enc/dec paths', check_sm2_enc),
+    ('rsa-pss vs cryptography', check_rsa_pss),
+    ('scalar multiplication', check_scalar_mul),
+    ('schnorr/elgamal paths', check_group_sign),
+    ('modular arithmetic', check_arith),
+)
+
+
+def run_checks():
+    """
+    运行全部差分检查，异常视为失败
+    :return: (检查名,是否通过,异常信息)列表,list
+    """
+    results = []
+    for name, check in CHECKS:
+        try:
+            results.append((name, bool(check()), ''))
+        except Exception as e:
+            results.append((name, False, repr(e)))
+    return results
+
+
+def main():
+    results = run_checks()
+    for name, ok, error in results:
+        print("%-26s %s %s" % (name, 'OK' if ok else 'FAIL', error))
+    return 0 if all(ok for name, ok, error in results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,60 @@
+import importlib
+
+# digital_sign包入口: 导入本包几乎没有开销，访问某个名称时才导入其所在的子模块
+# 例如只使用RSA-PSS验签时不会加载gmssl、ECC与进程池相关模块
+
+# 对外名称与其所在模块；与子模块同名的rsa_pss、schnorr、elgamal函数通过子模块访问
+EXPORTS = {
+    'RSAPrivateKey': 'rsa_pss',
+    'rsa_pss_verify': 'rsa_pss',
+    'pss_encode': 'rsa_pss',
+    'SchnorrKey': 'schnorr',
+    'schnorr_verify': 'schnorr',
+    'schnorr_verify_batch': 'schnorr',
+    'ElGamalKey': 'elgamal',
+    'elgamal_verify': 'elgamal',
+    'SM2Key': 'sm2',
+    'sm2_enc': 'sm2',
+    'sm2_dec': 'sm2',
+    'sm2_enc_stream': 'sm2',
+    'sm2_dec_stream': 'sm2',
+    'sm2_sign': 'sm2',
+    'sm2_verify': 'sm2',
+    'sm2_verify_batch': 'sm2',
+    'Point': 'ecc',
+    'get_named_curve': 'ecc',
+    'from_bytes': 'ecc',
+    'decode_public_key': 'ecc',
+    'Prehashed': 'sign_lib',
+    'new_hash': 'sign_lib',
+    'message_digest': 'sign_lib',
+    'bulk_sign': 'bulk_lib',
+    'bulk_verify': 'bulk_lib',
+    'AsyncSigner': 'async_lib',
+    'instrument': 'trace_lib',
+}
+# 可通过属性访问的子模块
+SUBMODULES = ('arith_lib', 'async_lib', 'bulk_lib', 'bytes_lib', 'ecc', 'ecc_lib', 'elgamal', 'prime_lib',
+              'rsa_pss', 'schnorr', 'sign_lib', 'sm2', 'sm3_lib', 'store_lib', 'trace_lib')
+
+__all__ = sorted(EXPORTS)
+
+
+def __getattr__(name):
+    """
+    首次访问时导入对应子模块并缓存结果
+    :param name: 名称,str
+    :return: 对应的对象或子模块
+    """
+    if name in EXPORTS:
+        value = getattr(importlib.import_module('.' + EXPORTS[name], __name__), name)
+    elif name in SUBMODULES:
+        value = importlib.import_module('.' + name, __name__)
+    else:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(EXPORTS) | set(SUBMODULES))
@@ -0,0 +1,166 @@
+from .lazy_lib import lazy_import
+import math
+import os
+import sys
+
+# gmpy2导入较慢，只在首次运算时加载
+gmpy2 = lazy_import('gmpy2')
+
+# 导入时选择大数运算后端: 安装了gmpy2时默认使用gmpy2，可通过环境变量DIGITAL_SIGN_BACKEND=python强制使用内置pow
+# gmpy2已安装但首次运算时无法导入(如缺少动态库)时改为python
+BACKENDS = ('python', 'gmpy2')
+BACKEND = 'gmpy2' if gmpy2 is not None and os.environ.get('DIGITAL_SIGN_BACKEND', 'gmpy2') != 'python' else 'python'
+
+
+def _python_powmod(x, n, m):
+    return pow(x, n, m)
+
+
+def _python_invert(num, mod):
+    return pow(num, -1, mod)
+
+
+def _gmpy2_powmod(x, n, m):
+    return int(gmpy2.powmod(x, n, m))
+
+
+def _gmpy2_invert(num, mod):
+    try:
+        return int(gmpy2.invert(num, mod))
+    except ZeroDivisionError:
+        raise ValueError("base is not invertible for the given modulus")
+
+
+def _gmpy2_native(num):
+    return gmpy2.mpz(num)
+
+
+def _gmpy2_available():
+    """
+    执行延迟的gmpy2导入，导入失败时与未安装同样处理
+    :return: gmpy2是否可用,bool
+    """
+    global gmpy2
+    if gmpy2 is None:
+        return False
+    try:
+        gmpy2.mpz
+    except ImportError:
+        sys.modules.pop('gmpy2', None)
+        gmpy2 = None
+        return False
+    return True
+
+
+def _resolve_backend():
+    """
+    首次运算时确定实际使用的函数，gmpy2不可用时回退到python后端
+    :return: void
+    """
+    global BACKEND, _powmod, _invert, _native
+    if _powmod is not _first_powmod:
+        return
+    if _gmpy2_available():
+        _powmod, _invert, _native = _gmpy2_powmod, _gmpy2_invert, _gmpy2_native
+    else:
+        BACKEND = 'python'
+        _powmod, _invert, _native = _python_powmod, _python_invert, int
+
+
+def _first_powmod(x, n, m):
+    _resolve_backend()
+    return _powmod(x, n, m)
+
+
+def _first_invert(num, mod):
+    _resolve_backend()
+    return _invert(num, mod)
+
+
+def _first_native(num):
+    _resolve_backend()
+    return _native(num)
+
+
+if BACKEND == 'gmpy2':
+    _powmod, _invert, _native = _first_powmod, _first_invert, _first_native
+else:
+    _powmod, _invert, _native = _python_powmod, _python_invert, int
+
+
+def fast_pow(x, n, m):
+    """
+    模幂x^n%m，n为负数时先对x求逆
+    :param x: 底数x, int
+    :param n: 指数n, int
+    :param m: 模数m, int
+    :return: 计算结果, int
+    """
+    return _powmod(x, n, m)
+
+
+def get_inv(num, mod):
+    """
+    求num在mod下的逆元
+    :param num: 求的逆元参数num, int
+    :param mod: 模数mod, int
+    :return: num在mod下的逆元,位于[0,mod)之间, int
+    """
+    return _invert(num, mod)
+
+
+def to_native(num):
+    """
+    转为当前后端的大整数类型，用于预计算表等需要在Python层做大量模乘的场合
+    :param num: 参数num, int
+    :return: gmpy2后端下为mpz，否则为int
+    """
+    return _native(num)
+
+
+def batch_inv(nums, mod):
+    """
+    Montgomery批量求逆，n个数只需一次求逆与约3n次乘法
+    :param nums: 需要求逆的数,均需在mod下可逆,list[int]
+    :param mod: 模数mod, int
+    :return: 各数在mod下的逆元,list[int]
+    """
+    prefix = []
+    acc = 1
+    for num in nums:
+        prefix.append(acc)
+        acc = acc * num % mod
+    if not prefix:
+        return []
+    inv = get_inv(acc, mod)
+    result = [0] * len(prefix)
+    for i in range(len(prefix) - 1, -1, -1):
+        result[i] = inv * prefix[i] % mod
+        inv = inv * nums[i] % mod
+    return result
+
+
+def extended_gcd(a, b):
+    """
+    迭代实现的扩展欧几里得算法
+    :param a: 参数a, int
+    :param b: 参数b, int
+    :return: (g,x,y)，满足 a*x + b*y = g = gcd(a,b)
+    """
+    x_0, x_1, y_0, y_1 = 1, 0, 0, 1
+    while b:
+        q, r = divmod(a, b)
+        a, b = b, r
+        x_0, x_1 = x_1, x_0 - q * x_1
+        y_0, y_1 = y_1, y_0 - q * y_1
+    return a, x_0, y_0
+
+
+def gcd(a, b):
+    """
+    最大公因数求解函数
+    :param a: 参数a, int
+    :param b: 参数b, int
+    :return: a和b的最大公因数，int
+    """
+    return math.gcd(a, b)
@@ -0,0 +1,244 @@
+from .bulk_lib import _init_worker, _run_task, sign_batch_task, verify_batch_task
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+import asyncio
+import math
+import time
+
+# 单个微批的最大请求数
+MAX_BATCH = 32
+# 收到首个请求后等待更多请求合并的最长时间,以秒计
+MAX_DELAY = 0.001
+# 计算延迟分位数时保留的最近请求数
+LATENCY_WINDOW = 10000
+
+
+def percentile(values, q):
+    """
+    最近邻法求分位数
+    :param values: 样本,list[float]
+    :param q: 分位,0到100之间,float
+    :return: 分位数,样本为空时为0.0,float
+    """
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[max(0, math.ceil(q / 100 * len(values)) - 1)]
+
+
+class AsyncSigner:
+    def __init__(self, key, workers=1, max_batch=MAX_BATCH, max_delay=MAX_DELAY):
+        """
+        asyncio签名服务接口，签名与验签在进程池中执行，不阻塞事件循环
+        并发到达的请求合并为微批，支持sign_batch的密钥整批签名
+        需在事件循环中使用，用毕调用close或使用async with
+        :param key: 密钥对象,如SM2Key/SchnorrKey/ElGamalKey/RSAPrivateKey
+        :param workers: 工作进程数,同时执行的微批数不超过该值,int
+        :param max_batch: 单个微批的最大请求数,int
+        :param max_delay: 收到首个请求后等待合并的最长时间,以秒计,float
+        """
+        if hasattr(key, 'precompute'):
+            key.precompute()
+        self.key = key
+        self.workers = workers
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.requests = 0
+        self.batches = 0
+        self.in_flight = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self._pool = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(key,))
+        self._queue = None
+        self._slots = None
+        self._batcher = None
+        self._tasks = set()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def sign(self, mes):
+        """
+        异步签名
+        :param mes: 签名明文
+        :return: 签名
+        """
+        return await self._submit(sign_batch_task, mes)
+
+    async def verify(self, mes, sign):
+        """
+        异步验签
+        :param mes: 签名明文
+        :param sign: 签名
+        :return: 验证成功(True)失败(False)
+        """
+        return await self._submit(verify_batch_task, (mes, sign))
+
+    async def run(self, func, *args):
+        """
+        在进程池中执行其他耗时的模块级函数(如sm2_enc)，不参与合并
+        :param func: 模块级函数
+        :param args: 参数
+        :return: 函数返回值
+        """
+        return await asyncio.get_running_loop().run_in_executor(self._pool, func, *args)
+
+    def metrics(self):
+        """
+        运行指标
+        :return: 排队请求数、执行中的微批数、累计请求与微批数、平均批大小及最近请求的延迟分位数(毫秒),dict
+        """
+        latencies = list(self.latencies)
+        return {
+            'queue_depth': self._queue.qsize() if self._queue is not None else 0,
+            'in_flight': self.in_flight,
+            'requests': self.requests,
+            'batches': self.batches,
+            'mean_batch': self.requests / self.batches if self.batches else 0.0,
+            'p50_ms': percentile(latencies, 50) * 1000,
+            'p99_ms': percentile(latencies, 99) * 1000,
+        }
+
+    async def close(self):
+        """
+        等待已提交的请求完成后关闭进程池
+        :return: void
+        """
+        if self._batcher is not None:
+            await self._queue.put(None)
+            await self._batcher
+            if self._tasks:
+                await asyncio.gather(*self._tasks)
+            self._batcher = None
+        self._pool.shutdown()
+
+    async def _submit(self, task, arg):
+        """
+        把请求放入队列并等待其所在微批完成
+        :param task: 批量任务函数,见bulk_lib
+        :param arg: 请求参数
+        :return: 请求结果
+        """
+        if self._batcher is None:
+            self._queue = asyncio.Queue()
+            self._slots = asyncio.Semaphore(self.workers)
+            self._batcher = asyncio.create_task(self._collect())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((task, arg, future, time.perf_counter()))
+        return await future
+
+    async def _collect(self):
+        """
+        合并循环: 等到空闲的工作进程后，把队列中已有的请求和max_delay内到达的请求组成微批
+        :return: void
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            first = await self._queue.get()
+            if first is None:
+                return
+            await self._slots.acquire()
+            batch = [first]
+            deadline = loop.time() + self.max_delay
+            closing = False
+            while len(batch) < self.max_batch:
+                if self._queue.empty():
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    # 不用wait_for: Python 3.12之前它在超时与取出同时发生时会丢掉取出的请求
+                    # 自行持有get任务，超时后未完成才取消，取消时请求仍留在队列中
+                    getter = loop.create_task(self._queue.get())
+                    await asyncio.wait({getter}, timeout=timeout)
+                    if not getter.done():
+                        getter.cancel()
+                        break
+                    item = getter.result()
+                else:
+                    item = self._queue.get_nowait()
+                if item is None:
+                    closing = True
+                    break
+                batch.append(item)
+            task = asyncio.create_task(self._dispatch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            if closing:
+                return
+
+    async def _dispatch(self, batch):
+        """
+        按任务类型把微批交给进程池执行，并设置各请求的结果
+        :param batch: (任务函数,参数,future,提交时间)列表,list
+        :return: void
+        """
+        loop = asyncio.get_running_loop()
+        self.in_flight += 1
+        try:
+            groups = {}
+            for item in batch:
+                groups.setdefault(item[0], []).append(item)
+            for task, items in groups.items():
+                try:
+                    results = await loop.run_in_executor(self._pool, _run_task, task, [arg for t, arg, f, s in items])
+                except Exception as e:
+                    for t, arg, future, start in items:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+                end = time.perf_counter()
+                for (t, arg, future, start), result in zip(items, results):
+                    self.latencies.append(end - start)
+                    if not future.done():
+                        future.set_result(result)
+                self.requests += len(items)
+                self.batches += 1
+        finally:
+            self.in_flight -= 1
+            self._slots.release()
+
+
+async def load_test(signer, total=1000, concurrency=64):
+    """
+    本地压测: concurrency个并发客户端共发出total个签名请求
+    :param signer: 签名服务,AsyncSigner
+    :param total: 请求总数,int
+    :param concurrency: 并发客户端数,int
+    :return: 吞吐量(次/秒)与signer.metrics()合并后的结果,dict
+    """
+    counter = iter(range(total))
+
+    async def client():
+        for i in counter:
+            await signer.sign('request %d' % i)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for i in range(concurrency)))
+    result = signer.metrics()
+    result['throughput'] = total / (time.perf_counter() - start)
+    return result
+
+
+async def _demo():
+    from .ecc import get_named_curve
+    from .sm2 import SM2Key
+    curve = get_named_curve('sm2p256v1')
+    key = SM2Key(curve.g, curve.n)
+    async with AsyncSigner(key) as signer:
+        sign = await signer.sign('hello')
+        print(await signer.verify('hello', sign), await signer.verify('hellx', sign))
+    for concurrency, max_batch in ((1, MAX_BATCH), (64, 1), (64, MAX_BATCH)):
+        async with AsyncSigner(key, max_batch=max_batch) as signer:
+            result = await load_test(signer, 500, concurrency)
+        print("concurrency=%-3d max_batch=%-3d %.1f req/s  mean batch: %.1f  p50: %.2f ms  p99: %.2f ms" % (
+            concurrency, max_batch, result['throughput'], result['mean_batch'], result['p50_ms'], result['p99_ms']))
+
+
+def main():
+    asyncio.run(_demo())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+from itertools import islice
+import os
+
+# 每个任务包含的消息数
+BULK_CHUNK = 64
+# 每个工作进程最多同时排队的任务数，限制未消费结果占用的内存
+BULK_PENDING_PER_WORKER = 2
+
+_worker_key = None
+
+
+def _init_worker(key):
+    """
+    进程池初始化，密钥及其预计算表随initargs只发送一次
+    :param key: 密钥对象
+    :return: void
+    """
+    global _worker_key
+    _worker_key = key
+
+
+def _run_chunk(func, chunk):
+    """
+    在工作进程中逐条处理一块消息
+    :param func: 模块级任务函数,接受(key,item)
+    :param chunk: 消息块,list
+    :return: 各消息的处理结果,list
+    """
+    return [func(_worker_key, item) for item in chunk]
+
+
+def _run_task(func, arg):
+    """
+    在工作进程中执行一次任务
+    :param func: 模块级任务函数,接受(key,arg)
+    :param arg: 任务参数
+    :return: 任务结果
+    """
+    return func(_worker_key, arg)
+
+
+def sign_task(key, mes):
+    """
+    签名任务
+    :param key: 密钥对象,需提供sign方法
+    :param mes: 签名明文
+    :return: 签名
+    """
+    return key.sign(mes)
+
+
+def verify_task(key, item):
+    """
+    验签任务
+    :param key: 密钥对象,需提供verify方法
+    :param item: (明文,签名)
+    :return: 验证成功(True)失败(False)
+    """
+    mes, sign = item
+    return key.verify(mes, sign)
+
+
+def sign_batch_task(key, mes_list):
+    """
+    批量签名任务，密钥支持sign_batch时整批签名
+    :param key: 密钥对象
+    :param mes_list: 签名明文列表,list
+    :return: 签名列表,list
+    """
+    if hasattr(key, 'sign_batch'):
+        return key.sign_batch(mes_list)
+    return [key.sign(mes) for mes in mes_list]
+
+
+def verify_batch_task(key, items):
+    """
+    批量验签任务
+    :param key: 密钥对象
+    :param items: (明文,签名)列表,list
+    :return: 验证结果列表,list[bool]
+    """
+    return [key.verify(mes, sign) for mes, sign in items]
+
+
+def bulk_map(func, key, items, workers=None, chunk_size=BULK_CHUNK, max_pending=None):
+    """
+    使用进程池对大量消息执行func(key,item)，按输入顺序流式返回结果
+    输入按chunk_size分块惰性读取，排队的任务块不超过max_pending，消费方处理慢时不会继续读取输入
+    :param func: 模块级任务函数,接受(key,item)
+    :param key: 密钥对象,有precompute方法时先在主进程建立预计算表再发送给工作进程
+    :param items: 消息的可迭代对象
+    :param workers: 进程数,为None时使用全部CPU,为1时在当前进程执行,int
+    :param chunk_size: 每个任务的消息数,int
+    :param max_pending: 同时排队的任务块数,为None时为workers*BULK_PENDING_PER_WORKER,int
+    :return: 结果生成器
+    """
+    workers = workers or os.cpu_count() or 1
+    items = iter(items)
+    if hasattr(key, 'precompute'):
+        key.precompute()
+    if workers <= 1:
+        for item in items:
+            yield func(key, item)
+        return
+    max_pending = max_pending or workers * BULK_PENDING_PER_WORKER
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(key,)) as pool:
+        pending = deque()
+        try:
+            while True:
+                while len(pending) < max_pending:
+                    chunk = list(islice(items, chunk_size))
+                    if not chunk:
+                        break
+                    pending.append(pool.submit(_run_chunk, func, chunk))
+                if not pending:
+                    break
+                yield from pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def bulk_sign(key, messages, workers=None, chunk_size=BULK_CHUNK):
+    """
+    多进程批量签名
+    :param key: 密钥对象,如SM2Key/SchnorrKey/ElGamalKey/RSAPrivateKey
+    :param messages: 签名明文的可迭代对象
+    :param workers: 进程数,int
+    :param chunk_size: 每个任务的消息数,int
+    :return: 按输入顺序的签名生成器
+    """
+    return bulk_map(sign_task, key, messages, workers, chunk_size)
+
+
+def bulk_verify(key, items, workers=None, chunk_size=BULK_CHUNK):
+    """
+    多进程批量验签
+    :param key: 密钥对象,如SM2Key/SchnorrKey/ElGamalKey/RSAPrivateKey
+    :param items: (明文,签名)的可迭代对象
+    :param workers: 进程数,int
+    :param chunk_size: 每个任务的消息数,int
+    :return: 按输入顺序的验证结果生成器
+    """
+    return bulk_map(verify_task, key, items, workers, chunk_size)
+
+
+def main():
+    from .ecc import get_named_curve
+    from .rsa_pss import generate_key
+    from .sm2 import SM2Key
+    curve = get_named_curve('sm2p256v1')
+    mes_list = ['record %d' % i for i in range(200)]
+    for key in (SM2Key(curve.g, curve.n), generate_key(1024)):
+        signs = list(bulk_sign(key, mes_list, workers=2, chunk_size=16))
+        print(all(bulk_verify(key, zip(mes_list, signs), workers=2, chunk_size=16)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+from functools import lru_cache
+
+# 不短于该长度的等长异或交给NumPy处理
+NUMPY_THRESHOLD = 4096
+
+
+def bytes_xor(a, b, lens=None, out=None):
+    """
+    字节串异或函数，支持bytes/bytearray/memoryview等缓冲区对象
+    两个参数按大端整数右对齐后异或，结果再按lens对齐
+    :param a: 字节串a,bytes-like
+    :param b: 字节串b,bytes-like
+    :param lens: 指定输出长度,以字节计算,int
+    :param out: 可写的输出缓冲区,给出时结果写入其前lens字节并返回out,bytearray/memoryview
+    :return: 字节串异或结果
+    """
+    if lens is not None and len(a) == len(b) == lens and lens >= NUMPY_THRESHOLD and _numpy() is not None:
+        numpy = _numpy()
+        result = numpy.bitwise_xor(numpy.frombuffer(a, dtype=numpy.uint8), numpy.frombuffer(b, dtype=numpy.uint8))
+        if out is None:
+            return result.tobytes()
+        memoryview(out)[:lens] = result.data
+        return out
+    result = align(int.from_bytes(a, 'big') ^ int.from_bytes(b, 'big'), lens)
+    if out is None:
+        return result
+    memoryview(out)[:len(result)] = result
+    return out
+
+
+@lru_cache(maxsize=None)
+def _numpy():
+    """
+    NumPy导入较慢，首次处理长字节串时才导入
+    :return: numpy模块,未安装或无法导入时为None
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def align(num, lens=None):
+    """
+    字节对齐函数
+    :param num: 用于对其的值,int
+    :param lens: 指定输出长度,为None时使用最短长度(0编码为一个字节),int
+    :return: 字节对齐结果
+    """
+    if lens is None:
+        lens = max(1, (num.bit_length() + 7) // 8)
+    elif num.bit_length() > lens * 8:
+        return num.to_bytes((num.bit_length() + 7) // 8, 'big')
+    return num.to_bytes(lens, 'big')
@@ -0,0 +1,974 @@
+from .ecc_lib import *
+from .arith_lib import batch_inv
+from functools import lru_cache
+from math import isqrt
+
+# 标量乘策略: binary为左到右倍加, wnaf为宽度w的NAF, ladder为Montgomery梯形(用于私钥运算)
+MUL_METHODS = ('binary', 'wnaf', 'ladder')
+_default_mul = ['wnaf', 4]
+
+
+# 固定基点预计算表的窗口宽度与缓存的表数量
+FIXED_BASE_WIDTH = 4
+FIXED_BASE_CACHE_SIZE = 8
+
+# 多标量乘: 不超过该点数时使用Straus交错算法，否则使用Pippenger桶算法
+MULTI_MUL_THRESHOLD = 48
+MULTI_MUL_WIDTH = 4
+
+# 按编码缓存的已解码公钥数量
+PUBLIC_KEY_CACHE_SIZE = 1024
+
+# 所有曲线按(p,a,b)驻留，同一参数只对应一个Curve对象，曲线比较只需比较身份
+_curves = {}
+# 命名曲线注册表
+CURVES = {}
+
+
+class Curve:
+    def __init__(self, p, a, b, n=None, name=None):
+        """
+        Curve constructor. 请通过get_curve或register_curve获取驻留的曲线对象
+        :param p: 素数p,int
+        :param a: 参数a,int
+        :param b: 参数b,int
+        :param n: 基点的阶n,未知时为None,int
+        :param name: 曲线名,str
+        """
+        self.p = p
+        self.a = a % p
+        self.b = b % p
+        self.n = n
+        self.name = name
+        self.g = None
+        self.mul_method = None
+        self.byte_len = (p.bit_length() + 7) // 8
+        self.tables = {}
+
+    def contains(self, x, y):
+        """
+        检查(x,y)是否在曲线上
+        :param x: x,int
+        :param y: y,int
+        :return: 在曲线上/否，bool
+        """
+        p = self.p
+        return (y * y - x * x * x - self.a * x - self.b) % p == 0
+
+    def group_order(self):
+        """
+        曲线群的阶: 基点阶n已知且由Hasse界(#E <= p+1+2*sqrt(p) < 2n)可知余因子为1时即为n
+        :return: 群阶,无法确定时为None,int
+        """
+        n = self.n
+        if n is None or 2 * n <= self.p + 1 + 2 * (isqrt(self.p) + 1):
+            return None
+        return n
+
+    def __reduce__(self):
+        """
+        序列化时只保存曲线参数与生成元，反序列化后得到接收方进程中的驻留曲线，预计算表不随之传递
+        :return: 重建参数
+        """
+        g = (self.g.x, self.g.y) if self.g is not None else None
+        return _restore_curve, (self.p, self.a, self.b, self.n, self.name, g)
+
+    def base_table(self, w=FIXED_BASE_WIDTH):
+        """
+        生成元G的固定基点预计算表，首次调用时构建并缓存在曲线上
+        :param w: 窗口宽度,int
+        :return: 预计算表,见_build_fixed_base_table
+        """
+        table = self.tables.get(w)
+        if table is None:
+            table = _build_fixed_base_table(self.g.x, self.g.y, self, w)
+            self.tables[w] = table
+        return table
+
+
+def get_curve(p, a, b):
+    """
+    获取参数为(p,a,b)的驻留曲线，不存在时新建一条匿名曲线
+    :param p: 素数p,int
+    :param a: 参数a,int
+    :param b: 参数b,int
+    :return: 曲线,Curve
+    """
+    key = (p, a % p, b % p)
+    curve = _curves.get(key)
+    if curve is None:
+        curve = _curves.setdefault(key, Curve(p, a, b))
+    return curve
+
+
+def register_curve(name, p, a, b, n, gx, gy):
+    """
+    注册命名曲线
+    :param name: 曲线名,str
+    :param p: 素数p,int
+    :param a: 参数a,int
+    :param b: 参数b,int
+    :param n: 基点的阶n,int
+    :param gx: 基点x,int
+    :param gy: 基点y,int
+    :return: 曲线,Curve
+    """
+    curve = get_curve(p, a, b)
+    if not curve.contains(gx, gy):
+        raise ValueError("Generator is not on the curve!")
+    curve.n = n
+    curve.name = name
+    curve.g = Point(gx, gy, curve)
+    CURVES[name] = curve
+    return curve
+
+
+def _restore_curve(p, a, b, n, name, g):
+    """
+    反序列化曲线，返回驻留对象；命名曲线在本进程尚未注册时一并注册
+    :param p: 素数p,int
+    :param a: 参数a,int
+    :param b: 参数b,int
+    :param n: 基点的阶n,int
+    :param name: 曲线名,str
+    :param g: 生成元坐标,(int,int)
+    :return: 曲线,Curve
+    """
+    curve = get_curve(p, a, b)
+    if curve.g is None and g is not None:
+        if name is not None:
+            return register_curve(name, p, a, b, n, *g)
+        curve.n = n
+        curve.g = Point(g[0], g[1], curve)
+    return curve
+
+
+def get_named_curve(name):
+    """
+    按名称获取已注册的曲线
+    :param name: 曲线名,str
+    :return: 曲线,Curve
+    """
+    if name not in CURVES:
+        raise ValueError("Unknown curve: " + str(name))
+    return CURVES[name]
+
+
+def set_mul_method(method, w=4, curve=None):
+    """
+    设置标量乘策略
+    :param method: 策略名,见MUL_METHODS,str
+    :param w: wNAF窗口宽度,int
+    :param curve: 仅对该曲线生效,为None时设置全局默认,Curve
+    :return: void
+    """
+    if method not in MUL_METHODS:
+        raise ValueError("Unknown scalar multiplication method: " + str(method))
+    if w < 2:
+        raise ValueError("wNAF width must be at least 2")
+    if curve is None:
+        _default_mul[0], _default_mul[1] = method, w
+    else:
+        curve.mul_method = (method, w)
+
+
+class Point:
+    __slots__ = ('x', 'y', 'curve')
+
+    def __init__(self, x, y, p, a=None, b=None):
+        """
+        Point constructor.
+        :param x: x,int
+        :param y: y,int
+        :param p: 所在曲线,Curve; 也可以传入素数p,int,此时需同时给出a,b
+        :param a: 参数a,int
+        :param b: 参数b,int
+        """
+        self.x = x
+        self.y = y
+        self.curve = p if isinstance(p, Curve) else get_curve(p, a, b)
+
+    @property
+    def p(self):
+        return self.curve.p
+
+    @property
+    def a(self):
+        return self.curve.a
+
+    @property
+    def b(self):
+        return self.curve.b
+
+    def is_zero(self):
+        """
+        检查该点是否为无穷远点
+        :return: 是无穷远点(0,0)/否，bool
+        """
+        return self.x == 0 and self.y == 0
+
+    def check(self, other):
+        """
+        参数检查，用于检验是否为同一曲线
+        :param other: 另一个点,Point
+        :return: 是同一曲线/否，bool
+        """
+        return isinstance(other, Point) and self.curve is other.curve
+
+    def __add__(self, other):
+        """
+        ECC加法
+        :param other: 另一个点,Point
+        :return: 加法结果，Point
+        """
+        if not self.check(other):
+            raise IndexError("You get wrong args.")
+        if self.is_zero():
+            return Point(other.x, other.y, self.curve)
+        elif other.is_zero():
+            return Point(self.x, self.y, self.curve)
+        elif self == other:
+            lam = (3 * (self.x ** 2) + self.a) * get_inv((2 * self.y) % self.p, self.p) % self.p
+            x = (lam ** 2 - 2 * self.x) % self.p
+            y = (lam * (self.x - x) - self.y) % self.p
+            return Point(x, y, self.curve)
+        elif self.x == other.x:
+            return Point(0, 0, self.curve)
+        else:
+            lam = (other.y - self.y) * get_inv((other.x - self.x) % self.p, self.p) % self.p
+            x = (lam ** 2 - other.x - self.x) % self.p
+            y = (lam * (self.x - x) - self.y) % self.p
+            return Point(x, y, self.curve)
+
+    def __neg__(self):
+        """
+        点的逆元方法
+        :return: 该点的逆元,Point
+        """
+        return Point(self.x, (-self.y) % self.p, self.curve)
+
+    def __eq__(self, other):
+        """
+        检查两个点是否相等
+        :param other: 另一个点，Point
+        :return: 是一个点/否，bool
+        """
+        if self.check(other):
+            return self.x == other.x and self.y == other.y
+        else:
+            return self.check(other)
+
+    def __sub__(self, other):
+        """
+        ECC减法
+        :param other: 另一个点，Point
+        :return: 减法结果，Point
+        """
+        return self + (-other)
+
+    def __mul__(self, times):
+        """
+        ECC乘法，请将倍乘数后置，使用曲线或全局默认的标量乘策略
+        :param times: 倍乘数,int
+        :return: 乘法结果，Point
+        """
+        return self.mul(times)
+
+    def mul(self, times, method=None, w=None):
+        """
+        指定策略的ECC乘法
+        内部使用Jacobian坐标进行运算，仅在最后做一次求逆转回仿射坐标
+        :param times: 倍乘数,int
+        :param method: 策略名,见MUL_METHODS,为None时使用曲线或全局默认,str
+        :param w: wNAF窗口宽度,int
+        :return: 乘法结果，Point
+        """
+        if method is None:
+            method, default_w = self.curve.mul_method or _default_mul
+            w = default_w if w is None else w
+        elif w is None:
+            w = _default_mul[1]
+        if method not in MUL_METHODS:
+            raise ValueError("Unknown scalar multiplication method: " + str(method))
+        if times < 0:
+            return (-self).mul(-times, method, w)
+        if times == 0 or self.is_zero():
+            return Point(0, 0, self.curve)
+        if method == 'wnaf':
+            result = _wnaf_mul(self.x, self.y, times, w, self.a, self.p)
+        elif method == 'ladder':
+            result = _ladder_mul(self.x, self.y, times, self.a, self.p, self.curve.group_order())
+        else:
+            result = _binary_mul(self.x, self.y, times, self.a, self.p)
+        return self._from_jacobian(result)
+
+    def _from_jacobian(self, jac):
+        """
+        Jacobian坐标转回同一曲线上的仿射点
+        :param jac: Jacobian坐标(X,Y,Z),tuple
+        :return: 仿射点,Point
+        """
+        x, y = _to_affine(jac, self.p)
+        return Point(x, y, self.curve)
+
+    def __bytes__(self):
+        """
+        消息编码，通过bytes(x)调用，使用压缩格式
+        :return: 消息编码结果，bytes
+        """
+        return self.encode()
+
+    def encode(self, compressed=True):
+        """
+        点的字节串编码: 无穷远点为00，压缩格式为02/03||x，非压缩格式为04||x||y
+        :param compressed: 是否使用压缩格式,bool
+        :return: 编码结果,bytes
+        """
+        if self.is_zero():
+            return b'\x00'
+        length = self.curve.byte_len
+        if compressed:
+            return bytes((2 + (self.y & 1),)) + self.x.to_bytes(length, 'big')
+        return b'\x04' + self.x.to_bytes(length, 'big') + self.y.to_bytes(length, 'big')
+
+
+def _to_affine(jac, p):
+    """
+    Jacobian坐标(X,Y,Z)转仿射坐标(X/Z^2,Y/Z^3)，仅需一次求逆
+    :param jac: Jacobian坐标,tuple
+    :param p: 素数p,int
+    :return: 仿射坐标(x,y)，无穷远点为(0,0),tuple
+    """
+    x, y, z = jac
+    if z == 0:
+        return 0, 0
+    z_inv = get_inv(z, p) % p
+    z_inv2 = z_inv * z_inv % p
+    return x * z_inv2 % p, y * z_inv2 * z_inv % p
+
+
+def _normalize(points, p):
+    """
+    使用批量求逆将Jacobian坐标的点一起化为Z=1的形式，便于之后使用混合加法
+    整批只需一次求逆
+    :param points: Jacobian坐标点列表,不含无穷远点,list[tuple]
+    :param p: 素数p,int
+    :return: Z=1的Jacobian坐标点列表,list[tuple]
+    """
+    result = []
+    for (x, y, z), z_inv in zip(points, batch_inv([jac[2] for jac in points], p)):
+        z_inv2 = z_inv * z_inv % p
+        result.append((x * z_inv2 % p, y * z_inv2 * z_inv % p, 1))
+    return result
+
+
+def _jacobian_x_equals(jac, x, p):
+    """
+    不求逆地判断Jacobian点的仿射x坐标是否等于x，即 X == x*Z^2
+    :param jac: Jacobian坐标(X,Y,Z),tuple
+    :param x: 仿射x,int
+    :param p: 素数p,int
+    :return: 相等(True)/不等或为无穷远点(False),bool
+    """
+    z = jac[2]
+    return z != 0 and (jac[0] - x * z * z) % p == 0
+
+
+def _jacobian_double(jac, a, p):
+    """
+    Jacobian坐标下的倍点运算，不需要求逆
+    :param jac: Jacobian坐标(X,Y,Z),tuple
+    :param a: 参数a,int
+    :param p: 素数p,int
+    :return: 2倍点的Jacobian坐标,tuple
+    """
+    x, y, z = jac
+    if z == 0 or y == 0:
+        return 1, 1, 0
+    yy = y * y % p
+    s = 4 * x * yy % p
+    zz = z * z % p
+    m = (3 * x * x + a * zz * zz) % p
+    x3 = (m * m - 2 * s) % p
+    y3 = (m * (s - x3) - 8 * yy * yy) % p
+    z3 = 2 * y * z % p
+    return x3, y3, z3
+
+
+def _jacobian_add_mixed(jac, x2, y2, a, p):
+    """
+    Jacobian点与仿射点的混合加法，不需要求逆
+    :param jac: Jacobian坐标(X,Y,Z),tuple
+    :param x2: 仿射点x,int
+    :param y2: 仿射点y,int
+    :param a: 参数a,int
+    :param p: 素数p,int
+    :return: 加法结果的Jacobian坐标,tuple
+    """
+    x1, y1, z1 = jac
+    if z1 == 0:
+        return x2, y2, 1
+    z1z1 = z1 * z1 % p
+    h = (x2 * z1z1 - x1) % p
+    r = (y2 * z1 * z1z1 - y1) % p
+    if h == 0:
+        if r == 0:
+            return _jacobian_double(jac, a, p)
+        return 1, 1, 0
+    hh = h * h % p
+    hhh = h * hh % p
+    v = x1 * hh % p
+    x3 = (r * r - hhh - 2 * v) % p
+    y3 = (r * (v - x3) - y1 * hhh) % p
+    z3 = z1 * h % p
+    return x3, y3, z3
+
+
+def _jacobian_add(jac1, jac2, a, p):
+    """
+    Jacobian坐标下的一般点加，不需要求逆
+    :param jac1: Jacobian坐标(X1,Y1,Z1),tuple
+    :param jac2: Jacobian坐标(X2,Y2,Z2),tuple
+    :param a: 参数a,int
+    :param p: 素数p,int
+    :return: 加法结果的Jacobian坐标,tuple
+    """
+    x1, y1, z1 = jac1
+    x2, y2, z2 = jac2
+    if z1 == 0:
+        return jac2
+    if z2 == 0:
+        return jac1
+    if z2 == 1:
+        return _jacobian_add_mixed(jac1, x2, y2, a, p)
+    z1z1 = z1 * z1 % p
+    z2z2 = z2 * z2 % p
+    u1 = x1 * z2z2 % p
+    s1 = y1 * z2 * z2z2 % p
+    h = (x2 * z1z1 - u1) % p
+    r = (y2 * z1 * z1z1 - s1) % p
+    if h == 0:
+        if r == 0:
+            return _jacobian_double(jac1, a, p)
+        return 1, 1, 0
+    hh = h * h % p
+    hhh = h * hh % p
+    v = u1 * hh % p
+    x3 = (r * r - hhh - 2 * v) % p
+    y3 = (r * (v - x3) - s1 * hhh) % p
+    z3 = z1 * z2 * h % p
+    return x3, y3, z3
+
+
+def _binary_mul(x, y, times, a, p):
+    """
+    左到右倍加标量乘
+    :param x: 仿射点x,int
+    :param y: 仿射点y,int
+    :param times: 正倍乘数,int
+    :param a: 参数a,int
+    :param p: 素数p,int
+    :return: 乘法结果的Jacobian坐标,tuple
+    """
+    result = (x, y, 1)
+    for bit in bin(times)[3:]:
+        result = _jacobian_double(result, a, p)
+        if bit == '1':
+            result = _jacobian_add_mixed(result, x, y, a, p)
+    return result
+
+
+def wnaf(times, w):
+    """
+    计算宽度w的NAF表示
+    :param times: 正整数,int
+    :param w: 窗口宽度,int
+    :return: 由低位到高位的NAF数字,非零数字均为绝对值小于2^(w-1)的奇数,list[int]
+    """
+    digits = []
+    full = 1 << w
+    half = 1 << (w - 1)
+    while times > 0:
+        if times & 1:
+            d = times & (full - 1)
+            if d >= half:
+                d -= full
+            times -= d
+        else:
+            d = 0
+        digits.append(d)
+        times >>= 1
+    return digits
+
+
+def _odd_multiples(x, y, w, a, p):
+    """
+    wNAF预计算表，奇数倍点P,3P,...,(2^(w-1)-1)P
+    :param x: 仿射点x,int
+    :param y: 仿射点y,int
+    :param w: 窗口宽度,int
+    :param a: 参数a,int
+    :param p: 素数p,int
+    :return: Jacobian坐标的奇数倍点,第i项为(2i+1)P,list[tuple]
+    """
+    base = (x, y, 1)
+    double = _jacobian_double(base, a, p)
+    table = [base]
+    for i in range((1 << (w - 2)) - 1):
+        table.append(_jacobian_add(table[-1], double, a, p))
+    return table
+
+
+def _wnaf_mul(x, y, times, w, a, p):
+    """
+    wNAF标量乘，预计算奇数倍点P,3P,...,(2^(w-1)-1)P
+    :param x: 仿射点x,int
+    :param y: 仿射点y,int
+    :param times: 正倍乘数,int
+    :param w: 窗口宽度,int
+    :param a: 参数a,int
+    :param p: 素数p,int
+    :return: 乘法结果的Jacobian坐标,tuple
+    """
+    return _wnaf_table_mul(_odd_multiples(x, y, w, a, p), times, w, a, p)
+
+
+def _wnaf_table_mul(table, times, w, a, p):
+    """
+    使用已有奇数倍点表的wNAF标量乘，表可以被同一个点的多次乘法复用
+    :param table: 奇数倍点表,见_odd_multiples,list[tuple]
+    :param times: 正倍乘数,int
+    :param w: 窗口宽度,int
+    :param a: 参数a,int
+    :param p: 素数p,int
+    :return: 乘法结果的Jacobian坐标,tuple
+    """
+    result = (1, 1, 0)
+    for d in reversed(wnaf(times, w)):
+        result = _jacobian_double(result, a, p)
+        if d > 0:
+            result = _jacobian_add(result, table[d >> 1], a, p)
+        elif d < 0:
+            tx, ty, tz = table[(-d) >> 1]
+            result = _jacobian_add(result, (tx, p - ty, tz), a, p)
+    return result
+
+
+def _ladder_mul(x, y, times, a, p, n=None):
+    """
+    Montgomery梯形标量乘，每一位固定执行一次点加与一次倍点
+    倍乘数先补成最高位固定的定长标量: 已知群阶n时取k+n或k+2n(n的位数+1位)，否则取k+2^L并在最后减去2^L*P，
+    循环从r_0=P, r_1=2P开始，迭代次数与倍乘数的前导零无关，不会因无穷远点的提前返回而泄露私钥位数
+    注意Python大整数运算本身不是常数时间，这里只保证运算序列与私钥无关
+    :param x: 仿射点x,int
+    :param y: 仿射点y,int
+    :param times: 正倍乘数,int
+    :param a: 参数a,int
+    :param p: 素数p,int
+    :param n: 群阶(所有点的阶都整除n),未知时为None,int
+    :return: 乘法结果的Jacobian坐标,tuple
+    """
+    if n is not None:
+        times %= n
+        times += n if (times + n).bit_length() > n.bit_length() else 2 * n
+        shift = 0
+    else:
+        shift = max(times.bit_length(), p.bit_length() + 1)
+        times += 1 << shift
+    r_0 = (x, y, 1)
+    r_1 = _jacobian_double(r_0, a, p)
+    for i in range(times.bit_length() - 2, -1, -1):
+        if (times >> i) & 1:
+            r_0 = _jacobian_add(r_0, r_1, a, p)
+            r_1 = _jacobian_double(r_1, a, p)
+        else:
+            r_1 = _jacobian_add(r_0, r_1, a, p)
+            r_0 = _jacobian_double(r_0, a, p)
+    if shift:
+        offset = (x, y, 1)
+        for i in range(shift):
+            offset = _jacobian_double(offset, a, p)
+        r_0 = _jacobian_add(r_0, (offset[0], p - offset[1], offset[2]), a, p)
+    return r_0
+
+
+def _build_fixed_base_table(x, y, curve, w):
+    """
+    构建固定基点窗口表，第i行第j列为 j*2^(w*i)*G 的仿射坐标
+    :param x: 基点x,int
+    :param y: 基点y,int
+    :param curve: 所在曲线,Curve
+    :param w: 窗口宽度,int
+    :return: 预计算表,无穷远点记为None,list[list[(int,int)]]
+    """
+    p, a = curve.p, curve.a
+    bits = curve.n.bit_length() if curve.g is not None and curve.g.x == x and curve.g.y == y else p.bit_length() + 1
+    rows = -(-bits // w)
+    entries = []
+    base = (x, y, 1)
+    for i in range(rows):
+        current = base
+        for j in range(1, 1 << w):
+            entries.append(current)
+            current = _jacobian_add(current, base, a, p)
+        base = current
+    affine = iter(_normalize([jac for jac in entries if jac[2] != 0], p))
+    entries = iter(entries)
+    table = []
+    for i in range(rows):
+        row = [None]
+        for j in range(1, 1 << w):
+            row.append(None if next(entries)[2] == 0 else next(affine)[:2])
+        table.append(row)
+    return table
+
+
+@lru_cache(maxsize=FIXED_BASE_CACHE_SIZE)
+def _fixed_base_table(x, y, curve, w):
+    """
+    非生成元基点的固定基点窗口表
+    以曲线与基点为键缓存在进程内，缓存大小为FIXED_BASE_CACHE_SIZE
+    :param x: 基点x,int
+    :param y: 基点y,int
+    :param curve: 所在曲线,Curve
+    :param w: 窗口宽度,int
+    :return: 预计算表,见_build_fixed_base_table
+    """
+    return _build_fixed_base_table(x, y, curve, w)
+
+
+def fixed_base_mul(g, times, w=FIXED_BASE_WIDTH):
+    """
+    固定基点乘法，适用于同一基点(如生成元G)的反复乘法
+    首次调用时构建预计算表，之后每次乘法只需要约 位数/w 次混合加法
+    生成元的表由曲线持有，其它基点的表放在有界LRU缓存中
+    :param g: 基点G,Point
+    :param times: 倍乘数,int
+    :param w: 窗口宽度,int
+    :return: 乘法结果,Point
+    """
+    curve = g.curve
+    if curve.g is not None and g == curve.g:
+        times %= curve.n
+        table = curve.base_table(w)
+    elif times < 0:
+        return -fixed_base_mul(g, -times, w)
+    else:
+        table = None
+    if times == 0 or g.is_zero():
+        return Point(0, 0, curve)
+    if table is None:
+        table = _fixed_base_table(g.x, g.y, curve, w)
+    if times.bit_length() > len(table) * w:
+        return g * times
+    return g._from_jacobian(_fixed_base_jacobian(table, times, w, curve.a, curve.p))
+
+
+def fixed_base_mul_batch(g, scalars, w=FIXED_BASE_WIDTH):
+    """
+    批量固定基点乘法，所有结果一起批量求逆化为仿射坐标，整批只需一次求逆
+    :param g: 基点G,Point
+    :param scalars: 倍乘数列表,list[int]
+    :param w: 窗口宽度,int
+    :return: 乘法结果列表,list[Point]
+    """
+    curve = g.curve
+    is_generator = curve.g is not None and g == curve.g
+    if is_generator:
+        scalars = [times % curve.n for times in scalars]
+        table = curve.base_table(w)
+    elif all(times >= 0 for times in scalars):
+        table = _fixed_base_table(g.x, g.y, curve, w)
+    else:
+        return [fixed_base_mul(g, times, w) for times in scalars]
+    a, p = curve.a, curve.p
+    jacs = []
+    for times in scalars:
+        if g.is_zero() or times == 0:
+            jacs.append((1, 1, 0))
+        elif times.bit_length() > len(table) * w:
+            jacs.append(_wnaf_mul(g.x, g.y, times, MULTI_MUL_WIDTH, a, p))
+        else:
+            jacs.append(_fixed_base_jacobian(table, times, w, a, p))
+    affine = iter(_normalize([jac for jac in jacs if jac[2] != 0], p))
+    result = []
+    for jac in jacs:
+        if jac[2] == 0:
+            result.append(Point(0, 0, curve))
+        else:
+            x, y, z = next(affine)
+            result.append(Point(x, y, curve))
+    return result
+
+
+def _fixed_base_jacobian(table, times, w, a, p):
+    """
+    使用固定基点窗口表的标量乘，调用方需保证times不超过表的位数
+    :param table: 预计算表,见_build_fixed_base_table
+    :param times: 非负倍乘数,int
+    :param w: 窗口宽度,int
+    :param a: 参数a,int
+    :param p: 素数p,int
+    :return: 乘法结果的Jacobian坐标,tuple
+    """
+    mask = (1 << w) - 1
+    result = (1, 1, 0)
+    for row in table:
+        point = row[times & mask]
+        if point is not None:
+            result = _jacobian_add_mixed(result, point[0], point[1], a, p)
+        times >>= w
+        if times == 0:
+            break
+    return result
+
+
+def _straus(pairs, w, a, p):
+    """
+    Straus交错标量乘，所有点共用一条倍点链，每个点使用各自的wNAF表
+    所有表一起做一次批量求逆仿射化，之后的点加均为混合加法
+    :param pairs: (正倍乘数,非零点)列表,list[(int,Point)]
+    :param w: 窗口宽度,int
+    :param a: 参数a,int
+    :param p: 素数p,int
+    :return: 结果的Jacobian坐标,tuple
+    """
+    tables = []
+    digits = []
+    for times, point in pairs:
+        tables.append(_odd_multiples(point.x, point.y, w, a, p))
+        digits.append(wnaf(times, w))
+    entries = [jac for table in tables for jac in table]
+    if all(jac[2] != 0 for jac in entries):
+        entries = _normalize(entries, p)
+        size = len(tables[0])
+        tables = [entries[i:i + size] for i in range(0, len(entries), size)]
+    result = (1, 1, 0)
+    for i in range(max(len(d) for d in digits) - 1, -1, -1):
+        result = _jacobian_double(result, a, p)
+        for table, naf in zip(tables, digits):
+            if i >= len(naf):
+                continue
+            d = naf[i]
+            if d > 0:
+                result = _jacobian_add(result, table[d >> 1], a, p)
+            elif d < 0:
+                tx, ty, tz = table[(-d) >> 1]
+                result = _jacobian_add(result, (tx, p - ty, tz), a, p)
+    return result
+
+
+def _pippenger(pairs, a, p):
+    """
+    Pippenger桶算法标量乘，适用于大批量的(倍乘数,点)对
+    每个c位窗口内先把点按数字放入桶中，再用累加技巧求 sum(j*bucket_j)
+    :param pairs: (正倍乘数,非零点)列表,list[(int,Point)]
+    :param a: 参数a,int
+    :param p: 素数p,int
+    :return: 结果的Jacobian坐标,tuple
+    """
+    c = max(2, len(pairs).bit_length() - 2)
+    mask = (1 << c) - 1
+    bits = max(times.bit_length() for times, point in pairs)
+    result = (1, 1, 0)
+    for shift in range((bits - 1) // c * c, -1, -c):
+        for i in range(c):
+            result = _jacobian_double(result, a, p)
+        buckets = [(1, 1, 0)] * (mask + 1)
+        for times, point in pairs:
+            d = (times >> shift) & mask
+            if d:
+                buckets[d] = _jacobian_add_mixed(buckets[d], point.x, point.y, a, p)
+        running = (1, 1, 0)
+        window = (1, 1, 0)
+        for d in range(mask, 0, -1):
+            running = _jacobian_add(running, buckets[d], a, p)
+            window = _jacobian_add(window, running, a, p)
+        result = _jacobian_add(result, window, a, p)
+    return result
+
+
+def multi_mul(pairs, method=None, w=MULTI_MUL_WIDTH):
+    """
+    多标量乘 k1*P1 + k2*P2 + ... + kn*Pn，所有点需在同一曲线上
+    点数较少时使用Straus交错算法，超过MULTI_MUL_THRESHOLD时使用Pippenger桶算法
+    :param pairs: (倍乘数,点)列表,list[(int,Point)]
+    :param method: 'straus'或'pippenger',为None时按点数自动选择,str
+    :param w: Straus使用的wNAF窗口宽度,int
+    :return: 乘法结果,Point
+    """
+    pairs = list(pairs)
+    if not pairs:
+        raise ValueError("multi_mul needs at least one (scalar, point) pair")
+    first = pairs[0][1]
+    terms = []
+    for times, point in pairs:
+        if not first.check(point):
+            raise IndexError("You get wrong args.")
+        if times < 0:
+            times, point = -times, -point
+        if times != 0 and not point.is_zero():
+            terms.append((times, point))
+    if not terms:
+        return Point(0, 0, first.curve)
+    if method is None:
+        method = 'straus' if len(terms) <= MULTI_MUL_THRESHOLD else 'pippenger'
+    if method == 'straus':
+        result = _straus(terms, w, first.a, first.p)
+    elif method == 'pippenger':
+        result = _pippenger(terms, first.a, first.p)
+    else:
+        raise ValueError("Unknown multi-scalar multiplication method: " + str(method))
+    return first._from_jacobian(result)
+
+
+def from_bytes(byte, p, a=None, b=None):
+    """
+    消息编码复原，支持00、02/03压缩与04非压缩格式
+    :param byte: 需要编码的消息，bytes
+    :param p:所在曲线,Curve; 也可以传入素数p,int,此时需同时给出a,b
+    :param a:参数a,int
+    :param b:参数b,int
+    :return:构建的点,Point
+    """
+    curve = p if isinstance(p, Curve) else get_curve(p, a, b)
+    p, a, b = curve.p, curve.a, curve.b
+    length = curve.byte_len
+    if byte[0] == 0:
+        return Point(0, 0, curve)
+    elif byte[0] not in (2, 3, 4):
+        raise IndexError("wrong args!")
+    if len(byte) != (2 * length if byte[0] == 4 else length) + 1:
+        raise ValueError("Wrong point encoding length!")
+    x = int.from_bytes(byte[1:length + 1], 'big')
+    if x >= p:
+        raise ValueError("Point is not on the curve!")
+    if byte[0] == 4:
+        y = int.from_bytes(byte[length + 1:], 'big')
+        if y >= p or not curve.contains(x, y):
+            raise ValueError("Point is not on the curve!")
+        return Point(x, y, curve)
+    try:
+        beta = sqrt((x * x * x + a * x + b) % p, p)
+    except ValueError:
+        raise ValueError("Point is not on the curve!")
+    y = beta if (beta & 1) == byte[0] - 2 else (p - beta) % p
+    return Point(x, y, curve)
+
+
+@lru_cache(maxsize=PUBLIC_KEY_CACHE_SIZE)
+def _decode_public_key(byte, curve):
+    point = from_bytes(byte, curve)
+    if point.is_zero():
+        raise ValueError("This point cannot be used as public key")
+    if curve.n is not None and not point.mul(curve.n).is_zero():
+        raise ValueError("Public key is not in the subgroup of the generator!")
+    return point
+
+
+def decode_public_key(byte, curve):
+    """
+    解码并校验公钥，结果按(编码,曲线)缓存，反复验签同一编码公钥时只解码校验一次
+    校验非无穷远点、坐标在曲线上，曲线已知阶n时还检查n*P为无穷远点
+    返回的点为缓存中的共享对象，调用方不应修改
+    :param byte: 公钥编码,bytes
+    :param curve: 所在曲线,Curve
+    :return: 公钥,Point
+    """
+    return _decode_public_key(bytes(byte), curve)
+
+
+def diffie_hellman(g, n_a, n_b):
+    """
+    Diffie-Hellman密钥交换
+    :param g: 基点G, Point
+    :param n_a: A私钥n_a,int
+    :param n_b: B私钥n_b,int
+    :return: void
+    """
+    p_a = fixed_base_mul(g, n_a)
+    p_b = fixed_base_mul(g, n_b)
+    print("public key a, x:" + str(p_a.x) + " public key a, y:" + str(p_a.y))
+    print("public key b, x:" + str(p_b.x) + " public key b, y:" + str(p_b.y))
+    k_a = p_b * n_a
+    k_b = p_a * n_b
+    print(k_a == k_b)
+
+
+def ecc_enc(g, k, p_m, p_b):
+    """
+    ecc加密方法
+    :param g: 基点G, Point
+    :param k: 随机数k, int
+    :param p_m: 消息点p_m,Point
+    :param p_b: 公钥点p_b,Point
+    :return: 加密列表c_m, list[Point]
+    """
+    c_m = [fixed_base_mul(g, k), p_m + p_b * k]
+    return c_m
+
+
+def ecc_dec(n_b, c_m):
+    """
+    ecc解密方法
+    :param n_b: 私钥n_b,int
+    :param c_m: 消息列表c_m,list[Point]
+    :return: 解密结果，Point
+    """
+    return c_m[1] - c_m[0].mul(n_b, method='ladder')
+
+
+def main():
+    print("------------四则运算检验开始------------")
+    p = Point(5, 1, 17, 2, 2)
+    print("p.x: ", p.x, " p.y: ", p.y)
+    for i in range(19):
+        x = p * i
+        print(str(i) + "P.x: ", x.x, " " + str(i) + "P.y: ", x.y)
+    print("------------四则运算检验结束------------")
+    print("------------DH交换开始------------")
+    g = Point(2, 2, 211, 0, -4)
+    n_a = 121
+    n_b = 203
+    diffie_hellman(g, n_a, n_b)
+    print("------------DH交换结束------------")
+    print("------------消息编码自验证开始------------")
+    g = Point(2, 2, 257, 0, -4)
+    b = bytes(g)
+    a = from_bytes(b, 257, 0, -4)
+    print(g == a)
+    print("------------消息编码自验证结束------------")
+    print("------------加解密自验证开始------------")
+    n_b = 101
+    p_b = g * n_b
+    print("pb.x: ", p_b.x, " pb.y: ", p_b.y)
+    k = 41
+    p_m = Point(112, 26, 257, 0, -4)
+    c_m = ecc_enc(g, k, p_m, p_b)
+    print("c1.x: ", c_m[0].x, " c1.y: ", c_m[0].y)
+    print("c2.x: ", c_m[1].x, " c2.y: ", c_m[1].y)
+    mes = ecc_dec(n_b, c_m)
+    print("mes.x: ", mes.x, " mes.y: ", mes.y)
+    a = Point(5, 1, 17, 2, 2)
+    b = a * 18
+    print("b.x: ", b.x, " b.y: ", b.y)
+    print("------------加解密自验证结束------------")
+
+
+register_curve('sm2p256v1',
+               0xFFFFFFFEFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF00000000FFFFFFFFFFFFFFFF,
+               0xFFFFFFFEFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF00000000FFFFFFFFFFFFFFFC,
+               0x28E9FA9E9D9F5E344D5A9E4BCF6509A7F39789F515AB8F92DDBCBD414D940E93,
+               0xFFFFFFFEFFFFFFFFFFFFFFFFFFFFFFFF7203DF6B21C6052B53BBF40939D54123,
+               0x32C4AE2C1F1981195F9904466A39C9948FE30BBFF2660BE1715A4589334C74C7,
+               0xBC3736A2F4F6779C59BDCEE36B692153D0A9877CC62A474002DF32E52139F0A0)
+register_curve('sm2test192',
+               0xbdb6f4fe3e8b1d9e0da8c0d46f4c318cefe4afe3b6b8551f,
+               0xbb8e5e8fbc115e139fe6a814fe48aaa6f0ada1aa5df91985,
+               0x1854bebdc31b21b7aefc80ab0ecd10d5b1b3308e6dbf11c1,
+               0xbdb6f4fe3e8b1d9e0da8c0d40fc962195dfae76f56564677,
+               0x4ad5f7048de709ad51236de65e4d4b482c836dc6e4106640,
+               0x02bb3a02d4aaadacae24817a4ca3a1b014b5270432db27d2)
+
+if __name__ == '__main__':
+    main()
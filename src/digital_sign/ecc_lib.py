@@ -0,0 +1,107 @@
+from .arith_lib import fast_pow, get_inv
+from functools import lru_cache
+
+
+def lucas(x, y, k, p):
+    """
+    指定lucas序列生成
+    :param x: 参数X,int
+    :param y: 参数Y,int
+    :param k: 参数K,int
+    :param p: 素数p,int
+    :return: 两个lucas序列参数U,V,[int,int]
+    """
+    delta = x ** 2 - 4 * y
+    k_bin = bin(k)[2:]
+    u, v = 1, x
+    inv_2 = (get_inv(2, p)) % p
+    for i in range(1, len(k_bin)):
+        u, v = (u * v) % p, ((v ** 2 + delta * (u ** 2)) * inv_2) % p
+        if k_bin[i] == '1':
+            u, v = ((x * u + v) * inv_2) % p, ((x * v + delta * u) * inv_2) % p
+    return [u, v]
+
+
+# 缓存开方预计算参数的素数个数
+SQRT_CACHE_SIZE = 16
+
+
+@lru_cache(maxsize=SQRT_CACHE_SIZE)
+def sqrt_params(p):
+    """
+    素数p下开方的预计算参数，按p缓存
+    p≡3 mod 4时为指数(p+1)/4; p≡5 mod 8时为Atkin算法的指数(p-5)/8;
+    p≡1 mod 8时为Tonelli-Shanks所需的p-1=q*2^s分解与c^(2^j)(j<s)，c=z^q，z为最小的二次非剩余
+    :param p: 素数p,int
+    :return: (p mod 8的类别,参数...),tuple
+    """
+    if p % 4 == 3:
+        return 3, (p + 1) // 4
+    if p % 8 == 5:
+        return 5, (p - 5) // 8
+    q, s = p - 1, 0
+    while q % 2 == 0:
+        q //= 2
+        s += 1
+    z = 2
+    while fast_pow(z, (p - 1) // 2, p) != p - 1:
+        z += 1
+        if z >= p:
+            raise ValueError("p is not an odd prime!")
+    powers = [fast_pow(z, q, p)]
+    for j in range(s - 1):
+        powers.append(powers[-1] * powers[-1] % p)
+    return 1, q, s, tuple(powers)
+
+
+def _tonelli_shanks(g, p, q, s, powers):
+    """
+    Tonelli-Shanks开方，只需一次大指数模幂，每轮所需的c^(2^j)直接查预计算表
+    :param g: 需要开方的参数g,0<g<p,int
+    :param p: 素数p,int
+    :param q: p-1的奇数部分,int
+    :param s: p-1中因子2的个数,int
+    :param powers: 预计算的c^(2^j),c=z^q,z为二次非剩余,tuple
+    :return: 开方结果,int
+    """
+    w = fast_pow(g, (q - 1) // 2, p)
+    y = g * w % p
+    t = y * w % p
+    m = s
+    while t != 1:
+        i, t2 = 0, t
+        while t2 != 1:
+            t2 = t2 * t2 % p
+            i += 1
+            if i == m:
+                raise ValueError("Can't find the root!")
+        # 此时c = powers[s-m]，所需的b = c^(2^(m-i-1)) = powers[s-i-1]
+        b = powers[s - i - 1]
+        m = i
+        t = t * powers[s - i] % p
+        y = y * b % p
+    return y
+
+
+def sqrt(g, p):
+    """
+    p有限域下的开方函数，使用按p缓存的预计算参数
+    :param g: 需要开方的参数g,int
+    :param p: 素数p,int
+    :return: 开方结果,int
+    """
+    g %= p
+    if g == 0:
+        return 0
+    params = sqrt_params(p)
+    if params[0] == 3:
+        y = fast_pow(g, params[1], p)
+    elif params[0] == 5:
+        t = 2 * g % p
+        d = fast_pow(t, params[1], p)
+        y = g * d * (t * d * d - 1) % p
+    else:
+        y = _tonelli_shanks(g, p, *params[1:])
+    if y * y % p != g:
+        raise ValueError("Can't find the root!")
+    return y
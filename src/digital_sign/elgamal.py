@@ -0,0 +1,147 @@
+from .sign_lib import *
+from .arith_lib import batch_inv, gcd, get_inv
+import secrets
+
+
+class ElGamalKey:
+    def __init__(self, alpha, q, x=None):
+        """
+        elgamal密钥对，可对多条消息重复签名
+        :param alpha: 生成元,int
+        :param q: 素数q,int
+        :param x: 私钥,为None时随机生成,int
+        """
+        self.alpha = alpha
+        self.q = q
+        self.x = secrets.randbelow(q - 3) + 2 if x is None else x
+        self.y_a = fixed_base_pow(alpha, self.x, q)
+        self._y_table = None
+
+    def public_key(self):
+        """
+        对应的公钥
+        :return: 公钥,(q,alpha,y_a)
+        """
+        return self.q, self.alpha, self.y_a
+
+    def sign(self, mes):
+        """
+        elgamal签名
+        :param mes: 签名明文,str/bytes/文件对象/分块迭代器/Prehashed
+        :return: 签名,(s_1, s_2)
+        """
+        k = _nonce(self.q)
+        return self._sign(mes, k, get_inv(k, self.q - 1))
+
+    def sign_batch(self, mes_list):
+        """
+        elgamal批量签名，所有k在q-1下的逆元通过一次批量求逆得到
+        :param mes_list: 签名明文列表,元素形式同sign,list
+        :return: 签名列表,list[(s_1, s_2)]
+        """
+        ks = [_nonce(self.q) for mes in mes_list]
+        return [self._sign(mes, k, k_inv) for mes, k, k_inv in zip(mes_list, ks, batch_inv(ks, self.q - 1))]
+
+    def _sign(self, mes, k, k_inv):
+        """
+        使用给定的k及其逆元签名
+        :param mes: 签名明文,str/bytes/文件对象/分块迭代器/Prehashed
+        :param k: 与q-1互素的随机数,int
+        :param k_inv: k在q-1下的逆元,int
+        :return: 签名,(s_1, s_2)
+        """
+        q = self.q
+        m = int.from_bytes(sha1_digest(mes), 'big')
+        s_1 = fixed_base_pow(self.alpha, k, q)
+        s_2 = (k_inv * (m - self.x * s_1)) % (q - 1)
+        return s_1, s_2
+
+    def precompute(self):
+        """
+        建立验签用的y_a的固定底数表
+        :return: void
+        """
+        if self._y_table is None:
+            self._y_table = fixed_pow_table(self.y_a, self.q, self.q.bit_length())
+
+    def verify(self, mes, sign):
+        """
+        elgamal验签，y_a的固定底数表在首次验签时建立并在之后复用
+        :param mes: 签名明文,str/bytes/文件对象/分块迭代器/Prehashed
+        :param sign: 签名,(s_1, s_2)
+        :return: 验证成功(True),失败(False)
+        """
+        q = self.q
+        s_1, s_2 = sign
+        self.precompute()
+        if 0 <= s_1 < q:
+            y_pow = fixed_pow(self._y_table, s_1, q)
+        else:
+            y_pow = fast_pow(self.y_a, s_1, q)
+        m = int.from_bytes(sha1_digest(mes), 'big')
+        return fixed_base_pow(self.alpha, m, q) == y_pow * fast_pow(s_1, s_2, q) % q
+
+
+def elgamal(alpha, q, mes):
+    """
+    elgamal签名方法，每次生成新的密钥对；需要长期密钥时使用ElGamalKey
+    :param alpha: 生成元,int
+    :param q: 素数q,int
+    :param mes: 签名明文,str/bytes/文件对象/分块迭代器/Prehashed
+    :return: elgamal公钥和签名对,(q,alpha,y_a),(s_1, s_2)
+    """
+    key = ElGamalKey(alpha, q)
+    return key.public_key(), key.sign(mes)
+
+
+def _nonce(q):
+    """
+    生成与q-1互素的随机数k
+    :param q: 素数q,int
+    :return: k,int
+    """
+    k = q - 1
+    while gcd(k, q - 1) != 1:
+        k = secrets.randbelow(q - 2) + 1
+    return k
+
+
+def elgamal_batch(alpha, q, mes_list):
+    """
+    elgamal批量签名方法，同一密钥对多条消息签名
+    :param alpha: 生成元,int
+    :param q: 素数q,int
+    :param mes_list: 签名明文列表,元素形式同sign,list
+    :return: elgamal公钥和签名对列表,(q,alpha,y_a),list[(s_1, s_2)]
+    """
+    key = ElGamalKey(alpha, q)
+    return key.public_key(), key.sign_batch(mes_list)
+
+
+def elgamal_verify(mes, pub, sign):
+    """
+    elgamal签名验证
+    :param mes: 签名明文,str/bytes/文件对象/分块迭代器/Prehashed
+    :param pub: 公钥(q,alpha,y_a)
+    :param sign: 签名(s_1, s_2)
+    :return: 验证成功(True),失败(False)
+    """
+    q, alpha, y_a = pub
+    s_1, s_2 = sign
+    m = int.from_bytes(sha1_digest(mes), 'big')
+    v_1 = fixed_base_pow(alpha, m, q)
+    v_2 = (fast_pow(y_a, s_1, q) * fast_pow(s_1, s_2, q)) % q
+    return v_1 == v_2
+
+
+def main():
+    pub, sign = elgamal(10, 19, 'hey')
+    print(elgamal_verify('hey', pub, sign))
+    pub, signs = elgamal_batch(10, 19, ['hey', 'you'])
+    print(elgamal_verify('hey', pub, signs[0]) and elgamal_verify('you', pub, signs[1]))
+    key = ElGamalKey(10, 19)
+    print(all(key.verify(mes, sign) for mes, sign in zip(['hey', 'you'], key.sign_batch(['hey', 'you']))))
+
+
+if __name__ == '__main__':
+    main()
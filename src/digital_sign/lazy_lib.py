@@ -0,0 +1,31 @@
+import importlib.util
+import sys
+
+
+def lazy_import(name):
+    """
+    延迟导入模块: 立即返回模块对象，首次访问其属性时才真正执行模块代码
+    只用于gmpy2、cryptography、gmssl等导入较慢、且只在部分功能中用到的第三方依赖；
+    标准库模块在用到的函数内导入，不替换sys.modules中全进程共享的模块对象
+    :param name: 模块全名,str
+    :return: 模块,未安装时为None
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    try:
+        spec = importlib.util.find_spec(name)
+    except ImportError:
+        return None
+    if spec is None:
+        return None
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    parent, _, child = name.rpartition('.')
+    if parent:
+        # 与普通导入一致，子模块同时绑定为父包的属性
+        setattr(sys.modules[parent], child, module)
+    return module
@@ -0,0 +1,240 @@
+from .arith_lib import fast_pow, get_inv
+from random import randint
+import secrets
+
+
+def _small_primes(limit):
+    """
+    埃氏筛求小素数表
+    :param limit: 上界,int
+    :return: 不超过limit的素数,list[int]
+    """
+    flags = bytearray([1]) * (limit + 1)
+    flags[0] = flags[1] = 0
+    for i in range(2, int(limit ** 0.5) + 1):
+        if flags[i]:
+            flags[i * i::i] = bytes(len(range(i * i, limit + 1, i)))
+    return [i for i in range(limit + 1) if flags[i]]
+
+
+# 试除与候选筛选使用的小素数表
+SMALL_PRIMES = _small_primes(2048)
+# 每个筛选窗口内检查的候选数个数
+SIEVE_WINDOW = 4096
+
+
+def miller_rabin(p, rounds=10):
+    """
+    miller_rabin素性检测，任意一轮失败即提前返回
+    :param p: 用于检测的素数p, int
+    :param rounds: 检测轮数, int
+    :return: 是素数(True)或不是素数(False)
+    """
+    if p < 3:
+        return p == 2  # 先进行2判定
+    if p % 2 == 0:
+        return False
+    q = p - 1
+    t = 0
+    while q % 2 == 0:  # 先把q和t求好
+        q //= 2
+        t += 1
+    for i in range(rounds):  # 进行rounds次检测
+        a = randint(2, p - 2) if p > 4 else 2
+        v = fast_pow(a, q, p)
+        if v == 1 or v == p - 1:  # 进行1或-1判定
+            continue
+        for j in range(t - 1):
+            v = v * v % p
+            if v == p - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def is_prime(p, rounds=10):
+    """
+    素性检测接口，先用小素数试除，再做miller_rabin检测
+    :param p: 用于检测的参数p, int
+    :param rounds: miller_rabin检测轮数, int
+    :return: 是素数(True)或不是素数(False)
+    """
+    if p < 2:
+        return False
+    for s in SMALL_PRIMES:
+        if p % s == 0:
+            return p == s
+    return miller_rabin(p, rounds)
+
+
+def sieve_progression(start, step, size):
+    """
+    筛选等差数列 start + j*step (0 <= j < size) 中没有小素因子的项
+    :param start: 首项,int
+    :param step: 公差,int
+    :param size: 项数,int
+    :return: 通过筛选的下标j,list[int]
+    """
+    flags = bytearray([1]) * size
+    for s in SMALL_PRIMES:
+        step_mod = step % s
+        if step_mod == 0:
+            if start % s == 0:
+                return []
+            continue
+        j = (-start) * get_inv(step_mod, s) % s
+        if start + j * step == s:
+            j += s
+        if j < size:
+            flags[j::s] = bytes(len(range(j, size, s)))
+    return [j for j in range(size) if flags[j]]
+
+
+def search_progression(start, step, limit, rounds=10, stop=None):
+    """
+    在等差数列 start, start+step, ... (不超过limit) 中按窗口筛选后查找第一个素数
+    :param start: 首项,int
+    :param step: 公差,int
+    :param limit: 上界,int
+    :param rounds: miller_rabin检测轮数,int
+    :param stop: 无参函数,返回True时放弃查找,用于并行查找的取消
+    :return: 找到的素数,未找到或被取消时为None
+    """
+    while start <= limit:
+        if stop is not None and stop():
+            return None
+        size = min(SIEVE_WINDOW, (limit - start) // step + 1)
+        for j in sieve_progression(start, step, size):
+            if stop is not None and stop():
+                return None
+            candidate = start + j * step
+            if miller_rabin(candidate, rounds):
+                return candidate
+        start += size * step
+    return None
+
+
+def _random_prime_task(bits, top_bits, rounds, stop=None):
+    """
+    随机起点的素数查找任务，直到找到素数或被取消
+    :param bits: 素数位数,int
+    :param top_bits: 置1的最高位个数,int
+    :param rounds: miller_rabin检测轮数,int
+    :param stop: 取消检查函数
+    :return: 素数,被取消时为None
+    """
+    high = ((1 << top_bits) - 1) << (bits - top_bits)
+    while stop is None or not stop():
+        start = secrets.randbits(bits) | high | 1
+        prime = search_progression(start, 2, (1 << bits) - 1, rounds, stop)
+        if prime is not None:
+            return prime
+    return None
+
+
+def _schnorr_prime_task(q, bits, rounds, stop=None):
+    """
+    查找形如 p = 2*q*m + 1 的bits位素数
+    :param q: 素数q,int
+    :param bits: p的位数,int
+    :param rounds: miller_rabin检测轮数,int
+    :param stop: 取消检查函数
+    :return: 素数p,被取消时为None
+    """
+    step = 2 * q
+    low = ((1 << (bits - 1)) + step - 1) // step
+    high = ((1 << bits) - 2) // step
+    while stop is None or not stop():
+        m = low + secrets.randbelow(high - low + 1)
+        prime = search_progression(step * m + 1, step, (1 << bits) - 1, rounds, stop)
+        if prime is not None:
+            return prime
+    return None
+
+
+_stop_event = None
+
+
+def _init_worker(event):
+    """
+    进程池初始化，保存共享的取消事件
+    :param event: 取消事件,multiprocessing.Event
+    :return: void
+    """
+    global _stop_event
+    _stop_event = event
+
+
+def _run_worker(task, args):
+    """
+    进程池中执行查找任务
+    :param task: 查找任务函数
+    :param args: 任务参数,tuple
+    :return: 任务结果
+    """
+    return task(*args, stop=_stop_event.is_set)
+
+
+def parallel_search(task, args, workers=1):
+    """
+    并行执行随机查找任务，任一进程找到结果后通知其余进程取消
+    :param task: 模块级查找任务函数,接受stop关键字参数,找不到时返回None
+    :param args: 任务参数,tuple
+    :param workers: 进程数,为1时在当前进程执行,int
+    :return: 第一个找到的结果
+    """
+    if workers <= 1:
+        return task(*args)
+    # 进程池只在多进程查找时导入
+    from concurrent import futures
+    import multiprocessing
+    event = multiprocessing.get_context().Event()
+    with futures.ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(event,)) as pool:
+        pending = {pool.submit(_run_worker, task, args) for i in range(workers)}
+        result = None
+        try:
+            while pending and result is None:
+                done, pending = futures.wait(pending, return_when=futures.FIRST_COMPLETED)
+                for future in done:
+                    if future.result() is not None:
+                        result = future.result()
+                        break
+        finally:
+            # 找到结果或某个进程出错时都通知其余进程停止，否则退出with时会一直等待
+            event.set()
+    return result
+
+
+def random_prime(bits, top_bits=1, rounds=10, workers=1):
+    """
+    生成bits位的随机素数
+    :param bits: 素数位数,int
+    :param top_bits: 置1的最高位个数,RSA使用2以保证n=p*q恰为2*bits位,int
+    :param rounds: miller_rabin检测轮数,int
+    :param workers: 并行查找的进程数,int
+    :return: 素数,int
+    """
+    if bits < 2 + top_bits:
+        raise ValueError("Prime size is too small!")
+    return parallel_search(_random_prime_task, (bits, top_bits, rounds), workers)
+
+
+def schnorr_params(q_bits=160, p_bits=1024, rounds=10, workers=1):
+    """
+    生成Schnorr群参数: q_bits位素数q，p_bits位素数p满足q | p-1，以及q阶生成元g
+    :param q_bits: q的位数,int
+    :param p_bits: p的位数,int
+    :param rounds: miller_rabin检测轮数,int
+    :param workers: 并行查找的进程数,int
+    :return: [p,q,g]
+    """
+    if p_bits <= q_bits + 1:
+        raise ValueError("p must be longer than q by at least two bits!")
+    q = random_prime(q_bits, rounds=rounds)
+    p = parallel_search(_schnorr_prime_task, (q, p_bits, rounds), workers)
+    r = (p - 1) // q
+    g = 1
+    while g == 1:
+        g = fast_pow(randint(2, p - 2), r, p)
+    return [p, q, g]
@@ -0,0 +1,263 @@
+from .sign_lib import *
+from .arith_lib import gcd, get_inv
+from .bytes_lib import bytes_xor
+from .prime_lib import random_prime
+from random import randint
+import io
+import secrets
+import math
+
+# 由(e,d,n)分解n时随机底数的尝试次数，(e,d,n)一致时每次成功的概率至少为1/2
+FACTOR_ATTEMPTS = 100
+
+
+def mgf(x, mask_len, hash_name='sha1'):
+    """
+    mgf生成
+    :param x:进行掩码的明文,bytes
+    :param mask_len: 掩码长,int
+    :param hash_name: 杂凑算法名,见HASH_ALGORITHMS,str
+    :return: 掩码,bytes
+    """
+    return bytes(mgf1(x, mask_len, hash_name))
+
+
+def _pss_lengths(embits, hash_name, s_len):
+    """
+    计算并检查PSS编码的各项长度
+    :param embits: em生成位数,int
+    :param hash_name: 杂凑算法名,str
+    :param s_len: 盐长,为None时与杂凑值等长,int
+    :return: (em_len,h_len,s_len)
+    """
+    h_len = digest_size(hash_name)
+    if s_len is None:
+        s_len = h_len
+    em_len = math.ceil(embits / 8)
+    if s_len < 0 or em_len < h_len + s_len + 2:
+        raise ValueError("Length is not correct!")
+    return em_len, h_len, s_len
+
+
+def pss_encode(mes, embits, hash_name='sha1', s_len=None):
+    """
+    pss编码函数
+    :param mes: 签名明文,str/bytes/文件对象/分块迭代器/Prehashed
+    :param embits: em生成位数，以位记,int
+    :param hash_name: 杂凑算法名,消息杂凑与MGF1共用,str
+    :param s_len: 盐长,为None时与杂凑值等长,int
+    :return: pss编码结果
+    """
+    em_len, h_len, s_len = _pss_lengths(embits, hash_name, s_len)
+    mes_hash = message_digest(mes, hash_name)
+    salt = secrets.token_bytes(s_len)
+    ctx = new_hash(hash_name)
+    ctx.update(b'\x00' * 8 + mes_hash + salt)
+    mh = ctx.finalize()
+    db_len = em_len - h_len - 1
+    em = mgf1(mh, db_len, hash_name, bytearray(em_len))
+    em[db_len - s_len - 1] ^= 0x01
+    bytes_xor(em[db_len - s_len:db_len], salt, s_len, memoryview(em)[db_len - s_len:db_len])
+    em[0] &= 0xff >> (em_len * 8 - embits)
+    em[db_len:] = mh + b'\xbc'
+    return bytes(em)
+
+
+class RSAPrivateKey:
+    def __init__(self, p, q, e=65537, d=None):
+        """
+        RSA私钥，保存CRT参数并缓存派生长度
+        :param p: 素数p,int
+        :param q: 素数q,int
+        :param e: 公钥指数e,int
+        :param d: 私钥指数d,为None时由e计算,int
+        """
+        self.p = p
+        self.q = q
+        self.e = e
+        self.n = p * q
+        if d is None:
+            d = get_inv(e, (p - 1) * (q - 1) // gcd(p - 1, q - 1))
+        self.d = d
+        self.d_p = d % (p - 1)
+        self.d_q = d % (q - 1)
+        self.q_inv = get_inv(q, p)
+        self.n_len = (self.n.bit_length() + 7) // 8
+
+    @classmethod
+    def from_private_exponent(cls, e, d, n):
+        """
+        由(e,d,n)分解n并构建私钥
+        :param e: 公钥指数e,int
+        :param d: 私钥指数d,int
+        :param n: 模数n,int
+        :return: 私钥,RSAPrivateKey
+        """
+        k = e * d - 1
+        if k <= 0 or k % 2 or n < 5:
+            raise ValueError("Inconsistent RSA key: e*d - 1 must be a positive even number.")
+        t = 0
+        while k % 2 == 0:
+            k //= 2
+            t += 1
+        for attempt in range(FACTOR_ATTEMPTS):
+            g = randint(2, n - 2)
+            y = fast_pow(g, k, n)
+            for i in range(t):
+                z = y * y % n
+                if z == 1 and y != 1 and y != n - 1:
+                    p = gcd(y - 1, n)
+                    return cls(p, n // p, e, d)
+                y = z
+        raise ValueError("Cannot factor n from (e, d): the key is inconsistent.")
+
+    def public_key(self):
+        """
+        对应的公钥对
+        :return: 公钥对(e,n)
+        """
+        return self.e, self.n
+
+    def precompute(self):
+        """
+        CRT参数已在构造时计算，无需额外预计算
+        :return: void
+        """
+
+    def sign(self, mes, embits=None, hash_name='sha1', s_len=None):
+        """
+        RSA-PSS签名
+        :param mes: 签名明文,str/bytes/文件对象/分块迭代器/Prehashed
+        :param embits: 掩码长,以位记,为None时取模数位数-1,int
+        :param hash_name: 杂凑算法名,str
+        :param s_len: 盐长,为None时与杂凑值等长,int
+        :return: RSA-PSS签名十六进制值,str
+        """
+        return rsa_pss(self, mes, embits or self.n.bit_length() - 1, hash_name, s_len)
+
+    def verify(self, mes, sign, embits=None, hash_name='sha1', s_len=None):
+        """
+        RSA-PSS验签，签名格式错误时返回False
+        :param mes: 签名明文,str/bytes/文件对象/分块迭代器/Prehashed
+        :param sign: 签名十六进制值,str
+        :param embits: 掩码长,以位记,为None时取模数位数-1,int
+        :param hash_name: 杂凑算法名,str
+        :param s_len: 盐长,为None时与杂凑值等长,int
+        :return: 验证成功(True)失败(False)
+        """
+        try:
+            return rsa_pss_verify(self.public_key(), sign, mes, embits or self.n.bit_length() - 1, hash_name, s_len)
+        except ValueError:
+            return False
+
+    def decrypt_raw(self, m):
+        """
+        使用CRT计算m^d mod n，并用公钥指数回验结果以防御故障攻击
+        :param m: 整数m,int
+        :return: m^d mod n,int
+        """
+        s_p = fast_pow(m, self.d_p, self.p)
+        s_q = fast_pow(m, self.d_q, self.q)
+        h = self.q_inv * (s_p - s_q) % self.p
+        s = s_q + h * self.q
+        if fast_pow(s, self.e, self.n) != m % self.n:
+            raise ValueError("CRT signature check failed!")
+        return s
+
+
+def generate_key(bits=2048, e=65537, workers=1):
+    """
+    RSA密钥生成
+    :param bits: 模数n的位数,int
+    :param e: 公钥指数e,int
+    :param workers: 并行查找素数的进程数,int
+    :return: 私钥,RSAPrivateKey
+    """
+    while True:
+        p = random_prime(bits - bits // 2, top_bits=2, workers=workers)
+        q = random_prime(bits // 2, top_bits=2, workers=workers)
+        if p != q and gcd(e, p - 1) == 1 and gcd(e, q - 1) == 1:
+            return RSAPrivateKey(p, q, e)
+
+
+def rsa_pss(pri, mes, embits, hash_name='sha1', s_len=None):
+    """
+    RSA-PSS签名函数
+    :param pri: 私钥,RSAPrivateKey; 或私钥对(d,n)
+    :param mes: 签名明文,str/bytes/文件对象/分块迭代器/Prehashed
+    :param embits: 掩码长,以位记,int
+    :param hash_name: 杂凑算法名,见HASH_ALGORITHMS,str
+    :param s_len: 盐长,为None时与杂凑值等长,int
+    :return: RSA-PSS签名十六进制值,str
+    """
+    em = pss_encode(mes, embits, hash_name, s_len)
+    m = int.from_bytes(em, 'big')
+    if isinstance(pri, RSAPrivateKey):
+        s = pri.decrypt_raw(m)
+        n_len = pri.n_len
+    else:
+        d, n = pri
+        s = fast_pow(m, d, n)
+        n_len = (n.bit_length() + 7) // 8
+    return '{:0{}x}'.format(s, n_len * 2)
+
+
+def rsa_pss_verify(pub, sign, message, embits, hash_name='sha1', s_len=None):
+    """
+    RSA-PSS签名验证，签名超出模数、EM超长、末字节不是0xbc、最左侧多余位不为0或填充不符时均视为验证失败
+    :param pub: 公钥对(e,n)
+    :param sign: 签名结果16进制值,str
+    :param message: 签名明文,str/bytes/文件对象/分块迭代器/Prehashed
+    :param embits: 掩码长度,int
+    :param hash_name: 杂凑算法名,见HASH_ALGORITHMS,str
+    :param s_len: 盐长,为None时与杂凑值等长,int
+    :return: 签名验证成功(True)失败（False)
+    """
+    e, n = pub
+    em_len, h_len, s_len = _pss_lengths(embits, hash_name, s_len)
+    db_len = em_len - h_len - 1
+    pad2 = b'\x00' * (db_len - s_len - 1) + b'\x01'
+    s = int(sign, 16)
+    if s >= n:
+        return False
+    mes = fast_pow(s, e, n)
+    if mes >> (em_len * 8):
+        return False
+    em = bytes.fromhex('{:0{}x}'.format(mes, em_len * 2))
+    if em[-1:] != b'\xbc':
+        return False
+    if em[0] & ~(0xff >> (em_len * 8 - embits)) & 0xff:
+        # RFC 8017 9.1.2 第6步: maskedDB最左侧8*emLen-emBits位不为0时不一致
+        return False
+    mhash = message_digest(message, hash_name)
+    h = em[db_len:em_len - 1]
+    db = mgf1(h, db_len, hash_name)
+    db = bytes_xor(em[:db_len], db, db_len, db)
+    db[0] &= 0xff >> (em_len * 8 - embits)
+    if db[:db_len - s_len] != pad2:
+        return False
+    ctx = new_hash(hash_name)
+    ctx.update(b'\x00' * 8 + mhash + db[db_len - s_len:])
+    return h == ctx.finalize()
+
+
+def main():
+    pri = [
+        565342909578269660847197094876734404916227279480080390912121400240551578604186602341202885108073352725212542725089613459168567383937635334653163324416495194421632961368877323869816883087270945749072570272719627933034339401601876084528274474065657546214301725336806586150266625262630166587648823590118052163771978987008055213994082595429866637055170258808198910113421581234720248169850019840378890223840772077123763287965301557971935917901204962586293054735585605798858128671794860201112924901315529209431430728200424225847309388651056027056963566487270694279236511267400275122178349120402310017472962254411880286857,
+        2520982395388926907732377764641528386405034171278902400435986950232362305707462567710105020162468756722613758765339729010922664532974131246319954058126409849412162984910669740386214129883001699092125538406697030403978465085580877250576956127566237912924181273280145147753284603649519849469602024333235815789529029151315886052482524988297947953740585156803495238386540258990139626475367321847920110503795906130966434589425058538289792335075866775134881435748574593749880014524411588107133663524922937877644644782038215227089952275024674959937202335172089875726158260347736928321514962053854585865529479565207607028431]
+    pub = [65537,
+           2520982395388926907732377764641528386405034171278902400435986950232362305707462567710105020162468756722613758765339729010922664532974131246319954058126409849412162984910669740386214129883001699092125538406697030403978465085580877250576956127566237912924181273280145147753284603649519849469602024333235815789529029151315886052482524988297947953740585156803495238386540258990139626475367321847920110503795906130966434589425058538289792335075866775134881435748574593749880014524411588107133663524922937877644644782038215227089952275024674959937202335172089875726158260347736928321514962053854585865529479565207607028431]
+    sign = rsa_pss(pri, 'hey', 512)
+    print(rsa_pss_verify(pub, sign, 'hey', 512))
+    key = RSAPrivateKey.from_private_exponent(pub[0], pri[0], pri[1])
+    sign = rsa_pss(key, 'hey', 512)
+    print(rsa_pss_verify(key.public_key(), sign, 'hey', 512))
+    key = generate_key(1024)
+    sign = rsa_pss(key, 'hey', 512)
+    print(rsa_pss_verify(key.public_key(), sign, 'hey', 512))
+    print(key.verify('hey', key.sign('hey')) and not key.verify('you', key.sign('hey')))
+    print(key.verify(io.BytesIO(b'hey' * 100000), key.sign(iter([b'hey'] * 100000))))
+
+
+if __name__ == '__main__':
+    main()
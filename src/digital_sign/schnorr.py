@@ -0,0 +1,322 @@
+from .sign_lib import *
+from .arith_lib import get_inv
+from .bytes_lib import align
+from .prime_lib import schnorr_params
+from .store_lib import cache_path, load_or_generate_params
+import secrets
+
+# main使用的Schnorr域参数缓存文件名(位于用户缓存目录)，避免每次运行都重新生成(p,q,g)
+PARAMS_CACHE = 'schnorr_params.bin'
+# 批量验签中同一公钥的签名数不少于该值时为该公钥建立固定底数表
+KEY_TABLE_THRESHOLD = 8
+# 随机线性组合验签中随机系数的位数，伪造整批通过的概率不超过2^-RLC_BITS
+RLC_BITS = 64
+# 随机线性组合前子群检验的轮数，有元素不在q阶子群中时整批通过检验的概率不超过2^-SUBGROUP_ROUNDS
+SUBGROUP_ROUNDS = RLC_BITS
+# 子群检验每次遍历元素时处理的轮数，元素按这几轮的随机位分桶
+SUBGROUP_BLOCK = 4
+
+
+def generate_key(q_bits=160, p_bits=1024, workers=1):
+    """
+    Schnorr 生成元和素数对生成
+    :param q_bits: 素数q的位数,int
+    :param p_bits: 素数p的位数,int
+    :param workers: 并行查找素数p的进程数,int
+    :return: list[p,q,g]
+    """
+    return schnorr_params(q_bits, p_bits, workers=workers)
+
+
+class SchnorrKey:
+    def __init__(self, p, q, alpha, s=None):
+        """
+        schnorr密钥对，可对多条消息重复签名
+        :param p: 素数p,int
+        :param q: 素数q,int
+        :param alpha: 生成元/alpha,int
+        :param s: 私钥,为None时随机生成,int
+        """
+        self.p = p
+        self.q = q
+        self.alpha = alpha
+        self.s = secrets.randbelow(q - 1) + 1 if s is None else s
+        self.v = get_inv(fixed_base_pow(alpha, self.s, p, q.bit_length()), p)
+        self._v_table = None
+
+    def public_key(self):
+        """
+        对应的公钥
+        :return: 公钥,(p,q,alpha,v)
+        """
+        return self.p, self.q, self.alpha, self.v
+
+    def sign(self, mes, commit=False):
+        """
+        schnorr签名，只包含承诺值与杂凑的逐消息运算
+        :param mes: 签名明文,str/bytes/文件对象/分块迭代器/已吸收消息的hashes.Hash
+        :param commit: 为True时签名中附带承诺值x,以支持随机线性组合批量验签,bool
+        :return: 签名,(e,y)或(e,y,x)
+        """
+        p, q = self.p, self.q
+        r = secrets.randbelow(q - 1) + 1
+        x = fixed_base_pow(self.alpha, r, p, q.bit_length())
+        e = _schnorr_e(mes, x)
+        y = (r + self.s * e) % q
+        return (e, y, x) if commit else (e, y)
+
+    def sign_batch(self, mes_list, commit=False):
+        """
+        schnorr批量签名
+        :param mes_list: 签名明文列表,元素形式同sign,list
+        :param commit: 为True时签名中附带承诺值x,bool
+        :return: 签名列表,list[(e,y)]或list[(e,y,x)]
+        """
+        return [self.sign(mes, commit) for mes in mes_list]
+
+    def precompute(self):
+        """
+        建立验签用的v的固定底数表
+        :return: void
+        """
+        if self._v_table is None:
+            # 指数e为SHA-1杂凑值,不做模q约减,表需覆盖其160位
+            self._v_table = fixed_pow_table(self.v, self.p, max(self.q.bit_length(), 160))
+
+    def verify(self, mes, sign):
+        """
+        schnorr验签，v的固定底数表在首次验签时建立并在之后复用
+        :param mes: 验证明文,同sign
+        :param sign: 签名,(e,y)或(e,y,x)
+        :return: 签名成功(True),失败(False)
+        """
+        p, q = self.p, self.q
+        e, y = sign[:2]
+        self.precompute()
+        if 0 <= e < 1 << 160:
+            v_pow = fixed_pow(self._v_table, e, p)
+        else:
+            v_pow = fast_pow(self.v, e, p)
+        x = fixed_base_pow(self.alpha, y, p, q.bit_length()) * v_pow % p
+        return _schnorr_check(mes, sign, x)
+
+
+def schnorr(p, q, alpha, mes, commit=False):
+    """
+    schnorr签名函数，每次生成新的密钥对；需要长期密钥时使用SchnorrKey
+    :param p: 素数p,int
+    :param q: 素数q,int
+    :param alpha: 生成元/alpha,int
+    :param mes: 签名明文,str/bytes/文件对象/分块迭代器/已吸收消息的hashes.Hash
+    :param commit: 为True时签名中附带承诺值x,以支持随机线性组合批量验签,bool
+    :return: schnorr签名结果及其公钥，(p,q,alpha,v),(e,y)或(e,y,x)
+    """
+    key = SchnorrKey(p, q, alpha)
+    return key.public_key(), key.sign(mes, commit)
+
+
+def schnorr_batch(p, q, alpha, mes_list, commit=False):
+    """
+    schnorr批量签名函数，同一密钥对多条消息签名
+    :param p: 素数p,int
+    :param q: 素数q,int
+    :param alpha: 生成元/alpha,int
+    :param mes_list: 签名明文列表,元素形式同sign,list
+    :param commit: 为True时签名中附带承诺值x,bool
+    :return: schnorr公钥及签名列表，(p,q,alpha,v),list[(e,y)]或list[(e,y,x)]
+    """
+    key = SchnorrKey(p, q, alpha)
+    return key.public_key(), key.sign_batch(mes_list, commit)
+
+
+def schnorr_verify(mes, pub, sign):
+    """
+    schnorr签名验证函数
+    :param mes: 验证明文,str/bytes/文件对象/分块迭代器/已吸收消息的hashes.Hash
+    :param pub: 公钥,(p,q,alpha,v)
+    :param sign: 签名,(e,y)或附带承诺值的(e,y,x)
+    :return: 签名成功(True),失败(False)
+    """
+    p, q, alpha, v = pub
+    e, y = sign[:2]
+    x = (fixed_base_pow(alpha, y, p, q.bit_length()) * fast_pow(v, e, p)) % p
+    return _schnorr_check(mes, sign, x)
+
+
+def _schnorr_e(mes, x):
+    """
+    计算e = SHA-1(M || x)，消息流式吸收
+    :param mes: 消息,见sign_lib.iter_message;也可以是已吸收消息的hashes.Hash
+    :param x: 承诺值x,int
+    :return: e,int
+    """
+    ctx = sha1_context(mes)
+    ctx.update(align(x))
+    return int.from_bytes(ctx.finalize(), 'big')
+
+
+def _schnorr_check(mes, sign, x):
+    """
+    检查重新计算出的承诺值x与签名是否一致
+    :param mes: 验证明文,同sign
+    :param sign: 签名,(e,y)或(e,y,x)
+    :param x: 重新计算出的alpha^y*v^e%p,int
+    :return: 一致(True),不一致(False)
+    """
+    if len(sign) == 3 and sign[2] != x:
+        return False
+    return sign[0] == _schnorr_e(mes, x)
+
+
+def _schnorr_pow(base, p, q, count):
+    """
+    为批量验签准备底数base的模幂函数
+    base阶为q时指数先模q，次数足够多时再查固定底数表；否则退回普通模幂，与schnorr_verify结果一致
+    :param base: 底数,int
+    :param p: 素数p,int
+    :param q: 素数q,int
+    :param count: 该底数参与的模幂次数,int
+    :return: 模幂函数,接受指数返回base^n%p
+    """
+    # 次数较少时直接模幂，不为阶的检查多付一次完整模幂
+    if count < KEY_TABLE_THRESHOLD or fast_pow(base, q, p) != 1:
+        return lambda n: fast_pow(base, n, p)
+    table = fixed_pow_table(base, p, q.bit_length())
+    return lambda n: fixed_pow(table, n % q, p)
+
+
+def schnorr_verify_batch(items, rlc=False):
+    """
+    schnorr批量验签，所有签名需使用相同的(p,q,alpha)
+    alpha的固定底数表在整批中共享，签名按公钥分组，签名较多的公钥单独建表
+    rlc为True时对附带承诺值的签名(e,y,x)做随机线性组合检验:
+    alpha^(sum c*y) * prod(v^(sum c*e)) == prod(x^c)，整批通过即全部有效，否则逐个检查找出无效签名
+    :param items: (明文,公钥,签名)组成的序列,list
+    :param rlc: 是否使用随机线性组合检验,bool
+    :return: 每个签名的验证结果,list[bool]
+    """
+    if not items:
+        return []
+    p, q, alpha = items[0][1][:3]
+    if any(pub[:3] != (p, q, alpha) for mes, pub, sign in items):
+        raise ValueError("All signatures in a batch must share (p, q, alpha).")
+    # 每条消息只读取一遍，之后的检查都复制已吸收消息的杂凑上下文
+    items = [(sha1_context(mes), pub, sign) for mes, pub, sign in items]
+    alpha_order_q = fast_pow(alpha, q, p) == 1
+    if alpha_order_q:
+        def alpha_pow(n):
+            return fixed_base_pow(alpha, n % q, p, q.bit_length())
+    else:
+        def alpha_pow(n):
+            return fast_pow(alpha, n, p)
+    groups = {}
+    for i, (mes, pub, sign) in enumerate(items):
+        groups.setdefault(pub[3], []).append(i)
+    results = [None] * len(items)
+    if rlc and alpha_order_q:
+        _schnorr_rlc(items, groups, results, p, q, alpha_pow)
+    for v, indexes in groups.items():
+        indexes = [i for i in indexes if results[i] is None]
+        if not indexes:
+            continue
+        v_pow = _schnorr_pow(v, p, q, len(indexes))
+        for i in indexes:
+            mes, pub, sign = items[i]
+            x = alpha_pow(sign[1]) * v_pow(sign[0]) % p
+            results[i] = _schnorr_check(mes, sign, x)
+    return results
+
+
+def _schnorr_rlc(items, groups, results, p, q, alpha_pow):
+    """
+    随机线性组合检验，整批通过时在results中把参与检验的签名标记为True，否则保持不变以便逐个检查
+    只有附带承诺值的签名参与；承诺值与杂凑不一致的签名直接标记为False
+    承诺值或公钥不在q阶子群中时(如x'=p-alpha^r)可在组合中相互抵消，因此先用_in_subgroup对整批做一次随机子集检验，
+    未通过时不做组合检验，全部留给逐个检查
+    :param items: (明文,公钥,签名)组成的序列,list
+    :param groups: 公钥v到签名下标的映射,dict
+    :param results: 验证结果,原地修改,list
+    :param p: 素数p,int
+    :param q: 素数q,int
+    :param alpha_pow: alpha的模幂函数
+    :return: void
+    """
+    y_sum = 0
+    key_sums = []
+    commits = []
+    batch = []
+    for v, indexes in groups.items():
+        e_sum = 0
+        for i in indexes:
+            mes, pub, sign = items[i]
+            if len(sign) != 3:
+                continue
+            e, y, x = sign
+            if not 0 < x < p or e != _schnorr_e(mes, x):
+                results[i] = False
+                continue
+            c = secrets.randbits(RLC_BITS)
+            y_sum += c * y
+            e_sum += c * e
+            commits.append((x, c))
+            batch.append(i)
+        if e_sum:
+            key_sums.append((v, e_sum % q))
+    if not batch:
+        return
+    if not _in_subgroup([x for x, c in commits] + [v for v, e_sum in key_sums], p, q):
+        return
+    lhs = alpha_pow(y_sum % q) * multi_pow(key_sums, p) % p
+    if lhs == multi_pow(commits, p):
+        for i in batch:
+            results[i] = True
+
+
+def _in_subgroup(values, p, q, rounds=SUBGROUP_ROUNDS):
+    """
+    随机子集积检验values是否全部属于q阶子群: 每轮取随机子集的乘积T并检查T^q == 1
+    有元素不在子群中时，翻转该元素是否入选会改变T在商群中的像，因此每轮通过的概率不超过1/2；
+    小随机指数的乘积检验对-1这类2阶分量每轮也只有1/2的把握，效果相同但开销更大
+    每个元素取rounds位随机掩码，每SUBGROUP_BLOCK轮遍历一次元素，按这几位分桶后再由桶积得到各轮的T
+    :param values: 待检验的元素,list[int]
+    :param p: 素数p,int
+    :param q: 素数q,int
+    :param rounds: 轮数,int
+    :return: 全部属于子群(True),否则(False,误判为True的概率不超过2^-rounds)
+    """
+    values = [to_native(value) for value in values]
+    masks = [secrets.randbits(rounds) for value in values]
+    one = to_native(1)
+    for shift in range(0, rounds, SUBGROUP_BLOCK):
+        width = min(SUBGROUP_BLOCK, rounds - shift)
+        low = (1 << width) - 1
+        buckets = [one] * (1 << width)
+        for value, mask in zip(values, masks):
+            pattern = mask >> shift & low
+            if pattern:
+                buckets[pattern] = buckets[pattern] * value % p
+        for j in range(width):
+            t = one
+            for pattern in range(1 << j, 1 << width):
+                if pattern >> j & 1:
+                    t = t * buckets[pattern] % p
+            if fast_pow(t, q, p) != 1:
+                return False
+    return True
+
+
+def main():
+    p, q, g = load_or_generate_params(cache_path(PARAMS_CACHE), generate_key)
+    pub, sign = schnorr(p, q, g, 'heyguys')
+    print(schnorr_verify('heyguys', pub, sign))
+    pub, signs = schnorr_batch(p, q, g, ['heyguys', 'heygirls'])
+    print(schnorr_verify('heyguys', pub, signs[0]) and schnorr_verify('heygirls', pub, signs[1]))
+    pub, signs = schnorr_batch(p, q, g, ['heyguys', 'heygirls', 'heyall'], commit=True)
+    items = [('heyguys', pub, signs[0]), ('heygirls', pub, signs[1]), ('heyall', pub, signs[0])]
+    print(schnorr_verify_batch(items), schnorr_verify_batch(items, rlc=True))
+    key = SchnorrKey(p, q, g)
+    print(key.verify('heyguys', key.sign('heyguys')) and not key.verify('heygirls', key.sign('heyguys')))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,357 @@
+from .arith_lib import fast_pow, to_native
+from .sm3_lib import SM3
+from .lazy_lib import lazy_import
+from functools import lru_cache
+
+# cryptography只在首次计算杂凑值时加载
+hashes = lazy_import('cryptography.hazmat.primitives.hashes')
+exceptions = lazy_import('cryptography.exceptions')
+
+# 读取文件对象时每次读取的字节数
+HASH_CHUNK = 1 << 16
+# 可选的杂凑算法,值为cryptography中对应的类名
+HASH_ALGORITHMS = {
+    'sha1': 'SHA1',
+    'sha256': 'SHA256',
+    'sha3_256': 'SHA3_256',
+    'sm3': 'SM3',
+}
+# 各算法的杂凑值字节数
+DIGEST_SIZES = {'sha1': 20, 'sha256': 32, 'sha3_256': 32, 'sm3': 32}
+# 各算法的空白上下文，新上下文由其复制得到
+_empty_contexts = {}
+
+
+def new_hash(hash_name='sha1'):
+    """
+    新建杂凑上下文，cryptography或OpenSSL不支持SM3时退回纯Python实现
+    :param hash_name: 算法名,见HASH_ALGORITHMS,str
+    :return: 杂凑上下文,支持update/copy/finalize
+    """
+    ctx = _empty_contexts.get(hash_name)
+    if ctx is None:
+        if hash_name not in HASH_ALGORITHMS:
+            raise ValueError("Unknown hash algorithm: " + str(hash_name))
+        algorithm = getattr(hashes, HASH_ALGORITHMS[hash_name], None)
+        try:
+            if algorithm is None:
+                # cryptography 35.0之前没有hashes.SM3
+                raise exceptions.UnsupportedAlgorithm(hash_name)
+            ctx = hashes.Hash(algorithm())
+        except exceptions.UnsupportedAlgorithm:
+            if hash_name != 'sm3':
+                raise
+            ctx = SM3()
+        _empty_contexts[hash_name] = ctx
+    return ctx.copy()
+
+
+def digest_size(hash_name='sha1'):
+    """
+    杂凑值长度
+    :param hash_name: 算法名,str
+    :return: 字节数,int
+    """
+    if hash_name not in HASH_ALGORITHMS:
+        raise ValueError("Unknown hash algorithm: " + str(hash_name))
+    return DIGEST_SIZES[hash_name]
+
+
+def sha1_hash(mes):
+    digest = new_hash('sha1')
+    digest.update(mes)
+    return digest.finalize()
+
+
+class Prehashed:
+    def __init__(self, digest, hash_name='sha1'):
+        """
+        已在外部计算好的消息杂凑值，用于只对杂凑值签名的场合
+        :param digest: 杂凑值,bytes
+        :param hash_name: 计算杂凑值所用的算法名,str
+        """
+        if len(digest) != digest_size(hash_name):
+            raise ValueError("Digest length does not match " + hash_name)
+        self.digest = bytes(digest)
+        self.hash_name = hash_name
+
+
+def iter_message(mes, chunk_size=HASH_CHUNK):
+    """
+    把各种形式的消息转为字节块序列，文件与迭代器只被读取一遍
+    :param mes: 消息,str/bytes-like/可读文件对象/字节块或字符串块的迭代器
+    :param chunk_size: 读取文件时的块大小,int
+    :return: 字节块生成器
+    """
+    if isinstance(mes, str):
+        yield mes.encode()
+    elif isinstance(mes, (bytes, bytearray, memoryview)):
+        yield mes
+    elif hasattr(mes, 'read'):
+        while True:
+            chunk = mes.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+    else:
+        for chunk in mes:
+            yield chunk.encode() if isinstance(chunk, str) else chunk
+
+
+def message_context(mes, hash_name='sha1'):
+    """
+    增量吸收消息后的杂凑上下文，供需要在消息后追加数据的签名方案使用
+    :param mes: 消息,见iter_message;也可以是已吸收消息的杂凑上下文(有copy与finalize方法),此时返回其副本
+    :param hash_name: 算法名,str
+    :return: 杂凑上下文
+    """
+    if hasattr(mes, 'finalize') and hasattr(mes, 'copy'):
+        return mes.copy()
+    if isinstance(mes, Prehashed):
+        raise ValueError("A prehashed digest cannot be extended.")
+    ctx = new_hash(hash_name)
+    for chunk in iter_message(mes):
+        ctx.update(chunk)
+    return ctx
+
+
+def message_digest(mes, hash_name='sha1'):
+    """
+    流式计算消息的杂凑值，内存占用与消息长度无关
+    :param mes: 消息,见iter_message;也可以是Prehashed或已吸收消息的杂凑上下文
+    :param hash_name: 算法名,str
+    :return: 杂凑值,bytes
+    """
+    if isinstance(mes, Prehashed):
+        if mes.hash_name != hash_name:
+            raise ValueError("Prehashed digest uses %s, expected %s" % (mes.hash_name, hash_name))
+        return mes.digest
+    return message_context(mes, hash_name).finalize()
+
+
+def sha1_context(mes):
+    """
+    增量吸收消息后的SHA-1上下文
+    :param mes: 消息,见message_context
+    :return: 杂凑上下文,hashes.Hash
+    """
+    return message_context(mes, 'sha1')
+
+
+def sha1_digest(mes):
+    """
+    流式计算消息的SHA-1杂凑值
+    :param mes: 消息,见message_digest
+    :return: 20字节杂凑值,bytes
+    """
+    return message_digest(mes, 'sha1')
+
+
+def mgf1(seed, mask_len, hash_name='sha1', out=None):
+    """
+    MGF1掩码生成: 种子只吸收一次，每个计数器复制该上下文后追加计数器，结果直接写入预分配的缓冲区
+    :param seed: 种子,bytes
+    :param mask_len: 掩码长,int
+    :param hash_name: 算法名,str
+    :param out: 可写的输出缓冲区,长度不小于mask_len,为None时新建,bytearray
+    :return: 掩码,bytearray
+    """
+    base = new_hash(hash_name)
+    base.update(seed)
+    h_len = digest_size(hash_name)
+    if out is None:
+        out = bytearray(mask_len)
+    view = memoryview(out)
+    for counter, offset in enumerate(range(0, mask_len, h_len)):
+        ctx = base.copy()
+        ctx.update(counter.to_bytes(4, 'big'))
+        end = min(offset + h_len, mask_len)
+        view[offset:end] = ctx.finalize()[:end - offset]
+    return out
+
+
+# 固定底数模幂策略: window为BGMW分窗表(每个窗口一行,约bits/w次模乘), comb为Lim-Lee梳形表(2^w项,约bits/w次平方与模乘)
+FIXED_POW_METHODS = ('window', 'comb')
+# 固定底数模幂预计算表的默认窗口宽度
+FIXED_POW_WIDTH = 6
+_default_fixed_pow = ['window', FIXED_POW_WIDTH]
+# 按(底数,模数,位数,策略,宽度)缓存的预计算表数量
+FIXED_POW_CACHE_SIZE = 8
+# 多底数同时模幂的窗口宽度
+MULTI_POW_WIDTH = 4
+
+
+def fixed_pow_table(base, mod, bits, w=FIXED_POW_WIDTH):
+    """
+    固定底数模幂的预计算表，table[i][d] = base^(d*2^(w*i)) % mod
+    :param base: 底数,int
+    :param mod: 模数,int
+    :param bits: 支持的最大指数位数,int
+    :param w: 窗口宽度,int
+    :return: 预计算表,list[list]
+    """
+    mod = to_native(mod)
+    base = to_native(base) % mod
+    table = []
+    for i in range((bits + w - 1) // w):
+        row = [to_native(1), base]
+        for d in range(2, 1 << w):
+            row.append(row[-1] * base % mod)
+        table.append(row)
+        base = row[-1] * base % mod
+    return table
+
+
+def fixed_pow(table, n, mod):
+    """
+    查表计算固定底数模幂，只需约bits/w次模乘而无需平方
+    :param table: fixed_pow_table生成的预计算表
+    :param n: 非负指数,位数不超过建表时的bits,int
+    :param mod: 模数,int
+    :return: 计算结果,int
+    """
+    mask = len(table[0]) - 1
+    w = mask.bit_length()
+    if n >> (w * len(table)):
+        raise ValueError("Exponent is too large for the table.")
+    result = table[0][0]
+    for row in table:
+        if not n:
+            break
+        d = n & mask
+        if d:
+            result = result * row[d] % mod
+        n >>= w
+    return int(result)
+
+
+def comb_pow_table(base, mod, bits, w=FIXED_POW_WIDTH):
+    """
+    Lim-Lee梳形预计算表: 指数按h=ceil(bits/w)位分成w段，table[d] = prod(base^(2^(j*h)))，j取d的各置位
+    只需2^w项存储，代价是计算时需要约h次平方
+    :param base: 底数,int
+    :param mod: 模数,int
+    :param bits: 支持的最大指数位数,int
+    :param w: 梳齿数,int
+    :return: (h,预计算表),tuple
+    """
+    mod = to_native(mod)
+    h = max(1, (bits + w - 1) // w)
+    teeth = [to_native(base) % mod]
+    for j in range(1, w):
+        teeth.append(fast_pow(teeth[-1], 1 << h, mod))
+    table = [to_native(1)]
+    for d in range(1, 1 << w):
+        low = d & -d
+        table.append(table[d ^ low] * teeth[low.bit_length() - 1] % mod)
+    return h, table
+
+
+def comb_pow(table, n, mod):
+    """
+    查梳形表计算固定底数模幂
+    :param table: comb_pow_table生成的(h,预计算表)
+    :param n: 非负指数,位数不超过建表时的bits,int
+    :param mod: 模数,int
+    :return: 计算结果,int
+    """
+    h, table = table
+    w = (len(table) - 1).bit_length()
+    if n >> (w * h):
+        raise ValueError("Exponent is too large for the table.")
+    mask = (1 << h) - 1
+    columns = [(n >> (j * h)) & mask for j in range(w)]
+    result = table[0]
+    for i in range(h - 1, -1, -1):
+        result = result * result % mod
+        d = 0
+        for j in range(w - 1, -1, -1):
+            d = (d << 1) | ((columns[j] >> i) & 1)
+        if d:
+            result = result * table[d] % mod
+    return int(result)
+
+
+def set_fixed_pow_method(method, w=FIXED_POW_WIDTH):
+    """
+    设置固定底数模幂的默认策略，w越大越快但占用内存越多:
+    window表约ceil(bits/w)*2^w项, comb表2^w项
+    :param method: 策略名,见FIXED_POW_METHODS,str
+    :param w: 窗口宽度或梳齿数,int
+    :return: void
+    """
+    if method not in FIXED_POW_METHODS:
+        raise ValueError("Unknown fixed-base exponentiation method: " + str(method))
+    if w < 1:
+        raise ValueError("Width must be at least 1")
+    _default_fixed_pow[0], _default_fixed_pow[1] = method, w
+
+
+@lru_cache(maxsize=FIXED_POW_CACHE_SIZE)
+def _fixed_pow_table(base, mod, bits, method, w):
+    """
+    固定底数模幂预计算表，以群参数为键缓存在进程内，缓存大小为FIXED_POW_CACHE_SIZE
+    :param base: 底数,int
+    :param mod: 模数,int
+    :param bits: 支持的最大指数位数,int
+    :param method: 策略名,str
+    :param w: 窗口宽度或梳齿数,int
+    :return: 预计算表
+    """
+    if method == 'comb':
+        return comb_pow_table(base, mod, bits, w)
+    return fixed_pow_table(base, mod, bits, w)
+
+
+def fixed_base_pow(base, n, mod, bits=None, method=None, w=None):
+    """
+    固定底数模幂base^n%mod，同一(base,mod,bits)的预计算表只建一次
+    适用于群生成元这类反复作为底数的场合；指数超出bits时退回普通模幂
+    :param base: 底数,int
+    :param n: 非负指数,int
+    :param mod: 模数,int
+    :param bits: 指数位数上界,如群的阶的位数,为None时取mod的位数,int
+    :param method: 策略名,为None时使用set_fixed_pow_method设置的默认值,str
+    :param w: 窗口宽度或梳齿数,int
+    :return: 计算结果,int
+    """
+    if bits is None:
+        bits = mod.bit_length()
+    if n < 0 or n.bit_length() > bits:
+        return fast_pow(base, n, mod)
+    method = method or _default_fixed_pow[0]
+    w = w or _default_fixed_pow[1]
+    table = _fixed_pow_table(base % mod, mod, bits, method, w)
+    if method == 'comb':
+        return comb_pow(table, n, mod)
+    return fixed_pow(table, n, mod)
+
+
+def multi_pow(pairs, mod, w=MULTI_POW_WIDTH):
+    """
+    多底数同时模幂 prod(base^n) % mod，各项共享平方运算
+    :param pairs: (底数,非负指数)组成的序列,list[(int,int)]
+    :param mod: 模数,int
+    :param w: 窗口宽度,int
+    :return: 计算结果,int
+    """
+    mod = to_native(mod)
+    mask = (1 << w) - 1
+    tables = []
+    bits = 0
+    for base, n in pairs:
+        base = to_native(base) % mod
+        row = [None, base]
+        for d in range(2, 1 << w):
+            row.append(row[-1] * base % mod)
+        tables.append((row, n))
+        bits = max(bits, n.bit_length())
+    result = to_native(1)
+    for shift in range((bits + w - 1) // w * w - w, -1, -w):
+        for i in range(w):
+            result = result * result % mod
+        for row, n in tables:
+            d = (n >> shift) & mask
+            if d:
+                result = result * row[d] % mod
+    return int(result)
@@ -0,0 +1,768 @@
+from .ecc import *
+from .ecc import _build_fixed_base_table, _fixed_base_jacobian, _fixed_base_table, _jacobian_add, _jacobian_x_equals, \
+    _normalize, _odd_multiples, _wnaf_table_mul
+from .ecc_lib import *
+from .bytes_lib import align, bytes_xor
+from functools import lru_cache, partial
+from math import ceil
+from .sm3_lib import new_sm3
+from .store_lib import load_or_build_base_table
+import io
+import secrets
+
+# 流式加解密每次读取的字节数
+STREAM_CHUNK = 64 * 1024
+# 流式解密的明文释放策略: verified为C3校验通过后才写出明文, early为边解密边写出、结束时再校验C3
+RELEASE_POLICIES = ('verified', 'early')
+
+# 未指定用户身份时使用的默认ID
+DEFAULT_ID = b'1234567812345678'
+# 批量验签时公钥wNAF表的窗口宽度
+PUB_TABLE_WIDTH = 5
+# 批量验签中同一公钥的签名数不少于该值时，为公钥构建固定基点表
+PUB_FIXED_THRESHOLD = 16
+
+
+def sm3_hash(message):
+    """
+    SM3哈希函数调用包装，模块内部直接使用new_sm3得到的原始杂凑值
+    :param message: 消息,bytes
+    :return: sm3哈希结果,str
+    """
+    return new_sm3(message).hexdigest()
+
+
+def kdf(bitz, k_len):
+    """
+    密钥派生函数，Z只吸收一次，每个计数器复制该上下文后追加计数器
+    :param bitz: 需要派生的字节串,bytes
+    :param k_len: 字节长度,int
+    :return: 密钥数据比特串k,bytes
+    """
+    base = new_sm3(bitz)
+    out = bytearray()
+    for ct in range(1, ceil(k_len / 32) + 1):
+        ctx = base.copy()
+        ctx.update(ct.to_bytes(4, 'big'))
+        out += ctx.digest()
+    del out[k_len:]
+    return bytes(out)
+
+
+def sm2_enc(mes, g, n, pub):
+    """
+    SM2 加密函数
+    :param mes:明文消息,str/bytes
+    :param g: 基点G,Point
+    :param n: 阶数n,int
+    :param pub: 使用的公钥,Point/bytes(编码的公钥)
+    :return: SM2密钥加密结果
+    """
+    if isinstance(mes, str):
+        mes = mes.encode()
+    pub = _public_point(pub, g.curve)
+    if pub.is_zero():  # 对于sm2推荐曲线，h等于1
+        raise ValueError("This point cannot be used as public key")
+    while True:
+        cipher = _sm2_enc_k(mes, g, pub, secrets.randbelow(n - 1) + 1)
+        if cipher is not None:
+            return cipher
+
+
+def _sm2_enc_k(mes, g, pub, k):
+    """
+    使用给定的随机数k加密，KDF输入与C3中的x2、y2按域元素长度编码
+    :param mes: 明文消息,bytes
+    :param g: 基点G,Point
+    :param pub: 公钥,Point
+    :param k: 随机数k,int
+    :return: 密文C1||C3||C2,明文非空且t全零时为None,bytes
+    """
+    k_len = len(mes)
+    c_1 = bytes(fixed_base_mul(g, k))
+    s = pub * k
+    lens = g.curve.byte_len
+    x_bytes = align(s.x, lens)
+    y_bytes = align(s.y, lens)
+    t = kdf(x_bytes + y_bytes, k_len)
+    if k_len and t == b'\x00' * k_len:
+        return None
+    c_2 = bytes_xor(mes, t, k_len)
+    ctx = new_sm3(x_bytes)
+    ctx.update(mes)
+    ctx.update(y_bytes)
+    c_3 = ctx.digest()
+    return c_1 + c_3 + c_2
+
+
+def _c1_length(prefix, curve):
+    """
+    由首字节判断C1的编码长度，支持本模块输出的压缩格式与标准中的04非压缩格式
+    :param prefix: C1首字节,int
+    :param curve: 曲线,Curve
+    :return: C1字节数,int
+    """
+    return 2 * curve.byte_len + 1 if prefix == 4 else curve.byte_len + 1
+
+
+def _public_point(pub, curve):
+    """
+    公钥为编码字节串时经缓存解码校验
+    :param pub: 公钥,Point/bytes
+    :param curve: 曲线,Curve
+    :return: 公钥,Point
+    """
+    if isinstance(pub, (bytes, bytearray, memoryview)):
+        return decode_public_key(pub, curve)
+    return pub
+
+
+def sm2_dec(cipher, g, pri):
+    """
+    SM2解密方法，C2按C1、C3之后的偏移截取，空明文的密文也能解密，与流式解密一致
+    :param cipher:密文,bytes
+    :param g: 基点G,Point
+    :param pri: 私钥,int
+    :return: SM2解密结果,bytes
+    """
+    length = _c1_length(cipher[0], g.curve)
+    c_1_byte = cipher[:length]
+    c_1 = from_bytes(c_1_byte, g.curve)
+    if c_1.is_zero():
+        raise ValueError("This C1 is wrong. Check the cipher")
+    tmp = c_1.mul(pri, method='ladder')
+    x_bytes = align(tmp.x, g.curve.byte_len)
+    y_bytes = align(tmp.y, g.curve.byte_len)
+    k_len = len(cipher) - length - 32
+    if k_len < 0:
+        raise ValueError("Cipher is too short.")
+    t = kdf(x_bytes + y_bytes, k_len)
+    if k_len and t == b'\x00' * k_len:
+        raise ValueError("This t is wrong. ")
+    c_2 = cipher[length + 32:]
+    m = bytes_xor(c_2, t, k_len)
+    ctx = new_sm3(x_bytes)
+    ctx.update(m)
+    ctx.update(y_bytes)
+    u = ctx.digest()
+    c_3 = cipher[length:length + 32]
+    if u != c_3:
+        raise ValueError("Hash is wrong.")
+    return m
+
+
+class _KeyStream:
+    def __init__(self, z):
+        """
+        KDF密钥流，按需逐块计算 SM3(Z || ct)
+        :param z: 派生用的字节串Z,bytes
+        """
+        self._base = new_sm3(z)
+        self._ct = 1
+        self._buffer = b''
+
+    def take(self, k_len):
+        """
+        取出后续k_len字节的密钥流
+        :param k_len: 字节长度,int
+        :return: 密钥流,bytes
+        """
+        blocks = [self._buffer]
+        have = len(self._buffer)
+        while have < k_len:
+            ctx = self._base.copy()
+            ctx.update(self._ct.to_bytes(4, 'big'))
+            block = ctx.digest()
+            self._ct += 1
+            blocks.append(block)
+            have += len(block)
+        data = b''.join(blocks)
+        self._buffer = data[k_len:]
+        return data[:k_len]
+
+    def peek(self, k_len):
+        """
+        查看后续k_len字节的密钥流但不取出
+        :param k_len: 字节长度,int
+        :return: 密钥流,bytes
+        """
+        data = self.take(k_len)
+        self._buffer = data + self._buffer
+        return data
+
+
+class _ByteCounter:
+    def __init__(self, chunks):
+        """
+        统计经过的字节数的字节块迭代器包装
+        :param chunks: 字节块迭代器
+        """
+        self._chunks = chunks
+        self.total = 0
+
+    def __iter__(self):
+        for chunk in self._chunks:
+            self.total += len(chunk)
+            yield chunk
+
+
+def _iter_chunks(src, chunk_size):
+    """
+    把明文/密文来源统一成字节块迭代器
+    :param src: 文件对象(有read方法)、bytes/bytearray/memoryview或字节块的可迭代对象
+    :param chunk_size: 文件读取块大小,int
+    :return: 字节块生成器
+    """
+    if hasattr(src, 'read'):
+        while True:
+            chunk = src.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+    elif isinstance(src, (bytes, bytearray, memoryview)):
+        view = memoryview(src)
+        for i in range(0, len(view), chunk_size):
+            yield view[i:i + chunk_size]
+    else:
+        for chunk in src:
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            if chunk:
+                yield chunk
+
+
+def _read_exact(chunks, k_len, pending):
+    """
+    从字节块迭代器中读取恰好k_len字节
+    :param chunks: 字节块迭代器
+    :param k_len: 字节长度,int
+    :param pending: 上次读取剩余的字节,bytes
+    :return: (读取的字节,剩余的字节),(bytes,bytes)
+    """
+    data = bytes(pending)
+    while len(data) < k_len:
+        chunk = next(chunks, None)
+        if chunk is None:
+            break
+        data += bytes(chunk)
+    return data[:k_len], data[k_len:]
+
+
+def _keystream_is_zero(stream, head, more):
+    """
+    流式场景下的t全零检查。只检查第一个密钥块:
+    明文不超过32字节时与整体检查等价，更长时只会多拒绝(概率可忽略)，不会接受全零的t
+    :param stream: 新建的密钥流,_KeyStream
+    :param head: 预读的明文/密文开头(至多32字节),bytes
+    :param more: 开头之后是否还有数据,bool
+    :return: 需要拒绝(True)/否(False),bool
+    """
+    first = stream.peek(32)
+    check = first if more else first[:len(head)]
+    return len(check) > 0 and check == b'\x00' * len(check)
+
+
+def sm2_enc_stream(src, dst, g, n, pub, chunk_size=STREAM_CHUNK):
+    """
+    SM2 流式加密函数，内存占用与明文长度无关
+    密文格式与sm2_enc相同(C1||C3||C2)，C3在明文读完后回填，因此dst需要支持seek
+    :param src: 明文来源,文件对象/bytes/字节块的可迭代对象
+    :param dst: 密文输出,可seek的二进制文件对象
+    :param g: 基点G,Point
+    :param n: 阶数n,int
+    :param pub: 使用的公钥,Point/bytes(编码的公钥)
+    :param chunk_size: 读取块大小,int
+    :return: 明文字节数,int
+    """
+    pub = _public_point(pub, g.curve)
+    if pub.is_zero():
+        raise ValueError("This point cannot be used as public key")
+    chunks = _iter_chunks(src, chunk_size)
+    head, rest = _read_exact(chunks, 33, b'')
+    while True:
+        k = secrets.randbelow(n - 1) + 1
+        c_1 = bytes(fixed_base_mul(g, k))
+        s = pub * k
+        x_bytes = align(s.x, g.curve.byte_len)
+        y_bytes = align(s.y, g.curve.byte_len)
+        stream = _KeyStream(x_bytes + y_bytes)
+        if not _keystream_is_zero(stream, head[:32], len(head) == 33):
+            break
+    dst.write(c_1)
+    c_3_pos = dst.tell()
+    dst.write(b'\x00' * 32)
+    ctx = new_sm3(x_bytes)
+    total = 0
+    for chunk in _chain(head + rest, chunks):
+        ctx.update(chunk)
+        dst.write(bytes_xor(chunk, stream.take(len(chunk)), len(chunk)))
+        total += len(chunk)
+    ctx.update(y_bytes)
+    end = dst.tell()
+    dst.seek(c_3_pos)
+    dst.write(ctx.digest())
+    dst.seek(end)
+    return total
+
+
+def _chain(head, chunks):
+    """
+    把预读的开头与剩余字节块连接成一个迭代器
+    :param head: 预读的字节,bytes
+    :param chunks: 剩余字节块迭代器
+    :return: 字节块生成器
+    """
+    if head:
+        yield head
+    for chunk in chunks:
+        yield chunk
+
+
+def _dec_pass(chunks, stream, ctx, out):
+    """
+    流式解密的一遍扫描: 解出明文、吸收进C3上下文并写出
+    :param chunks: C2字节块迭代器
+    :param stream: 密钥流,_KeyStream
+    :param ctx: 已吸收x2的SM3上下文,SM3
+    :param out: 明文输出,文件对象,为None时丢弃明文
+    :return: void
+    """
+    for chunk in chunks:
+        m = bytes_xor(chunk, stream.take(len(chunk)), len(chunk))
+        ctx.update(m)
+        if out is not None:
+            out.write(m)
+
+
+def sm2_dec_stream(src, dst, g, pri, release='verified', chunk_size=STREAM_CHUNK):
+    """
+    SM2 流式解密函数，内存占用与密文长度无关
+    明文释放策略:
+    verified: 只有C3校验通过后才向dst写出明文。src可seek时分两遍扫描(先校验、再解密写出)，
+              否则校验时把C2密文暂存到临时文件(SpooledTemporaryFile)，校验通过后再从中解密写出；
+              明文不会落到临时文件中
+    early: 边解密边写出，全部读完后才校验C3；校验失败时抛出ValueError，此时dst中的内容不可信，调用方必须丢弃
+    :param src: 密文来源,文件对象/bytes/字节块的可迭代对象
+    :param dst: 明文输出,二进制文件对象
+    :param g: 基点G,Point
+    :param pri: 私钥,int
+    :param release: 明文释放策略,见RELEASE_POLICIES,str
+    :param chunk_size: 读取块大小,int
+    :return: 明文字节数,int
+    """
+    if release not in RELEASE_POLICIES:
+        raise ValueError("Unknown release policy: " + str(release))
+    seekable = hasattr(src, 'seekable') and src.seekable()
+    start = src.tell() if seekable else 0
+    chunks = _iter_chunks(src, chunk_size)
+    c_1_byte, rest = _read_exact(chunks, 1, b'')
+    if not c_1_byte:
+        raise ValueError("Cipher is too short.")
+    length = _c1_length(c_1_byte[0], g.curve)
+    more, rest = _read_exact(chunks, length - 1, rest)
+    c_1 = from_bytes(c_1_byte + more, g.curve)
+    if c_1.is_zero():
+        raise ValueError("This C1 is wrong. Check the cipher")
+    c_3, rest = _read_exact(chunks, 32, rest)
+    head, rest = _read_exact(chunks, 33, rest)
+    if len(c_3) != 32:
+        raise ValueError("Cipher is too short.")
+    tmp = c_1.mul(pri, method='ladder')
+    x_bytes = align(tmp.x, g.curve.byte_len)
+    y_bytes = align(tmp.y, g.curve.byte_len)
+    stream = _KeyStream(x_bytes + y_bytes)
+    if _keystream_is_zero(stream, head[:32], len(head) == 33):
+        raise ValueError("This t is wrong. ")
+    ctx = new_sm3(x_bytes)
+    counter = _ByteCounter(_chain(head + rest, chunks))
+    if release == 'early':
+        _dec_pass(counter, stream, ctx, dst)
+        ctx.update(y_bytes)
+        if ctx.digest() != c_3:
+            raise ValueError("Hash is wrong. Discard the released plaintext.")
+        return counter.total
+    if seekable:
+        _dec_pass(counter, stream, ctx, None)
+        ctx.update(y_bytes)
+        if ctx.digest() != c_3:
+            raise ValueError("Hash is wrong.")
+        src.seek(start + length + 32)
+        _dec_pass(_iter_chunks(src, chunk_size), _KeyStream(x_bytes + y_bytes), new_sm3(), dst)
+        return counter.total
+    # 只有不可seek的来源需要临时文件(只暂存密文)
+    import tempfile
+    with tempfile.SpooledTemporaryFile(max_size=chunk_size * 16) as spool:
+        _dec_pass(_tee(counter, spool), stream, ctx, None)
+        ctx.update(y_bytes)
+        if ctx.digest() != c_3:
+            raise ValueError("Hash is wrong.")
+        spool.seek(0)
+        _dec_pass(_iter_chunks(spool, chunk_size), _KeyStream(x_bytes + y_bytes), new_sm3(), dst)
+    return counter.total
+
+
+def _tee(chunks, out):
+    """
+    转发字节块的同时写入out
+    :param chunks: 字节块迭代器
+    :param out: 二进制文件对象
+    :return: 字节块生成器
+    """
+    for chunk in chunks:
+        out.write(chunk)
+        yield chunk
+
+
+@lru_cache(maxsize=1024)
+def _za(x, y, g_x, g_y, curve, uid):
+    """
+    计算用户杂凑值ZA = SM3(ENTL || ID || a || b || xG || yG || xA || yA)，按公钥、基点与ID缓存
+    :param x: 公钥x,int
+    :param y: 公钥y,int
+    :param g_x: 基点x,int
+    :param g_y: 基点y,int
+    :param curve: 曲线,Curve
+    :param uid: 用户身份ID,bytes
+    :return: ZA,bytes
+    """
+    lens = curve.byte_len
+    entl = (len(uid) * 8).to_bytes(2, 'big')
+    values = (curve.a, curve.b, g_x, g_y, x, y)
+    return new_sm3(entl + uid + b''.join(align(v, lens) for v in values)).digest()
+
+
+def sm2_za(pub, uid=DEFAULT_ID, g=None):
+    """
+    计算公钥对应的用户杂凑值ZA
+    :param pub: 公钥,Point
+    :param uid: 用户身份ID,bytes
+    :param g: 基点G,为None时使用曲线登记的生成元,Point
+    :return: ZA,bytes
+    """
+    if g is None:
+        g = pub.curve.g
+        if g is None:
+            raise ValueError("The curve has no registered generator, pass g explicitly.")
+    return _za(pub.x, pub.y, g.x, g.y, pub.curve, uid)
+
+
+def _sm2_e(mes, pub, uid, g):
+    """
+    计算签名消息杂凑值e = SM3(ZA || M)
+    :param mes: 消息,str/bytes
+    :param pub: 公钥,Point
+    :param uid: 用户身份ID,bytes
+    :param g: 基点G,Point
+    :return: e,int
+    """
+    if isinstance(mes, str):
+        mes = mes.encode()
+    ctx = new_sm3(sm2_za(pub, uid, g))
+    ctx.update(mes)
+    return int.from_bytes(ctx.digest(), 'big')
+
+
+def sm2_sign(mes, g, n, pri, pub=None, uid=DEFAULT_ID):
+    """
+    SM2 签名函数；同一私钥反复签名时使用SM2Key以复用预计算
+    :param mes: 签名明文,str/bytes
+    :param g: 基点G,Point
+    :param n: 阶数n,int
+    :param pri: 私钥d,int
+    :param pub: 公钥,为None时由私钥计算,Point
+    :param uid: 用户身份ID,bytes
+    :return: 签名(r,s)
+    """
+    return SM2Key(g, n, pri, pub, uid).sign(mes)
+
+
+def _sm2_sign_e(e, g, n, pri, d_inv):
+    """
+    对消息杂凑值e签名
+    :param e: 消息杂凑值,int
+    :param g: 基点G,Point
+    :param n: 阶数n,int
+    :param pri: 私钥d,int
+    :param d_inv: (1+d)^-1 mod n,int
+    :return: 签名(r,s)
+    """
+    while True:
+        k = secrets.randbelow(n - 1) + 1
+        r = (e + fixed_base_mul(g, k).x) % n
+        if r == 0 or r + k == n:
+            continue
+        s = d_inv * (k - r * pri) % n
+        if s != 0:
+            return r, s
+
+
+def sm2_sign_batch(mes_list, g, n, pri, pub=None, uid=DEFAULT_ID):
+    """
+    SM2 批量签名函数，同一私钥对多条消息签名
+    :param mes_list: 签名明文列表,list[str/bytes]
+    :param g: 基点G,Point
+    :param n: 阶数n,int
+    :param pri: 私钥d,int
+    :param pub: 公钥,为None时由私钥计算,Point
+    :param uid: 用户身份ID,bytes
+    :return: 签名(r,s)列表,list[(int,int)]
+    """
+    return SM2Key(g, n, pri, pub, uid).sign_batch(mes_list)
+
+
+def _sm2_check(e, sign, g, n, pub_mul):
+    """
+    SM2 验签核心: 计算 (x1,y1) = s*G + t*P_A 并检查 (e + x1) mod n == r
+    结果保持Jacobian坐标，x1的比较通过 X == x*Z^2 完成，不需要求逆
+    :param e: 消息杂凑值,int
+    :param sign: 签名(r,s)
+    :param g: 基点G,Point
+    :param n: 阶数n,int
+    :param pub_mul: 计算t*P_A的Jacobian坐标的函数,接受t
+    :return: 验证成功(True)失败(False)
+    """
+    r, s = sign
+    if not (0 < r < n and 0 < s < n):
+        return False
+    t = (r + s) % n
+    if t == 0:
+        return False
+    curve = g.curve
+    a, p = curve.a, curve.p
+    jac = _jacobian_add(_fixed_base_jacobian(_base_table(g), s, FIXED_BASE_WIDTH, a, p), pub_mul(t), a, p)
+    x_1 = (r - e) % n
+    while x_1 < p:
+        if _jacobian_x_equals(jac, x_1, p):
+            return True
+        x_1 += n
+    return False
+
+
+def _base_table(g):
+    """
+    s*G使用的固定基点表: g为曲线登记的生成元时使用曲线上的表，否则使用ecc中按基点缓存的表
+    :param g: 基点G,Point
+    :return: 预计算表,见ecc._build_fixed_base_table
+    """
+    curve = g.curve
+    if curve.g is not None and g == curve.g:
+        return curve.base_table()
+    return _fixed_base_table(g.x, g.y, curve, FIXED_BASE_WIDTH)
+
+
+def sm2_verify(mes, sign, g, n, pub, uid=DEFAULT_ID):
+    """
+    SM2 验签函数
+    :param mes: 签名明文,str/bytes
+    :param sign: 签名(r,s)
+    :param g: 基点G,Point
+    :param n: 阶数n,int
+    :param pub: 公钥,Point/bytes(编码的公钥)
+    :param uid: 用户身份ID,bytes
+    :return: 验证成功(True)失败(False)
+    """
+    try:
+        pub = _public_point(pub, g.curve)
+    except ValueError:
+        return False
+    if pub.is_zero() or not pub.curve.contains(pub.x, pub.y):
+        return False
+    e = _sm2_e(mes, pub, uid, g)
+    table = _odd_multiples(pub.x, pub.y, MULTI_MUL_WIDTH, pub.a, pub.p)
+    return _sm2_check(e, sign, g, n, partial(_wnaf_table_mul, table, w=MULTI_MUL_WIDTH, a=pub.a, p=pub.p))
+
+
+def _pub_mul(pub, count):
+    """
+    为批量验签中的一个公钥选择t*P_A的计算方式
+    签名数较多时构建固定基点表，否则使用仿射化的wNAF表
+    :param pub: 公钥,Point
+    :param count: 该公钥在本批次中的签名数,int
+    :return: 接受t并返回t*P_A的Jacobian坐标的函数,公钥非法时为None
+    """
+    curve = pub.curve
+    if pub.is_zero() or not curve.contains(pub.x, pub.y):
+        return None
+    if count >= PUB_FIXED_THRESHOLD:
+        table = _build_fixed_base_table(pub.x, pub.y, curve, FIXED_BASE_WIDTH)
+        return partial(_fixed_base_jacobian, table, w=FIXED_BASE_WIDTH, a=curve.a, p=curve.p)
+    table = _normalize(_odd_multiples(pub.x, pub.y, PUB_TABLE_WIDTH, curve.a, curve.p), curve.p)
+    return partial(_wnaf_table_mul, table, w=PUB_TABLE_WIDTH, a=curve.a, p=curve.p)
+
+
+def _batch_point(pub, curve):
+    """
+    批量验签中的公钥解码，非法编码视为无穷远点，由_pub_mul判为验证失败
+    :param pub: 公钥,Point/bytes
+    :param curve: 曲线,Curve
+    :return: 公钥,Point
+    """
+    try:
+        return _public_point(pub, curve)
+    except ValueError:
+        return Point(0, 0, curve)
+
+
+def sm2_verify_batch(items, g, n, uid=DEFAULT_ID):
+    """
+    SM2 批量验签函数
+    同一公钥的签名共享ZA与公钥预计算表，s*G使用曲线的固定基点表，全程不需要逐签名求逆
+    :param items: (明文,签名,公钥)列表,公钥可以是编码的字节串,list[(str/bytes,(int,int),Point/bytes)]
+    :param g: 基点G,Point
+    :param n: 阶数n,int
+    :param uid: 用户身份ID,bytes
+    :return: 每个签名的验证结果,list[bool]
+    """
+    items = [(mes, sign, _batch_point(pub, g.curve)) for mes, sign, pub in items]
+    counts = {}
+    for mes, sign, pub in items:
+        key = (pub.x, pub.y)
+        counts[key] = counts.get(key, 0) + 1
+    muls = {}
+    results = []
+    for mes, sign, pub in items:
+        key = (pub.x, pub.y)
+        if key not in muls:
+            muls[key] = _pub_mul(pub, counts[key])
+        pub_mul = muls[key]
+        if pub_mul is None:
+            results.append(False)
+        else:
+            results.append(_sm2_check(_sm2_e(mes, pub, uid, g), sign, g, n, pub_mul))
+    return results
+
+
+class SM2Key:
+    def __init__(self, g, n, pri=None, pub=None, uid=DEFAULT_ID):
+        """
+        SM2密钥对，缓存公钥、ZA与(1+d)^-1，验签用的公钥固定基点表在首次验签时建立
+        g为曲线登记的生成元且本进程尚无生成元表时，先从用户缓存目录读取，不存在时构建并写回
+        :param g: 基点G,Point
+        :param n: 阶数n,int
+        :param pri: 私钥d,为None时随机生成,int
+        :param pub: 公钥,为None时由私钥计算,Point/bytes(编码的公钥)
+        :param uid: 用户身份ID,bytes
+        """
+        curve = g.curve
+        if curve.g is not None and g == curve.g:
+            load_or_build_base_table(curve, FIXED_BASE_WIDTH)
+        self.g = g
+        self.n = n
+        self.pri = secrets.randbelow(n - 2) + 1 if pri is None else pri
+        self.pub = fixed_base_mul(g, self.pri) if pub is None else _public_point(pub, g.curve)
+        self.uid = uid
+        self.za = sm2_za(self.pub, uid, g)
+        self.d_inv = get_inv(1 + self.pri, n)
+        self._pub_mul = None
+
+    def _e(self, mes):
+        """
+        使用缓存的ZA计算e = SM3(ZA || M)
+        :param mes: 消息,str/bytes
+        :return: e,int
+        """
+        if isinstance(mes, str):
+            mes = mes.encode()
+        ctx = new_sm3(self.za)
+        ctx.update(mes)
+        return int.from_bytes(ctx.digest(), 'big')
+
+    def sign(self, mes):
+        """
+        SM2 签名
+        :param mes: 签名明文,str/bytes
+        :return: 签名(r,s)
+        """
+        return _sm2_sign_e(self._e(mes), self.g, self.n, self.pri, self.d_inv)
+
+    def sign_batch(self, mes_list):
+        """
+        SM2 批量签名，各签名的k*G一起批量仿射化，整批只需一次域上求逆
+        :param mes_list: 签名明文列表,list[str/bytes]
+        :return: 签名(r,s)列表,list[(int,int)]
+        """
+        g, n, pri, d_inv = self.g, self.n, self.pri, self.d_inv
+        es = [self._e(mes) for mes in mes_list]
+        ks = [secrets.randbelow(n - 1) + 1 for e in es]
+        signs = []
+        for e, k, point in zip(es, ks, fixed_base_mul_batch(g, ks)):
+            r = (e + point.x) % n
+            s = d_inv * (k - r * pri) % n
+            if r == 0 or r + k == n or s == 0:
+                signs.append(_sm2_sign_e(e, g, n, pri, d_inv))
+            else:
+                signs.append((r, s))
+        return signs
+
+    def __getstate__(self):
+        """
+        序列化时附带曲线上已建立的生成元表，使工作进程不必重建
+        :return: 对象状态,dict
+        """
+        state = self.__dict__.copy()
+        state['_base_tables'] = dict(self.g.curve.tables)
+        return state
+
+    def __setstate__(self, state):
+        """
+        反序列化并把生成元表安装到本进程的驻留曲线上
+        :param state: 对象状态,dict
+        :return: void
+        """
+        tables = state.pop('_base_tables')
+        self.__dict__.update(state)
+        for w, table in tables.items():
+            self.g.curve.tables.setdefault(w, table)
+
+    def precompute(self):
+        """
+        提前建立生成元表与公钥固定基点表，在发送到工作进程前调用可使各进程共享这些表
+        :return: void
+        """
+        _base_table(self.g)
+        if self._pub_mul is None:
+            self._pub_mul = _pub_mul(self.pub, PUB_FIXED_THRESHOLD)
+
+    def verify(self, mes, sign):
+        """
+        SM2 验签
+        :param mes: 签名明文,str/bytes
+        :param sign: 签名(r,s)
+        :return: 验证成功(True)失败(False)
+        """
+        if self._pub_mul is None:
+            self.precompute()
+            if self._pub_mul is None:
+                return False
+        return _sm2_check(self._e(mes), sign, self.g, self.n, self._pub_mul)
+
+
+def main():
+    curve = get_named_curve('sm2test192')
+    g = curve.g
+    n = curve.n
+    mes = 'encryption standard'
+    pub = Point(0x79f0a9547ac6d100531508b30d30a56536bcfc8149f4af4a, 0xae38f2d8890838df9c19935a65a8bcc8994bc7924672f912,
+                curve)
+    pri = 0x58892b807074f53fbf67288a1dfaa1ac313455fe60355afd
+    cipher = sm2_enc(mes, g, n, pub)
+    print(sm2_dec(cipher, g, pri))
+    src = io.BytesIO(mes.encode() * 1000)
+    cipher_file = io.BytesIO()
+    sm2_enc_stream(src, cipher_file, g, n, pub)
+    cipher_file.seek(0)
+    plain_file = io.BytesIO()
+    sm2_dec_stream(cipher_file, plain_file, g, pri)
+    print(plain_file.getvalue() == src.getvalue())
+    print(sm2_dec(cipher_file.getvalue(), g, pri) == src.getvalue())
+    sign = sm2_sign(mes, g, n, pri, pub)
+    print(sm2_verify(mes, sign, g, n, pub))
+    signs = sm2_sign_batch([mes, 'another message'], g, n, pri, pub)
+    print(sm2_verify_batch([(mes, signs[0], pub), ('another message', signs[1], pub)], g, n))
+    print(sm2_verify_batch([(mes, sign, pub), ('tampered', sign, pub)], g, n))
+    key = SM2Key(g, n, pri, pub)
+    print(key.verify(mes, key.sign(mes)) and not key.verify('tampered', key.sign(mes)))
+
+
+if __name__ == "__main__":
+    main()
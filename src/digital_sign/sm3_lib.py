@@ -0,0 +1,189 @@
+import hashlib
+import os
+import struct
+
+_unpack = struct.Struct('>16I').unpack
+_IV = (0x7380166f, 0x4914b2b9, 0x172442d7, 0xda8a0600, 0xa96f30bc, 0x163138aa, 0xe38dee4d, 0xb0fb0e4e)
+_MASK = 0xffffffff
+
+
+def _rotl(x, n):
+    """
+    32位循环左移
+    :param x: 参数x,int
+    :param n: 移位数,int
+    :return: 移位结果,int
+    """
+    n %= 32
+    return ((x << n) | (x >> (32 - n))) & _MASK
+
+
+# 各轮常量T_j循环左移j位后的值
+_T = tuple(_rotl(0x79cc4519 if j < 16 else 0x7a879d8a, j) for j in range(64))
+
+
+def _compress(v, block):
+    """
+    SM3压缩函数，循环移位均已内联
+    :param v: 链接变量V,tuple[int]
+    :param block: 64字节分组,bytes/memoryview
+    :return: 新的链接变量,tuple[int]
+    """
+    m = _MASK
+    w = list(_unpack(block))
+    for j in range(16, 68):
+        x = w[j - 16] ^ w[j - 9]
+        y = w[j - 3]
+        x ^= ((y << 15) | (y >> 17)) & m
+        y = w[j - 13]
+        w.append(x ^ (((x << 15) | (x >> 17)) & m) ^ (((x << 23) | (x >> 9)) & m)
+                 ^ (((y << 7) | (y >> 25)) & m) ^ w[j - 6])
+    a, b, c, d, e, f, g, h = v
+    for j in range(64):
+        a_12 = ((a << 12) | (a >> 20)) & m
+        ss_1 = (a_12 + e + _T[j]) & m
+        ss_1 = ((ss_1 << 7) | (ss_1 >> 25)) & m
+        w_j = w[j]
+        if j < 16:
+            tt_1 = ((a ^ b ^ c) + d + (ss_1 ^ a_12) + (w_j ^ w[j + 4])) & m
+            tt_2 = ((e ^ f ^ g) + h + ss_1 + w_j) & m
+        else:
+            tt_1 = (((a & (b | c)) | (b & c)) + d + (ss_1 ^ a_12) + (w_j ^ w[j + 4])) & m
+            tt_2 = ((g ^ (e & (f ^ g))) + h + ss_1 + w_j) & m
+        d = c
+        c = ((b << 9) | (b >> 23)) & m
+        b = a
+        a = tt_1
+        h = g
+        g = ((f << 19) | (f >> 13)) & m
+        f = e
+        e = tt_2 ^ (((tt_2 << 9) | (tt_2 >> 23)) & m) ^ (((tt_2 << 17) | (tt_2 >> 15)) & m)
+    return a ^ v[0], b ^ v[1], c ^ v[2], d ^ v[3], e ^ v[4], f ^ v[5], g ^ v[6], h ^ v[7]
+
+
+class SM3:
+    digest_size = 32
+    block_size = 64
+
+    def __init__(self, data=b''):
+        """
+        SM3增量杂凑上下文
+        :param data: 初始数据,bytes
+        """
+        self._v = _IV
+        self._buffer = b''
+        self._length = 0
+        if data:
+            self.update(data)
+
+    def update(self, data):
+        """
+        吸收数据，整块部分直接在输入缓冲区上压缩，不复制输入
+        :param data: 数据,bytes/bytearray/memoryview
+        :return: void
+        """
+        view = memoryview(data).cast('B')
+        self._length += len(view)
+        v = self._v
+        start = 0
+        if self._buffer:
+            start = 64 - len(self._buffer)
+            block = self._buffer + bytes(view[:start])
+            if len(block) < 64:
+                self._buffer = block
+                return
+            v = _compress(v, block)
+        end = start + (len(view) - start) // 64 * 64
+        for i in range(start, end, 64):
+            v = _compress(v, view[i:i + 64])
+        self._v = v
+        self._buffer = bytes(view[end:])
+
+    def copy(self):
+        """
+        复制当前上下文，用于共享已吸收的前缀
+        :return: 新的上下文,SM3
+        """
+        other = SM3.__new__(SM3)
+        other._v = self._v
+        other._buffer = self._buffer
+        other._length = self._length
+        return other
+
+    def digest(self):
+        """
+        计算杂凑值，不改变当前上下文
+        :return: 32字节杂凑值,bytes
+        """
+        tail = self._buffer + b'\x80' + b'\x00' * ((55 - len(self._buffer)) % 64) + struct.pack('>Q', self._length * 8)
+        v = self._v
+        for i in range(0, len(tail), 64):
+            v = _compress(v, tail[i:i + 64])
+        return struct.pack('>8I', *v)
+
+    def finalize(self):
+        """
+        计算杂凑值，与cryptography的hashes.Hash接口一致
+        :return: 32字节杂凑值,bytes
+        """
+        return self.digest()
+
+    def hexdigest(self):
+        """
+        计算十六进制杂凑值
+        :return: 杂凑值,str
+        """
+        return self.digest().hex()
+
+
+def _openssl_context():
+    """
+    OpenSSL提供的SM3空白上下文
+    :return: hashlib上下文,OpenSSL不支持SM3时为None
+    """
+    if os.environ.get('DIGITAL_SIGN_SM3', 'openssl') == 'python':
+        return None
+    try:
+        return hashlib.new('sm3')
+    except ValueError:
+        return None
+
+
+# 导入时选择SM3实现: OpenSSL支持SM3时使用hashlib，否则使用纯Python实现；可通过环境变量DIGITAL_SIGN_SM3=python强制使用纯Python实现
+SM3_ENGINES = ('python', 'openssl')
+_empty_openssl = _openssl_context()
+SM3_ENGINE = 'python' if _empty_openssl is None else 'openssl'
+
+
+def new_sm3(data=b''):
+    """
+    新建当前实现的SM3上下文，支持update/copy/digest/hexdigest
+    需要对同一前缀追加不同后缀时，先吸收前缀再对上下文copy
+    :param data: 初始数据,bytes/bytearray/memoryview
+    :return: 杂凑上下文
+    """
+    if _empty_openssl is None:
+        return SM3(data)
+    ctx = _empty_openssl.copy()
+    if data:
+        ctx.update(data)
+    return ctx
+
+
+def sm3_digest(data):
+    """
+    一次性计算SM3杂凑值
+    :param data: 数据,bytes/bytearray/memoryview
+    :return: 32字节杂凑值,bytes
+    """
+    return new_sm3(data).digest()
+
+
+def main():
+    print(SM3_ENGINE)
+    print(SM3(b'abc').hexdigest())
+    print(SM3(b'abcd' * 16).hexdigest())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,283 @@
+from .ecc import _jacobian_double
+from .prime_lib import is_prime
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+
+# 文件格式: 头部 | 整数序列 | SHA-256(头部+整数序列)
+# 头部: 魔数(4字节) 版本(u16) 类型(u16) 整数个数(u32) 整数序列长度(u64)
+# 整数序列: 每项为 长度(u32) + 大端字节串，长度为NONE_LEN时表示None
+MAGIC = b'DSGN'
+VERSION = 1
+KIND_PARAMS = 1
+KIND_EC_TABLE = 3
+KINDS = (KIND_PARAMS, KIND_EC_TABLE)
+NONE_LEN = 0xffffffff
+
+# 缓存目录名，位于当前用户的缓存目录($XDG_CACHE_HOME或~/.cache)下
+CACHE_DIR_NAME = 'digital_sign'
+
+_HEADER = struct.Struct('>4sHHIQ')
+_LEN = struct.Struct('>I')
+_DIGEST_LEN = 32
+
+
+def dumps(kind, values):
+    """
+    序列化整数序列
+    :param kind: 数据类型,见KINDS,int
+    :param values: 非负整数或None组成的序列,list
+    :return: 序列化结果,bytes
+    """
+    if kind not in KINDS:
+        raise ValueError("Unknown cache kind: " + str(kind))
+    parts = []
+    for value in values:
+        if value is None:
+            parts.append(_LEN.pack(NONE_LEN))
+        else:
+            data = value.to_bytes((value.bit_length() + 7) // 8, 'big')
+            parts.append(_LEN.pack(len(data)))
+            parts.append(data)
+    payload = b''.join(parts)
+    body = _HEADER.pack(MAGIC, VERSION, kind, len(values), len(payload)) + payload
+    return body + hashlib.sha256(body).digest()
+
+
+def loads(buffer, kind):
+    """
+    反序列化并校验整数序列
+    :param buffer: 序列化数据,bytes-like
+    :param kind: 期望的数据类型,int
+    :return: 整数或None组成的列表,list
+    """
+    with memoryview(buffer) as view:
+        return _parse(view, kind)
+
+
+def _parse(view, kind):
+    """
+    解析并校验序列化数据
+    :param view: 序列化数据,memoryview
+    :param kind: 期望的数据类型,int
+    :return: 整数或None组成的列表,list
+    """
+    if len(view) < _HEADER.size + _DIGEST_LEN:
+        raise ValueError("Cache file is truncated.")
+    magic, version, file_kind, count, length = _HEADER.unpack_from(view)
+    if magic != MAGIC:
+        raise ValueError("Not a digital_sign cache file.")
+    if version != VERSION:
+        raise ValueError("Unsupported cache version: " + str(version))
+    if file_kind != kind:
+        raise ValueError("Cache kind mismatch: expected %d, got %d" % (kind, file_kind))
+    end = _HEADER.size + length
+    if len(view) != end + _DIGEST_LEN:
+        raise ValueError("Cache file length mismatch.")
+    if hashlib.sha256(view[:end]).digest() != view[end:]:
+        raise ValueError("Cache file checksum mismatch.")
+    values = []
+    offset = _HEADER.size
+    for i in range(count):
+        size, = _LEN.unpack_from(view, offset)
+        offset += _LEN.size
+        if size == NONE_LEN:
+            values.append(None)
+            continue
+        if offset + size > end:
+            raise ValueError("Cache file is corrupt.")
+        values.append(int.from_bytes(view[offset:offset + size], 'big'))
+        offset += size
+    if offset != end:
+        raise ValueError("Cache file is corrupt.")
+    return values
+
+
+def cache_path(name):
+    """
+    当前用户缓存目录下的文件路径，目录不存在时以0700权限创建
+    不使用共享临时目录中可预测的路径，避免其他用户预先放置文件或符号链接
+    :param name: 文件名,str
+    :return: 文件路径,str
+    """
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    path = os.path.join(base, CACHE_DIR_NAME)
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    return os.path.join(path, name)
+
+
+def dump(path, kind, values):
+    """
+    序列化整数序列并原子地写入文件，临时文件由mkstemp在同一目录中独占创建
+    :param path: 文件路径,str
+    :param kind: 数据类型,见KINDS,int
+    :param values: 非负整数或None组成的序列,list
+    :return: void
+    """
+    data = dumps(kind, values)
+    fd, tmp = tempfile.mkstemp(prefix=os.path.basename(path) + '.', suffix='.tmp',
+                               dir=os.path.dirname(path) or '.')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def load(path, kind):
+    """
+    通过mmap读取并校验文件
+    :param path: 文件路径,str
+    :param kind: 期望的数据类型,int
+    :return: 整数或None组成的列表,list
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise ValueError("Cache file is truncated.")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return loads(mm, kind)
+
+
+def load_or_create(path, kind, create, check=None):
+    """
+    读取缓存文件，文件不存在或校验失败时重新生成并写回
+    :param path: 文件路径,str
+    :param kind: 数据类型,int
+    :param create: 无参生成函数,返回整数序列
+    :param check: 读取结果的检查函数,不合法时抛出ValueError,为None时不检查
+    :return: 整数或None组成的列表,list
+    """
+    try:
+        values = load(path, kind)
+        if check is not None:
+            check(values)
+        return values
+    except (OSError, ValueError):
+        values = list(create())
+        dump(path, kind, values)
+        return values
+
+
+def save_params(path, params):
+    """
+    保存域参数(如Schnorr的[p,q,g])
+    :param path: 文件路径,str
+    :param params: 域参数,list[int]
+    :return: void
+    """
+    dump(path, KIND_PARAMS, params)
+
+
+def load_params(path):
+    """
+    读取域参数
+    :param path: 文件路径,str
+    :return: 域参数,list[int]
+    """
+    return load(path, KIND_PARAMS)
+
+
+def check_params(params):
+    """
+    检查Schnorr/ElGamal域参数[p,q,g]: p、q为素数，q整除p-1，g为q阶子群中的元素
+    校验和只能发现损坏，不能说明文件可信，读取的参数在使用前都要经过该检查
+    :param params: 域参数,list[int]
+    :return: void
+    """
+    if len(params) != 3 or None in params:
+        raise ValueError("Domain parameters must be [p, q, g].")
+    p, q, g = params
+    if not (is_prime(p) and is_prime(q) and (p - 1) % q == 0):
+        raise ValueError("Domain parameters have invalid p or q.")
+    if not 1 < g < p or pow(g, q, p) != 1:
+        raise ValueError("Domain parameters have an invalid generator.")
+
+
+def load_or_generate_params(path, generate):
+    """
+    读取并检查域参数[p,q,g]，不存在、损坏或不合法时调用generate重新生成
+    :param path: 文件路径,str
+    :param generate: 无参生成函数,返回域参数列表
+    :return: 域参数,list[int]
+    """
+    return load_or_create(path, KIND_PARAMS, generate, check_params)
+
+
+def load_or_build_base_table(curve, w):
+    """
+    读取曲线生成元的固定基点表并安装到曲线上，不存在、损坏或不合法时由curve.base_table构建并写回
+    短时运行的工作进程由此直接得到表，不必各自重建
+    :param curve: 曲线,Curve
+    :param w: 窗口宽度,int
+    :return: 预计算表,见ecc._build_fixed_base_table
+    """
+    if w in curve.tables:
+        return curve.tables[w]
+    name = curve.name or hashlib.sha256(b'%x:%x:%x' % (curve.p, curve.a, curve.b)).hexdigest()[:16]
+    path = cache_path('ec_table_%s_w%d.bin' % (name, w))
+    try:
+        table = _parse_base_table(load(path, KIND_EC_TABLE), curve, w)
+    except (OSError, ValueError):
+        table = curve.base_table(w)
+        dump(path, KIND_EC_TABLE, _base_table_values(curve, w))
+    curve.tables[w] = table
+    return table
+
+
+def _base_table_values(curve, w):
+    """
+    把生成元的固定基点表展开为整数序列，首先记录曲线参数、生成元、窗口宽度与行数
+    :param curve: 曲线,Curve
+    :param w: 窗口宽度,int
+    :return: 整数或None组成的列表,list
+    """
+    table = curve.base_table(w)
+    values = [curve.p, curve.a, curve.b, curve.g.x, curve.g.y, w, len(table)]
+    for row in table:
+        for point in row[1:]:
+            values.extend((None, None) if point is None else point)
+    return values
+
+
+def _parse_base_table(values, curve, w):
+    """
+    还原并检查固定基点表: 曲线、生成元、窗口宽度与行数须一致，每项都在曲线上，
+    且第i行首项等于重新计算的2^(w*i)*G，不合法时抛出ValueError
+    :param values: 整数或None组成的列表,list
+    :param curve: 曲线,Curve
+    :param w: 窗口宽度,int
+    :return: 预计算表,list[list[(int,int)]]
+    """
+    g = curve.g
+    if values[:5] != [curve.p, curve.a, curve.b, g.x, g.y]:
+        raise ValueError("Cached table belongs to another curve.")
+    rows = -(-curve.n.bit_length() // w)
+    if values[5:7] != [w, rows]:
+        raise ValueError("Cached table has a wrong window or row count.")
+    width = (1 << w) - 1
+    if len(values) != 7 + rows * width * 2:
+        raise ValueError("Cached table has a wrong size.")
+    p, a, b = curve.p, curve.a, curve.b
+    table = []
+    it = iter(values[7:])
+    base = (g.x, g.y, 1)
+    for i in range(rows):
+        row = [None]
+        for j in range(width):
+            x, y = next(it), next(it)
+            if x is None or y is None or (y * y - (x * x + a) * x - b) % p:
+                raise ValueError("Cached table has a point off the curve.")
+            row.append((x, y))
+        x, y = row[1]
+        bx, by, bz = base
+        z2 = bz * bz % p
+        if (x * z2 - bx) % p or (y * z2 * bz - by) % p:
+            raise ValueError("Cached table row %d does not start with 2^(w*i)*G." % i)
+        for k in range(w):
+            base = _jacobian_double(base, a, p)
+        table.append(row)
+    return table
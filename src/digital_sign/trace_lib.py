@@ -0,0 +1,345 @@
+from . import arith_lib
+from . import bytes_lib
+from . import ecc
+from . import elgamal
+from . import prime_lib
+from . import rsa_pss
+from . import schnorr
+from . import sign_lib
+from . import sm2
+from . import sm3_lib
+from functools import wraps
+import os
+import sys
+import time
+
+# 计数器名称: 域乘法数按各Jacobian公式中的模乘次数估算
+# inv只统计域上(曲线、RSA等)的求逆，素数筛中模小素数的求逆计入sieve_inv
+COUNTERS = ('field_mul', 'inv', 'modexp', 'point_double', 'point_add', 'affine_add',
+            'hash_calls', 'hash_bytes', 'primality_tests', 'primality_rounds', 'sieve_inv')
+# 各Jacobian公式的模乘次数
+DOUBLE_MULS = 10
+ADD_MIXED_MULS = 11
+ADD_MULS = 16
+# 记录耗时的阶段,(模块,函数或类.方法)
+TIMED = (
+    (sm2, 'sm2_enc'), (sm2, 'sm2_dec'), (sm2, 'sm2_enc_stream'), (sm2, 'sm2_dec_stream'),
+    (sm2, 'sm2_sign'), (sm2, 'sm2_sign_batch'), (sm2, 'sm2_verify'), (sm2, 'sm2_verify_batch'),
+    (sm2, 'SM2Key.sign'), (sm2, 'SM2Key.sign_batch'), (sm2, 'SM2Key.verify'), (sm2, 'SM2Key.precompute'),
+    (sm2, 'SM2Key._e'), (sm2, '_sm2_e'), (sm2, '_za'), (sm2, '_sm2_sign_e'), (sm2, '_sm2_check'), (sm2, 'kdf'),
+    (sm2, 'sm3_hash'), (bytes_lib, 'bytes_xor'),
+    (ecc, 'Point.mul'), (ecc, 'fixed_base_mul'), (ecc, 'fixed_base_mul_batch'), (ecc, 'multi_mul'),
+    (ecc, 'from_bytes'),
+    (schnorr, 'generate_key'), (schnorr, 'SchnorrKey.sign'), (schnorr, 'SchnorrKey.sign_batch'),
+    (schnorr, 'SchnorrKey.verify'), (schnorr, 'SchnorrKey.precompute'), (schnorr, 'schnorr_verify'),
+    (schnorr, 'schnorr_verify_batch'),
+    (elgamal, 'ElGamalKey.sign'), (elgamal, 'ElGamalKey.sign_batch'), (elgamal, 'ElGamalKey.verify'),
+    (elgamal, 'ElGamalKey.precompute'), (elgamal, 'elgamal_verify'),
+    (rsa_pss, 'generate_key'), (rsa_pss, 'RSAPrivateKey.sign'), (rsa_pss, 'RSAPrivateKey.verify'),
+    (rsa_pss, 'RSAPrivateKey.decrypt_raw'), (rsa_pss, 'rsa_pss'), (rsa_pss, 'rsa_pss_verify'),
+    (rsa_pss, 'pss_encode'),
+    (sign_lib, 'message_digest'), (sign_lib, 'mgf1'), (sign_lib, 'fixed_base_pow'), (sign_lib, 'multi_pow'),
+    (prime_lib, 'random_prime'), (prime_lib, 'schnorr_params'),
+)
+
+_exporters = []
+_active = None
+
+
+class Recorder:
+    def __init__(self, name=None):
+        """
+        一次插桩期间的计数与各阶段耗时
+        阶段以调用路径区分，如sm2.sm2_enc/sm2.kdf，耗时包含其内部的子阶段
+        :param name: 记录名,随快照导出,str
+        """
+        self.name = name
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.phases = {}
+        self.elapsed = 0.0
+        self._stack = []
+
+    def snapshot(self):
+        """
+        导出当前数据
+        :return: 记录名、总耗时(毫秒)、计数器与各阶段的调用次数和耗时(毫秒),dict
+        """
+        return {
+            'name': self.name,
+            'elapsed_ms': self.elapsed * 1000,
+            'counters': dict(self.counters),
+            'phases': {path: {'calls': calls, 'total_ms': seconds * 1000}
+                       for path, (calls, seconds) in self.phases.items()},
+        }
+
+    def report(self):
+        """
+        可读的文本报告，阶段按调用路径缩进
+        :return: 报告,str
+        """
+        lines = ["%-16s %d" % (name, value) for name, value in self.counters.items() if value]
+        for path, (calls, seconds) in sorted(self.phases.items()):
+            depth = path.count('/')
+            lines.append("%-40s %8d calls %10.3f ms" % ('  ' * depth + path.rsplit('/', 1)[-1], calls, seconds * 1000))
+        return '\n'.join(lines)
+
+
+def add_exporter(func):
+    """
+    注册导出钩子，每次插桩结束时以Recorder.snapshot()的结果调用
+    :param func: 接受快照字典的函数
+    :return: void
+    """
+    _exporters.append(func)
+
+
+def remove_exporter(func):
+    """
+    注销导出钩子
+    :param func: 已注册的函数
+    :return: void
+    """
+    _exporters.remove(func)
+
+
+def enabled():
+    """
+    当前是否处于插桩状态
+    :return: bool
+    """
+    return _active is not None
+
+
+class instrument:
+    def __init__(self, name=None):
+        """
+        插桩上下文管理器: 进入时替换热点函数为计数/计时包装，退出时还原并调用导出钩子
+        未进入时不做任何替换，没有额外开销；不可嵌套，只统计当前进程(不含进程池中的工作进程)
+        :param name: 记录名,str
+        """
+        self.recorder = Recorder(name)
+        self._patches = []
+
+    def __enter__(self):
+        global _active
+        if _active is not None:
+            raise RuntimeError("Instrumentation is already active.")
+        _active = self.recorder
+        try:
+            self._install()
+        except BaseException:
+            self._restore()
+            _active = None
+            raise
+        self._start = time.perf_counter()
+        return self.recorder
+
+    def __exit__(self, *exc):
+        global _active
+        self.recorder.elapsed = time.perf_counter() - self._start
+        self._restore()
+        _active = None
+        snapshot = self.recorder.snapshot()
+        for func in list(_exporters):
+            func(snapshot)
+        return False
+
+    def _patch(self, owner, attr, make):
+        """
+        用make(原函数)替换owner.attr，同时替换本包各模块中通过from import绑定的同一对象
+        :param owner: 模块或类
+        :param attr: 属性名,str
+        :param make: 接受原函数、返回包装函数的函数
+        :return: void
+        """
+        original = getattr(owner, attr)
+        wrapper = make(original)
+        self._patches.append((owner, attr, original))
+        setattr(owner, attr, wrapper)
+        if isinstance(owner, type):
+            return
+        for module in _package_modules():
+            for key, value in list(vars(module).items()):
+                if value is original and module is not owner:
+                    self._patches.append((module, key, original))
+                    setattr(module, key, wrapper)
+
+    def _restore(self):
+        while self._patches:
+            owner, attr, original = self._patches.pop()
+            setattr(owner, attr, original)
+
+    def _install(self):
+        counters = self.recorder.counters
+        # 先确定大数运算后端，避免首次运算时替换掉计数包装
+        arith_lib._resolve_backend()
+        self._patch(arith_lib, '_invert', lambda f: _counted(f, counters, 'inv'))
+        self._patch(arith_lib, '_powmod', lambda f: _counted(f, counters, 'modexp'))
+        self._patch(ecc, '_jacobian_double', lambda f: _counted(f, counters, 'point_double', DOUBLE_MULS))
+        self._patch(ecc, '_jacobian_add_mixed', lambda f: _counted(f, counters, 'point_add', ADD_MIXED_MULS))
+        self._patch(ecc, '_jacobian_add', lambda f: _counted_add(f, counters))
+        self._patch(ecc.Point, '__add__', lambda f: _counted(f, counters, 'affine_add'))
+        self._patch(prime_lib, 'miller_rabin', lambda f: _counted_primality(f, counters))
+        self._patch(prime_lib, 'sieve_progression', lambda f: _counted_sieve(f, counters))
+        self._patch(sm3_lib, 'new_sm3', lambda f: _counted_new_hash(f, counters))
+        self._patch(sm3_lib.SM3, 'update', lambda f: _counted_update(f, counters))
+        self._patch(sm3_lib.SM3, 'digest', lambda f: _counted(f, counters, 'hash_calls'))
+        self._patch(sign_lib, 'new_hash', lambda f: _counted_new_hash(f, counters))
+        for module, name in TIMED:
+            owner = module
+            if '.' in name:
+                cls, name = name.split('.')
+                owner = getattr(module, cls)
+            self._patch(owner, name, lambda f: _timed(f, self.recorder))
+
+
+def _package_modules():
+    """
+    已导入的本包模块
+    :return: 模块列表,list
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    return [module for module in list(sys.modules.values())
+            if os.path.dirname(os.path.abspath(getattr(module, '__file__', None) or os.sep)) == here]
+
+
+def _counted(func, counters, name, field_muls=0):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        counters[name] += 1
+        counters['field_mul'] += field_muls
+        return func(*args, **kwargs)
+    return wrapper
+
+
+def _counted_add(func, counters):
+    @wraps(func)
+    def wrapper(jac1, jac2, a, p):
+        # Z2为1时转交混合加法，由混合加法计数
+        if jac1[2] != 0 and jac2[2] != 0 and jac2[2] != 1:
+            counters['point_add'] += 1
+            counters['field_mul'] += ADD_MULS
+        return func(jac1, jac2, a, p)
+    return wrapper
+
+
+def _counted_primality(func, counters):
+    @wraps(func)
+    def wrapper(p, rounds=10):
+        # 每轮恰好一次模幂，实际执行的轮数即模幂次数的增量
+        before = counters['modexp']
+        try:
+            return func(p, rounds)
+        finally:
+            counters['primality_tests'] += 1
+            counters['primality_rounds'] += counters['modexp'] - before
+    return wrapper
+
+
+def _counted_sieve(func, counters):
+    @wraps(func)
+    def wrapper(start, step, size):
+        # 筛选期间的求逆都是模小素数，从inv移到sieve_inv
+        before = counters['inv']
+        try:
+            return func(start, step, size)
+        finally:
+            counters['sieve_inv'] += counters['inv'] - before
+            counters['inv'] = before
+    return wrapper
+
+
+def _counted_update(func, counters):
+    @wraps(func)
+    def wrapper(self, data):
+        counters['hash_bytes'] += len(data)
+        return func(self, data)
+    return wrapper
+
+
+def _counted_new_hash(func, counters):
+    @wraps(func)
+    def wrapper(*args):
+        ctx = func(*args)
+        # 纯Python SM3已在类上计数
+        return ctx if isinstance(ctx, sm3_lib.SM3) else _CountingHash(ctx, counters)
+    return wrapper
+
+
+class _CountingHash:
+    def __init__(self, ctx, counters):
+        """
+        统计吸收字节数与杂凑次数的上下文包装
+        :param ctx: 杂凑上下文,hashes.Hash或hashlib上下文
+        :param counters: 计数器,dict
+        """
+        self._ctx = ctx
+        self._counters = counters
+
+    def update(self, data):
+        self._counters['hash_bytes'] += memoryview(data).nbytes
+        self._ctx.update(data)
+
+    def copy(self):
+        return _CountingHash(self._ctx.copy(), self._counters)
+
+    def finalize(self):
+        self._counters['hash_calls'] += 1
+        return self._ctx.finalize()
+
+    def digest(self):
+        self._counters['hash_calls'] += 1
+        return self._ctx.digest()
+
+    def hexdigest(self):
+        return self.digest().hex()
+
+
+def _timed(func, recorder):
+    name = func.__module__ + '.' + func.__qualname__
+    stack = recorder._stack
+    phases = recorder.phases
+    perf_counter = time.perf_counter
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        stack.append(name)
+        path = '/'.join(stack)
+        start = perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = perf_counter() - start
+            stack.pop()
+            entry = phases.get(path)
+            if entry is None:
+                phases[path] = [1, elapsed]
+            else:
+                entry[0] += 1
+                entry[1] += elapsed
+    return wrapper
+
+
+def main():
+    curve = ecc.get_named_curve('sm2p256v1')
+    key = sm2.SM2Key(curve.g, curve.n)
+    add_exporter(lambda snapshot: print("exported %s: %.3f ms" % (snapshot['name'], snapshot['elapsed_ms'])))
+    with instrument('sm2') as rec:
+        cipher = sm2.sm2_enc(b'instrumented message' * 50, curve.g, curve.n, key.pub)
+        sm2.sm2_dec(cipher, curve.g, key.pri)
+        sign = key.sign('instrumented message')
+        key.verify('instrumented message', sign)
+    print(rec.report())
+    with instrument('schnorr') as rec:
+        p, q, alpha = schnorr.generate_key(160, 512)
+        schnorr_key = schnorr.SchnorrKey(p, q, alpha)
+        schnorr_key.verify('message', schnorr_key.sign('message'))
+    print(rec.report())
+    with instrument('rsa-pss') as rec:
+        rsa_key = rsa_pss.generate_key(1024)
+        rsa_key.verify('message', rsa_key.sign('message', hash_name='sha256'), hash_name='sha256')
+    print(rec.report())
+
+
+if __name__ == '__main__':
+    main()